@@ -1,20 +1,81 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.db import get_db
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from app.config import settings
+from app.db import get_async_db, get_db
+from app.utils.cache import TTLCache
 from app.utils.security import decode_access_token
 from app.models import User
 
 security = HTTPBearer()
 
+# Snapshots by public_id, so authenticated requests don't each query users
+_user_cache = TTLCache(maxsize=10000, ttl_seconds=settings.auth_user_cache_ttl_seconds)
+# Decoded JWT payloads by token hash; entries never outlive the token's exp
+_token_cache = TTLCache(maxsize=10000, ttl_seconds=settings.auth_token_cache_ttl_seconds)
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Read-only view of the authenticated user, safe to cache and share across requests."""
+    public_id: str
+    email: str
+    name: str
+    school: str
+    grad_year: int
+    monthly_goal_cents: int
+    
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            public_id=user.public_id,
+            email=user.email,
+            name=user.name,
+            school=user.school,
+            grad_year=user.grad_year,
+            monthly_goal_cents=user.monthly_goal_cents
+        )
+
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> UserSnapshot:
     """Get the current authenticated user from JWT token."""
-    token = credentials.credentials
-    payload = decode_access_token(token)
+    public_id = _public_id_from_token(credentials.credentials)
+    
+    snapshot = _user_cache.get(public_id)
+    if snapshot is None:
+        user = db.query(User).filter(User.public_id == public_id).first()
+        snapshot = _cache_user(public_id, user)
+    
+    return snapshot
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> UserSnapshot:
+    """get_current_user for async routes; shares the same caches."""
+    public_id = _public_id_from_token(credentials.credentials)
+    
+    snapshot = _user_cache.get(public_id)
+    if snapshot is None:
+        user = (await db.execute(select(User).where(User.public_id == public_id))).scalars().first()
+        snapshot = _cache_user(public_id, user)
+    
+    return snapshot
+
+
+def _public_id_from_token(token: str) -> str:
+    """The user's public_id from a JWT; raises 401 if the token is invalid."""
+    payload = _decode_token_cached(token)
     
     if payload is None:
         raise HTTPException(
@@ -30,13 +91,67 @@ def get_current_user(
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    user = db.query(User).filter(User.public_id == public_id).first()
+    return public_id
+
+
+def _cache_user(public_id: str, user: Optional[User]) -> UserSnapshot:
+    """Snapshot a freshly loaded user into the cache; raises 401 if it doesn't exist."""
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    snapshot = UserSnapshot.from_user(user)
+    _user_cache.set(public_id, snapshot)
+    return snapshot
+
+
+def invalidate_user(public_id: str) -> None:
+    """Drop a user's cached snapshot; call after changing the user outside the ORM."""
+    _user_cache.invalidate(public_id)
+
+
+def auth_cache_stats() -> dict:
+    """Hit/miss counters for the user and token caches."""
+    return {"users": _user_cache.stats(), "tokens": _token_cache.stats()}
+
+
+def _decode_token_cached(token: str) -> Optional[dict]:
+    """decode_access_token, skipping signature checks for recently seen tokens."""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _token_cache.get(key)
+    if payload is not None:
+        # A cached entry can't outlive exp, but check in case the clock moved on
+        if payload.get("exp", 0) > time.time():
+            return payload
+        _token_cache.invalidate(key)
     
-    return user
+    payload = decode_access_token(token)
+    if payload is not None:
+        ttl = min(settings.auth_token_cache_ttl_seconds, payload.get("exp", 0) - time.time())
+        if ttl > 0:
+            _token_cache.set(key, payload, ttl_seconds=ttl)
+    return payload
+
+
+# Session.info key for users changed in the session's current transaction
+_CHANGED_USERS = "auth_changed_user_ids"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_changed_user(mapper, connection, target) -> None:
+    # Flushed changes aren't visible to other sessions until commit, so wait for it
+    object_session(target).info.setdefault(_CHANGED_USERS, set()).add(target.public_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session) -> None:
+    for public_id in session.info.pop(_CHANGED_USERS, ()):
+        invalidate_user(public_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_users(session) -> None:
+    session.info.pop(_CHANGED_USERS, None)
@@ -1,15 +1,78 @@
 from pydantic_settings import BaseSettings
+from typing import Optional
 
 
 class Settings(BaseSettings):
     secret_key: str
-    # Plaid Sandbox credentials (required)
-    plaid_client_id: str
-    plaid_secret: str
+    # Plaid Sandbox credentials (required unless using the fake backend)
+    plaid_client_id: str = ""
+    plaid_secret: str = ""
     plaid_env: str = "sandbox"
+    # "plaid" calls the real API, "fake" serves synthetic/fixture data in-process,
+    # "record" calls the real API and saves responses to plaid_fake_fixture_path
+    plaid_backend: str = "plaid"
+    plaid_fake_fixture_path: Optional[str] = None
+    plaid_fake_history_days: int = 730
+    plaid_fake_max_transactions_per_day: int = 5
+    plaid_fake_latency_ms: int = 0
+    plaid_fake_error_rate: float = 0.0
+    # Override the Plaid API host (e.g. a local fake Plaid server for testing)
+    plaid_host: Optional[str] = None
+    # "cursor" uses /transactions/sync incrementally, "window" re-pulls the last 30 days
+    plaid_sync_mode: str = "cursor"
+    # Threads for Plaid fetches and backfills, shared by every request in a worker process;
+    # size it as concurrent syncs x linked items per user (default: 16 x 2), beyond that calls queue
+    plaid_sync_max_workers: int = 32
+    # Transactions per Plaid page, and how far back a newly linked item is loaded in window mode
+    plaid_page_size: int = 500
+    plaid_backfill_days: int = 730
+    # GET /transactions serves cached rows and refreshes Plaid in the background
+    # once PlaidItem.last_sync is older than the TTL
+    transactions_stale_while_revalidate: bool = True
+    transactions_sync_ttl_seconds: int = 300
+    # "persisted" stores a stable per-user demo dataset, "generated" rebuilds it per request
+    demo_data_mode: str = "persisted"
+    demo_history_days: int = 30
     database_url: str = "sqlite:///./piggie.db"
+    # Serve the hot-path routes (wallet, goals, transaction pages, pending round-ups,
+    # Plaid sync) as async handlers on an asyncio engine instead of the threadpool.
+    # The async URL defaults to database_url with its asyncio driver (aiosqlite/asyncpg)
+    async_mode: bool = False
+    async_database_url: Optional[str] = None
+    # Connection pool for server databases (Postgres); pre-ping drops connections the
+    # server closed, recycle replaces them before idle timeouts/failovers can
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_pre_ping: bool = True
+    db_pool_recycle_seconds: int = 1800
+    # PRAGMAs applied to every new SQLite connection. WAL lets readers run alongside
+    # the writer, and NORMAL syncs at checkpoints rather than on every commit
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size_bytes: int = 256 * 1024 * 1024
+    sqlite_cache_size_kib: int = 64 * 1024
     jwt_algorithm: str = "HS256"
     jwt_expiration_hours: int = 24
+    # Argon2 cost; hashes made with other parameters are upgraded on the next login
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536  # KiB
+    argon2_parallelism: int = 4
+    # Password hashing runs on its own pool. Requests beyond workers + queue get a 503,
+    # so a login storm ties up at most that many request threads and DB connections;
+    # keep the sum below the connection pool size (15 by default)
+    password_hash_max_workers: int = 4
+    password_hash_max_queue: int = 8
+    # In-process caches used by get_current_user: user snapshots by public_id
+    # (invalidated on user changes) and decoded JWT payloads by token hash
+    auth_user_cache_ttl_seconds: int = 60
+    auth_token_cache_ttl_seconds: int = 300
+    # Rate limit counters: "memory" is per process, "sqlite" is shared by all
+    # workers on the host through rate_limit_sqlite_path
+    rate_limit_backend: str = "memory"
+    rate_limit_sqlite_path: str = "./rate_limits.db"
+    # Keys (client IPs / users) tracked before the least recently used are evicted
+    rate_limit_max_keys: int = 10000
     
     class Config:
         env_file = ".env"
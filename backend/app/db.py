@@ -1,16 +1,87 @@
-from sqlalchemy import create_engine
+from datetime import date
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
+
+def pool_options(url: str) -> dict:
+    """create_engine pool arguments from settings; SQLite keeps SQLAlchemy's own pooling."""
+    if "sqlite" in url:
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle_seconds
+    }
+
+
+def sqlite_pragmas() -> dict:
+    """The SQLite PRAGMAs configured in settings."""
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "mmap_size": settings.sqlite_mmap_size_bytes,
+        # Negative sizes are in KiB rather than pages
+        "cache_size": -settings.sqlite_cache_size_kib
+    }
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: dict) -> None:
+    """Run PRAGMA name = value for each entry whenever `engine` opens a connection."""
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
 engine = create_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
+    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
+    **pool_options(settings.database_url)
 )
+if "sqlite" in settings.database_url:
+    apply_sqlite_pragmas(engine, sqlite_pragmas())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# asyncio drivers for the sync URLs we support
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg"
+}
+
+
+def async_database_url(url: str) -> str:
+    """Swap a database URL's sync driver for its asyncio counterpart."""
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+# Only created in async mode, so the asyncio driver is an optional dependency
+async_engine = None
+AsyncSessionLocal = None
+if settings.async_mode:
+    _async_url = settings.async_database_url or async_database_url(settings.database_url)
+    async_engine = create_async_engine(_async_url, **pool_options(_async_url))
+    if "sqlite" in _async_url:
+        apply_sqlite_pragmas(async_engine.sync_engine, sqlite_pragmas())
+    # Keep attributes loaded after commit; lazy loads can't run outside the event loop's await
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+def sql_date(value) -> date:
+    """A func.date() result as a date; SQLite returns it as a string, other databases as a date."""
+    return date.fromisoformat(str(value))
+
 
 def get_db():
     db = SessionLocal()
@@ -18,3 +89,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
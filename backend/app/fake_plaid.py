@@ -0,0 +1,259 @@
+"""In-process stand-in for the Plaid API, for local development and load testing.
+
+FakePlaidApi implements the PlaidApi methods PlaidClient uses and serves
+either synthetic transactions (deterministic per access token) or a JSON
+fixture, e.g. one captured from the sandbox with RecordingPlaidApi. Fixture
+transaction ids get a per-access-token suffix, so every linked item replays
+its own copy of the history.
+Latency and error injection make it possible to benchmark sync throughput
+without Plaid credentials.
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+MERCHANTS = [
+    "Starbucks", "Target", "Amazon", "Chipotle", "Uber Eats",
+    "Spotify", "Netflix", "Apple Store", "CVS", "Whole Foods",
+    "McDonald's", "Subway", "Pizza Hut", "Best Buy", "Trader Joe's"
+]
+
+CATEGORIES = [
+    ["Food and Drink", "Restaurants"], ["Shops"], ["Recreation"],
+    ["Travel", "Taxi"], ["Food and Drink", "Groceries"], ["Service", "Subscription"]
+]
+
+
+class FakePlaidError(Exception):
+    """Error raised by FakePlaidApi when error injection triggers."""
+
+
+class FakePlaidApi:
+    """Serves the subset of PlaidApi that PlaidClient calls, without the network."""
+    
+    def __init__(
+        self,
+        fixture_path: Optional[str] = None,
+        history_days: int = 730,
+        max_transactions_per_day: int = 5,
+        latency_ms: int = 0,
+        error_rate: float = 0.0
+    ):
+        self.history_days = history_days
+        self.max_transactions_per_day = max_transactions_per_day
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        # Fixed at construction so cursors (list offsets) stay valid as days pass
+        self.first_day = date.today() - timedelta(days=history_days)
+        self._rng = random.Random()
+        
+        self.fixture = None
+        if fixture_path:
+            with open(fixture_path) as f:
+                self.fixture = json.load(f)
+            # Sorted once, oldest first; sync cursors are offsets into this order
+            self.fixture["transactions"] = sorted(
+                self.fixture.get("transactions", []), key=lambda txn: txn["date"]
+            )
+    
+    @classmethod
+    def from_settings(cls, settings) -> "FakePlaidApi":
+        return cls(
+            fixture_path=settings.plaid_fake_fixture_path,
+            history_days=settings.plaid_fake_history_days,
+            max_transactions_per_day=settings.plaid_fake_max_transactions_per_day,
+            latency_ms=settings.plaid_fake_latency_ms,
+            error_rate=settings.plaid_fake_error_rate
+        )
+    
+    def link_token_create(self, request) -> Dict[str, Any]:
+        self._simulate()
+        return {"link_token": f"link-fake-{uuid.uuid4()}"}
+    
+    def item_public_token_exchange(self, request) -> Dict[str, Any]:
+        self._simulate()
+        digest = hashlib.sha256(request["public_token"].encode()).hexdigest()
+        return {
+            "access_token": f"access-fake-{digest[:24]}",
+            "item_id": f"item-fake-{digest[24:48]}"
+        }
+    
+    def institutions_get_by_id(self, request) -> Dict[str, Any]:
+        self._simulate()
+        institution_id = request["institution_id"]
+        institutions = (self.fixture or {}).get("institutions", {})
+        return {
+            "institution": institutions.get(
+                institution_id,
+                {"institution_id": institution_id, "name": f"Fake Bank {institution_id}"}
+            )
+        }
+    
+    def transactions_get(self, request) -> Dict[str, Any]:
+        self._simulate()
+        start_date = str(request["start_date"])
+        end_date = str(request["end_date"])
+        options = request.get("options")
+        count = options.get("count", 100) if options else 100
+        offset = options.get("offset", 0) if options else 0
+        
+        in_range = [
+            txn for txn in self._transactions(request["access_token"])
+            if start_date <= txn["date"] <= end_date
+        ]
+        # Plaid returns newest first
+        in_range.reverse()
+        return {
+            "transactions": self._for_item(request["access_token"], in_range[offset:offset + count]),
+            "total_transactions": len(in_range)
+        }
+    
+    def transactions_sync(self, request) -> Dict[str, Any]:
+        self._simulate()
+        transactions = self._transactions(request["access_token"])
+        count = request.get("count") or 100
+        offset = int(request.get("cursor") or 0)
+        
+        page = transactions[offset:offset + count]
+        next_offset = offset + len(page)
+        return {
+            "added": self._for_item(request["access_token"], page),
+            "modified": [],
+            "removed": [],
+            "has_more": next_offset < len(transactions),
+            "next_cursor": str(next_offset)
+        }
+    
+    def _transactions(self, access_token: str) -> List[Dict[str, Any]]:
+        """All of an item's transactions, oldest first. New days are only ever appended."""
+        if self.fixture is not None:
+            return self.fixture["transactions"]
+        
+        return _synthetic_transactions(
+            access_token, self.first_day, date.today(), self.max_transactions_per_day
+        )
+    
+    def _for_item(self, access_token: str, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Give fixture transactions ids of the item's own; synthetic ones already have them."""
+        if self.fixture is None:
+            return transactions
+        
+        suffix = _token_hash(access_token)
+        return [
+            dict(
+                txn,
+                transaction_id=f"{txn['transaction_id']}_{suffix}",
+                pending_transaction_id=(
+                    f"{txn['pending_transaction_id']}_{suffix}" if txn.get("pending_transaction_id") else None
+                )
+            )
+            for txn in transactions
+        ]
+    
+    def _simulate(self) -> None:
+        """Apply the configured latency and error injection to a call."""
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            raise FakePlaidError("Injected Plaid error")
+
+
+class RecordingPlaidApi:
+    """Wraps a real PlaidApi and records responses as a FakePlaidApi fixture.
+    
+    Every transaction and institution seen is merged into the JSON file at
+    `fixture_path`, which can then be replayed with PLAID_BACKEND=fake.
+    """
+    
+    def __init__(self, api, fixture_path: str):
+        self.api = api
+        self.fixture_path = fixture_path
+        self._lock = threading.Lock()
+    
+    def __getattr__(self, name):
+        # Anything we don't record goes straight to the real client
+        return getattr(self.api, name)
+    
+    def transactions_get(self, request):
+        response = self.api.transactions_get(request)
+        self._record(transactions=response['transactions'])
+        return response
+    
+    def transactions_sync(self, request):
+        response = self.api.transactions_sync(request)
+        self._record(transactions=list(response['added']) + list(response['modified']))
+        return response
+    
+    def institutions_get_by_id(self, request):
+        response = self.api.institutions_get_by_id(request)
+        self._record(institution=response['institution'])
+        return response
+    
+    def _record(self, transactions=(), institution=None) -> None:
+        with self._lock:
+            fixture = {"transactions": [], "institutions": {}}
+            if os.path.exists(self.fixture_path):
+                with open(self.fixture_path) as f:
+                    fixture = json.load(f)
+            
+            recorded = {txn["transaction_id"]: txn for txn in fixture["transactions"]}
+            for txn in transactions:
+                txn = _to_dict(txn)
+                recorded[txn["transaction_id"]] = txn
+            fixture["transactions"] = list(recorded.values())
+            
+            if institution is not None:
+                institution = _to_dict(institution)
+                fixture["institutions"][institution["institution_id"]] = {
+                    "institution_id": institution["institution_id"],
+                    "name": institution["name"]
+                }
+            
+            with open(self.fixture_path, "w") as f:
+                json.dump(fixture, f, indent=2, default=str)
+
+
+@lru_cache(maxsize=1024)
+def _synthetic_transactions(
+    access_token: str,
+    first_day: date,
+    last_day: date,
+    max_transactions_per_day: int
+) -> List[Dict[str, Any]]:
+    """Generate an item's synthetic history. Each day is seeded from the token and date."""
+    token_hash = _token_hash(access_token)
+    
+    transactions = []
+    day = first_day
+    while day <= last_day:
+        rng = random.Random(f"{access_token}:{day.isoformat()}")
+        for i in range(rng.randint(0, max_transactions_per_day)):
+            merchant = rng.choice(MERCHANTS)
+            transactions.append({
+                "transaction_id": f"fake_{token_hash}_{day.strftime('%Y%m%d')}_{i}",
+                "amount": round(rng.uniform(1.0, 80.0), 2),
+                "merchant_name": merchant,
+                "name": merchant.upper(),
+                "category": rng.choice(CATEGORIES),
+                "date": day.isoformat(),
+                "pending": False
+            })
+        day += timedelta(days=1)
+    return transactions
+
+
+def _token_hash(access_token: str) -> str:
+    return hashlib.sha256(access_token.encode()).hexdigest()[:12]
+
+
+def _to_dict(model) -> Dict[str, Any]:
+    """Convert a Plaid model (or plain dict) to JSON-friendly primitives."""
+    data = model.to_dict() if hasattr(model, "to_dict") else dict(model)
+    return json.loads(json.dumps(data, default=str))
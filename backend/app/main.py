@@ -1,12 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.auth import auth_cache_stats
+from app.config import settings
 from app.db import Base, engine
 # Import all models so they're registered with Base
 from app.models import User, PlaidItem, Transaction, Wallet, Goal, Allocation, MerchantRule, Roundup, Event
-from app.routes import auth_routes, plaid_routes, transaction_routes, wallet_routes, goal_routes, event_routes
+from app.migrations import upgrade_schema
+from app.routes import auth_routes, plaid_routes, transaction_routes, wallet_routes, goal_routes, event_routes, rule_routes
 
-# Create database tables
+# Create database tables and add columns/indexes newer than an existing database
 Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)
 
 app = FastAPI(
     title="Piggie API",
@@ -24,12 +28,18 @@ app.add_middleware(
 )
 
 # Include routers
+if settings.async_mode:
+    # Registered first so its async handlers take precedence over the sync routes at the same paths
+    from app.routes.async_routes import router as async_router
+    app.include_router(async_router)
+
 app.include_router(auth_routes.router)
 app.include_router(plaid_routes.router)
 app.include_router(transaction_routes.router)
 app.include_router(wallet_routes.router)
 app.include_router(goal_routes.router)
 app.include_router(event_routes.router)
+app.include_router(rule_routes.router)
 
 # Round-up route (needs to be added)
 from app.routes.roundup_routes import router as roundup_router
@@ -48,3 +58,9 @@ def root():
 @app.get("/health")
 def health():
     return {"status": "healthy"}
+
+
+@app.get("/health/caches")
+def cache_stats():
+    """Hit/miss counters for the authentication caches."""
+    return auth_cache_stats()
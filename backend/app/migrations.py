@@ -0,0 +1,102 @@
+"""Bring databases created by older versions up to date with the models."""
+from datetime import date
+from sqlalchemy import func, inspect, literal, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from app.db import Base
+from app.models import Goal, Roundup, Wallet
+from app.services.market_index import market_index
+
+
+def upgrade_schema(bind: Engine) -> None:
+    """Add the columns and indexes that existing tables are missing.
+    
+    create_all only creates missing tables, so databases created by an older
+    version lack columns added to the models since. Safe to run repeatedly;
+    new columns are filled with their constant default, or NULL.
+    """
+    existing_tables = set(inspect(bind).get_table_names())
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspect(conn).get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    conn.execute(text(
+                        f"ALTER TABLE {conn.dialect.identifier_preparer.quote(table.name)} "
+                        f"ADD COLUMN {_add_column_ddl(column, conn.dialect)}"
+                    ))
+            
+            existing_indexes = {index["name"] for index in inspect(conn).get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in existing_indexes:
+                    continue
+                if index.name in INDEX_FIXUPS:
+                    INDEX_FIXUPS[index.name](conn)
+                index.create(conn)
+
+
+def _add_column_ddl(column, dialect) -> str:
+    """The column definition for ALTER TABLE ... ADD COLUMN."""
+    ddl = f"{dialect.identifier_preparer.quote(column.name)} {column.type.compile(dialect=dialect)}"
+    if column.default is not None and column.default.is_scalar:
+        # A constant DEFAULT backfills existing rows with the ORM default
+        default = literal(column.default.arg, column.type).compile(
+            dialect=dialect, compile_kwargs={"literal_binds": True}
+        )
+        ddl += f" DEFAULT {default}"
+        if not column.nullable:
+            ddl += " NOT NULL"
+    return ddl
+
+
+def collapse_duplicate_roundups(conn: Connection) -> None:
+    """Keep the first round-up of each transaction and take back what the others credited.
+    
+    Retry races before ux_roundups_user_transaction existed could round a
+    transaction up more than once; the unique index can't be built over them.
+    """
+    db = Session(bind=conn, autoflush=False)
+    duplicates = db.query(
+        Roundup.user_public_id, Roundup.transaction_id, func.min(Roundup.id)
+    ).group_by(Roundup.user_public_id, Roundup.transaction_id).having(func.count() > 1).all()
+    
+    for user_public_id, transaction_id, first_id in duplicates:
+        extras = db.query(Roundup).filter(
+            Roundup.user_public_id == user_public_id,
+            Roundup.transaction_id == transaction_id,
+            Roundup.id != first_id
+        ).all()
+        wallet = db.query(Wallet).filter(Wallet.user_public_id == user_public_id).first()
+        
+        for roundup in extras:
+            investing_cents = roundup.investing_cents or 0
+            if wallet:
+                wallet.savings_cents -= roundup.savings_cents or 0
+                wallet.investing_cents -= investing_cents
+                # Columns added by this upgrade start at zero; don't take them below it
+                bought_on = roundup.created_at.date() if roundup.created_at else date.today()
+                wallet.investing_cost_basis_cents = max(0, (wallet.investing_cost_basis_cents or 0) - investing_cents)
+                wallet.investing_units = max(
+                    0.0, (wallet.investing_units or 0.0) - investing_cents / market_index.level(bought_on)
+                )
+            if roundup.goal_id and roundup.goals_cents:
+                goal = db.get(Goal, roundup.goal_id)
+                if goal:
+                    goal.current_cents -= roundup.goals_cents
+            db.delete(roundup)
+        
+        print(
+            f"Removed {len(extras)} duplicate round-up(s) of transaction {transaction_id} "
+            f"for user {user_public_id} (kept round-up {first_id})"
+        )
+    
+    db.flush()
+    db.close()
+
+
+# Data fixes to run before creating an index that existing rows could violate
+INDEX_FIXUPS = {
+    "ux_roundups_user_transaction": collapse_duplicate_roundups
+}
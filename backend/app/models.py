@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db import Base
@@ -38,6 +38,7 @@ class PlaidItem(Base):
     institution_name = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_sync = Column(DateTime(timezone=True))
+    sync_cursor = Column(String)  # Plaid /transactions/sync cursor, None until first sync
     
     user = relationship("User", back_populates="plaid_items")
 
@@ -54,9 +55,15 @@ class Transaction(Base):
     timestamp = Column(DateTime(timezone=True), nullable=False)
     source = Column(String, nullable=False)  # "plaid" or "local"
     pending = Column(Boolean, default=False)
+    pending_transaction_id = Column(String)  # For posted transactions, the pending one they replaced
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     user = relationship("User", back_populates="transactions")
+    
+    __table_args__ = (
+        # Serves the per-user listing ordered by (timestamp, id) and its keyset pagination
+        Index("ix_transactions_user_timestamp_id", user_public_id, timestamp.desc(), id.desc()),
+    )
 
 
 class Wallet(Base):
@@ -66,6 +73,8 @@ class Wallet(Base):
     user_public_id = Column(String, ForeignKey("users.public_id"), unique=True, nullable=False)
     savings_cents = Column(Integer, default=0)
     investing_cents = Column(Integer, default=0)
+    investing_cost_basis_cents = Column(Integer, default=0)  # Sum of investing contributions
+    investing_units = Column(Float, default=0.0)  # Market index units those contributions bought
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     user = relationship("User", back_populates="wallets")
@@ -106,6 +115,10 @@ class MerchantRule(Base):
     user_public_id = Column(String, ForeignKey("users.public_id"), nullable=False)
     merchant = Column(String, nullable=False)
     auto_roundup = Column(Boolean, default=False)
+    # Optional extra conditions for auto round-up
+    category = Column(String)
+    min_amount_cents = Column(Integer)
+    max_amount_cents = Column(Integer)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     user = relationship("User", back_populates="merchant_rules")
@@ -122,9 +135,18 @@ class Roundup(Base):
     investing_cents = Column(Integer, default=0)
     goals_cents = Column(Integer, default=0)
     goal_id = Column(Integer, ForeignKey("goals.id"), nullable=True)
+    idempotency_key = Column(String)  # Idempotency-Key header of the request that created it
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     user = relationship("User", back_populates="roundups")
+    
+    __table_args__ = (
+        # A transaction can only be rounded up once; also serves the duplicate check
+        Index("ux_roundups_user_transaction", user_public_id, transaction_id, unique=True),
+        Index("ux_roundups_user_idempotency_key", user_public_id, idempotency_key, unique=True),
+        # Latest round-up and recent contributions per goal, for projections
+        Index("ix_roundups_goal_id_id", goal_id, id),
+    )
 
 
 class Event(Base):
@@ -133,5 +155,6 @@ class Event(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_public_id = Column(String, nullable=False)
     event_type = Column(String, nullable=False)  # prompt_shown, prompt_accepted, etc.
-    metadata = Column(Text)  # JSON string
+    # "metadata" is reserved by the declarative API, so map the column under another name
+    event_metadata = Column("metadata", Text)  # JSON string
     created_at = Column(DateTime(timezone=True), server_default=func.now())
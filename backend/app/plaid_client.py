@@ -2,7 +2,7 @@ from plaid.api import plaid_api
 from plaid.configuration import Configuration
 from plaid.api_client import ApiClient
 from app.config import settings
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 import os
 
 # Map environment to Plaid host
@@ -15,9 +15,16 @@ PLAID_HOSTS = {
 
 class PlaidClient:
     def __init__(self):
+        if settings.plaid_backend == "fake":
+            from app.fake_plaid import FakePlaidApi
+            self.client = FakePlaidApi.from_settings(settings)
+            return
+        if settings.plaid_backend == "record" and not settings.plaid_fake_fixture_path:
+            raise ValueError("PLAID_FAKE_FIXTURE_PATH must be set to record Plaid responses")
+        
         try:
             configuration = Configuration(
-                host=PLAID_HOSTS.get(settings.plaid_env, PLAID_HOSTS["sandbox"]),
+                host=settings.plaid_host or PLAID_HOSTS.get(settings.plaid_env, PLAID_HOSTS["sandbox"]),
                 api_key={
                     "clientId": settings.plaid_client_id,
                     "secret": settings.plaid_secret
@@ -25,6 +32,9 @@ class PlaidClient:
             )
             api_client = ApiClient(configuration)
             self.client = plaid_api.PlaidApi(api_client)
+            if settings.plaid_backend == "record":
+                from app.fake_plaid import RecordingPlaidApi
+                self.client = RecordingPlaidApi(self.client, settings.plaid_fake_fixture_path)
         except Exception as e:
             raise ValueError(
                 f"Failed to initialize Plaid client. Make sure PLAID_CLIENT_ID and PLAID_SECRET are set in .env file. Error: {str(e)}"
@@ -86,36 +96,124 @@ class PlaidClient:
         start_date: str,
         end_date: str
     ) -> list[Dict[str, Any]]:
-        """Fetch transactions from Plaid."""
+        """Fetch all transactions in a date range from Plaid as one list.
+        
+        Prefer iter_transactions for long ranges; this holds every page in memory.
+        """
+        return [
+            txn
+            for batch in self.iter_transactions(access_token, start_date, end_date)
+            for txn in batch
+        ]
+    
+    def iter_transactions(
+        self,
+        access_token: str,
+        start_date: str,
+        end_date: str,
+        page_size: int = 500
+    ) -> Iterator[list[Dict[str, Any]]]:
+        """Yield normalized transactions in a date range one page at a time.
+        
+        Pages through /transactions/get with count/offset until Plaid's
+        `total_transactions` is reached, so long histories aren't truncated at
+        the default page size and only one page is held in memory.
+        """
         from plaid.model.transactions_get_request import TransactionsGetRequest
+        from plaid.model.transactions_get_request_options import TransactionsGetRequestOptions
         from datetime import datetime
         
-        request = TransactionsGetRequest(
-            access_token=access_token,
-            start_date=datetime.strptime(start_date, "%Y-%m-%d").date(),
-            end_date=datetime.strptime(end_date, "%Y-%m-%d").date()
-        )
+        offset = 0
+        while True:
+            request = TransactionsGetRequest(
+                access_token=access_token,
+                start_date=datetime.strptime(start_date, "%Y-%m-%d").date(),
+                end_date=datetime.strptime(end_date, "%Y-%m-%d").date(),
+                options=TransactionsGetRequestOptions(count=page_size, offset=offset)
+            )
+            
+            response = self.client.transactions_get(request)
+            transactions = response['transactions']
+            if not transactions:
+                return
+            
+            # Normalize to our format
+            yield [self._normalize_transaction(txn) for txn in transactions]
+            
+            offset += len(transactions)
+            if offset >= response['total_transactions']:
+                return
+    
+    def sync_transactions(
+        self,
+        access_token: str,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Fetch transaction changes since `cursor` using /transactions/sync.
         
-        response = self.client.transactions_get(request)
-        transactions = response['transactions']
+        Pages through until `has_more` is false and returns the normalized
+        added/modified transactions, removed transaction ids and the cursor to
+        store for the next call. A `None` cursor fetches the full history; use
+        iter_transaction_sync for that to keep memory bounded.
+        """
+        changes = {"added": [], "modified": [], "removed": [], "next_cursor": cursor}
+        for page in self.iter_transaction_sync(access_token, cursor):
+            changes["added"].extend(page["added"])
+            changes["modified"].extend(page["modified"])
+            changes["removed"].extend(page["removed"])
+            changes["next_cursor"] = page["next_cursor"]
         
-        # Normalize to our format
-        normalized = []
-        for txn in transactions:
-            # Convert date string to datetime
-            date_str = txn['date']
-            if isinstance(date_str, str):
-                txn_date = datetime.strptime(date_str, "%Y-%m-%d")
+        return changes
+    
+    def iter_transaction_sync(
+        self,
+        access_token: str,
+        cursor: Optional[str] = None,
+        page_size: int = 500
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield /transactions/sync pages of changes since `cursor`, one at a time.
+        
+        Each page has normalized added/modified transactions, removed
+        transaction ids and the page's `next_cursor`.
+        """
+        from plaid.model.transactions_sync_request import TransactionsSyncRequest
+        
+        has_more = True
+        while has_more:
+            if cursor:
+                request = TransactionsSyncRequest(access_token=access_token, cursor=cursor, count=page_size)
             else:
-                txn_date = date_str
+                request = TransactionsSyncRequest(access_token=access_token, count=page_size)
+            
+            response = self.client.transactions_sync(request)
+            has_more = response['has_more']
+            cursor = response['next_cursor']
             
-            normalized.append({
-                "transaction_id": txn['transaction_id'],
-                "amount_cents": int(abs(txn['amount']) * 100),  # Plaid uses negative for debits
-                "merchant": txn.get('merchant_name') or txn.get('name', 'Unknown'),
-                "category": ', '.join(txn.get('category', [])) if txn.get('category') else None,
-                "timestamp": txn_date,
-                "pending": txn.get('pending', False)
-            })
+            yield {
+                "added": [self._normalize_transaction(txn) for txn in response['added']],
+                "modified": [self._normalize_transaction(txn) for txn in response['modified']],
+                "removed": [txn['transaction_id'] for txn in response['removed']],
+                "next_cursor": cursor
+            }
+    
+    @staticmethod
+    def _normalize_transaction(txn) -> Dict[str, Any]:
+        """Convert a Plaid transaction to our format."""
+        from datetime import datetime
         
-        return normalized
+        # Convert date string to datetime
+        date_str = txn['date']
+        if isinstance(date_str, str):
+            txn_date = datetime.strptime(date_str, "%Y-%m-%d")
+        else:
+            txn_date = date_str
+        
+        return {
+            "transaction_id": txn['transaction_id'],
+            "amount_cents": int(abs(txn['amount']) * 100),  # Plaid uses negative for debits
+            "merchant": txn.get('merchant_name') or txn.get('name', 'Unknown'),
+            "category": ', '.join(txn.get('category', [])) if txn.get('category') else None,
+            "timestamp": txn_date,
+            "pending": txn.get('pending', False),
+            "pending_transaction_id": txn.get('pending_transaction_id')
+        }
@@ -1,17 +1,22 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.db import get_db
-from app.models import Allocation, User
-from app.auth import get_current_user
-from app.schemas import AllocationUpdate, AllocationResponse
+from app.models import Allocation
+from app.auth import UserSnapshot, get_current_user
+from app.schemas import AllocationUpdate, AllocationResponse, AllocationSimulationResponse
+from app.services.allocation_simulator import simulate_allocation
+from app.utils.rate_limit import RateLimiter, limit_by_user
 
 router = APIRouter(prefix="/allocation", tags=["allocation"])
 
+# Simulations scan the user's whole transaction history
+simulation_limiter = RateLimiter("allocation_simulate", limit=30, window_seconds=60)
+
 
 @router.get("", response_model=AllocationResponse)
 def get_allocation(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Get user's allocation percentages."""
     allocation = db.query(Allocation).filter(
@@ -41,7 +46,7 @@ def get_allocation(
 def update_allocation(
     allocation_data: AllocationUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Update user's allocation percentages."""
     allocation = db.query(Allocation).filter(
@@ -64,3 +69,29 @@ def update_allocation(
         investing_percent=allocation.investing_percent,
         goals_percent=allocation.goals_percent
     )
+
+
+@router.post(
+    "/simulate",
+    response_model=AllocationSimulationResponse,
+    dependencies=[Depends(limit_by_user(simulation_limiter))]
+)
+def simulate_allocation_change(
+    allocation_data: AllocationUpdate,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """Show what the user's transaction history would have saved under other percentages."""
+    current_allocation = db.query(Allocation).filter(
+        Allocation.user_public_id == current_user.public_id
+    ).first()
+    
+    if not current_allocation:
+        # Same default apply_roundup uses
+        current_allocation = Allocation(savings_percent=40.0, investing_percent=30.0, goals_percent=30.0)
+    
+    candidate = Allocation(**allocation_data.model_dump())
+    
+    return AllocationSimulationResponse(
+        **simulate_allocation(db, current_user.public_id, candidate, current_allocation)
+    )
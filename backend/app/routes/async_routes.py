@@ -0,0 +1,126 @@
+"""Async versions of the hot-path routes, registered ahead of the sync ones in async mode.
+
+Handlers await an AsyncSession instead of holding a threadpool thread for
+the whole request. Service functions written for a sync Session run through
+AsyncSession.run_sync, which awaits their queries on the event loop.
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import List
+from app.db import get_async_db
+from app.models import Goal, PlaidItem, Wallet
+from app.auth import UserSnapshot, get_current_user_async
+from app.schemas import (
+    GoalResponse, PendingRoundupPage, TransactionPage, WalletResponse
+)
+from app.routes.plaid_routes import _require_items, _sync_failed, _sync_result, plaid_client, plaid_limiter
+from app.routes.roundup_routes import _pending_roundup_page
+from app.routes.transaction_routes import _transaction_page
+from app.services.portfolio_simulator import get_portfolio_summary, value_investing_wallet
+from app.services.transaction_service import sync_plaid_items_async
+from app.utils.rate_limit import limit_by_user
+
+router = APIRouter()
+
+
+async def _get_or_create_wallet(db: AsyncSession, user_public_id: str) -> Wallet:
+    wallet = (await db.execute(
+        select(Wallet).where(Wallet.user_public_id == user_public_id)
+    )).scalars().first()
+    
+    if not wallet:
+        wallet = Wallet(user_public_id=user_public_id)
+        db.add(wallet)
+        await db.commit()
+        await db.refresh(wallet)
+    
+    return wallet
+
+
+@router.get("/wallet", response_model=WalletResponse, tags=["wallet"])
+async def get_wallet(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async)
+):
+    """Get user's wallet balances."""
+    wallet = await _get_or_create_wallet(db, current_user.public_id)
+    
+    return WalletResponse(
+        savings_cents=wallet.savings_cents,
+        investing_cents=wallet.investing_cents
+    )
+
+
+@router.get("/wallet/portfolio", tags=["wallet"])
+async def get_portfolio(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async)
+):
+    """Get portfolio summary with returns."""
+    wallet = await _get_or_create_wallet(db, current_user.public_id)
+    cost_basis_cents, current_value_cents = value_investing_wallet(wallet, date.today())
+    
+    return get_portfolio_summary(current_user.public_id, cost_basis_cents, current_value_cents)
+
+
+@router.get("/goals", response_model=List[GoalResponse], tags=["goals"])
+async def get_goals(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async)
+):
+    """Get all user's goals."""
+    goals = (await db.execute(
+        select(Goal).where(Goal.user_public_id == current_user.public_id).order_by(Goal.created_at.desc())
+    )).scalars().all()
+    
+    return [GoalResponse.model_validate(g) for g in goals]
+
+
+@router.get("/transactions/page", response_model=TransactionPage, tags=["transactions"])
+async def get_transactions_page(
+    cursor: str = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    since: str = Query(None, description="ISO8601 timestamp to fetch transactions since"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async)
+):
+    """Page through the user's stored transactions, newest first."""
+    return await db.run_sync(_transaction_page, current_user.public_id, cursor, limit, since)
+
+
+@router.get("/roundup/pending", response_model=PendingRoundupPage, tags=["roundup"])
+async def get_pending_roundups(
+    cursor: str = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async)
+):
+    """List transactions that haven't been rounded up yet, with the total available."""
+    return await db.run_sync(_pending_roundup_page, current_user.public_id, cursor, limit)
+
+
+@router.post(
+    "/plaid/sync",
+    tags=["plaid"],
+    dependencies=[Depends(limit_by_user(plaid_limiter, user_dependency=get_current_user_async))]
+)
+async def sync_transactions(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async)
+):
+    """Manually sync transactions from all of the user's linked Plaid items."""
+    items = (await db.execute(
+        select(PlaidItem).where(PlaidItem.user_public_id == current_user.public_id)
+    )).scalars().all()
+    
+    _require_items(items)
+    
+    try:
+        _, errors = await sync_plaid_items_async(db, current_user, items, plaid_client)
+    except Exception as e:
+        await db.rollback()
+        raise _sync_failed(e)
+    
+    return _sync_result(items, errors)
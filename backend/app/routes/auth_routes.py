@@ -1,40 +1,36 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi import Request
 from sqlalchemy.orm import Session
-from collections import defaultdict
-from datetime import datetime, timedelta
 from app.db import get_db
 from app.models import User, Wallet, Allocation
 from app.schemas import UserSignup, UserLogin, Token, UserResponse
-from app.utils.security import hash_password, verify_password, create_access_token
+from app.utils.security import (
+    PasswordHasherBusy, hash_password, verify_and_update_password, create_access_token
+)
 from app.utils.ids import generate_public_id
-from app.auth import get_current_user
+from app.utils.rate_limit import RateLimiter, limit_by_ip
+from app.auth import UserSnapshot, get_current_user
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-# Simple in-memory rate limiting (sliding window per IP)
-login_attempts = defaultdict(list)
-MAX_ATTEMPTS = 5
-WINDOW_MINUTES = 15
+# Per client IP: login attempts per 15 minutes, signups per hour
+login_limiter = RateLimiter("login", limit=5, window_seconds=15 * 60)
+signup_limiter = RateLimiter("signup", limit=10, window_seconds=60 * 60)
 
 
-def check_rate_limit(ip: str) -> bool:
-    """Check if IP is rate limited."""
-    now = datetime.utcnow()
-    cutoff = now - timedelta(minutes=WINDOW_MINUTES)
-    
-    # Clean old attempts
-    login_attempts[ip] = [t for t in login_attempts[ip] if t > cutoff]
-    
-    # Check limit
-    if len(login_attempts[ip]) >= MAX_ATTEMPTS:
-        return False
-    
-    login_attempts[ip].append(now)
-    return True
+def _busy_error() -> HTTPException:
+    """503 for when the password hashing pool is saturated."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy. Please try again shortly.",
+        headers={"Retry-After": "1"}
+    )
 
 
-@router.post("/signup", response_model=Token)
+@router.post(
+    "/signup",
+    response_model=Token,
+    dependencies=[Depends(limit_by_ip(signup_limiter, "Too many signups. Please try again later."))]
+)
 def signup(user_data: UserSignup, db: Session = Depends(get_db)):
     """Create a new user account."""
     # Check if email already exists
@@ -51,7 +47,10 @@ def signup(user_data: UserSignup, db: Session = Depends(get_db)):
     while db.query(User).filter(User.public_id == public_id).first():
         public_id = generate_public_id()
     
-    hashed_pw = hash_password(user_data.password)
+    try:
+        hashed_pw = hash_password(user_data.password)
+    except PasswordHasherBusy:
+        raise _busy_error()
     monthly_goal_cents = int(user_data.monthly_goal * 100)
     
     user = User(
@@ -87,17 +86,13 @@ def signup(user_data: UserSignup, db: Session = Depends(get_db)):
     return Token(access_token=access_token)
 
 
-@router.post("/login", response_model=Token)
-def login(credentials: UserLogin, db: Session = Depends(get_db), request: Request = None):
+@router.post(
+    "/login",
+    response_model=Token,
+    dependencies=[Depends(limit_by_ip(login_limiter, "Too many login attempts. Please try again later."))]
+)
+def login(credentials: UserLogin, db: Session = Depends(get_db)):
     """Authenticate user and return JWT token."""
-    # Rate limiting check (basic)
-    client_ip = request.client.host if request and request.client else "unknown"
-    if not check_rate_limit(client_ip):
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Too many login attempts. Please try again later."
-        )
-    
     # Find user
     user = db.query(User).filter(User.email == credentials.email).first()
     if not user:
@@ -107,12 +102,22 @@ def login(credentials: UserLogin, db: Session = Depends(get_db), request: Reques
         )
     
     # Verify password
-    if not verify_password(credentials.password, user.hashed_password):
+    try:
+        verified, new_hash = verify_and_update_password(credentials.password, user.hashed_password)
+    except PasswordHasherBusy:
+        raise _busy_error()
+    
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
+    # Stored hash used outdated Argon2 parameters; keep the upgraded one
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
+    
     # Create JWT token
     access_token = create_access_token(data={"sub": user.public_id})
     
@@ -120,7 +125,7 @@ def login(credentials: UserLogin, db: Session = Depends(get_db), request: Reques
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+def get_current_user_info(current_user: UserSnapshot = Depends(get_current_user)):
     """Get current user information."""
     return UserResponse(
         public_id=current_user.public_id,
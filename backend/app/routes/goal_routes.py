@@ -1,19 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.db import get_db
-from app.models import Goal, User
-from app.auth import get_current_user
-from app.schemas import GoalCreate, GoalResponse
+from app.models import Goal
+from app.auth import UserSnapshot, get_current_user
+from app.schemas import GoalCreate, GoalResponse, GoalProjectionResponse
+from app.services.goal_projection import project_goal
+from app.utils.rate_limit import RateLimiter, limit_by_user
 
 router = APIRouter(prefix="/goals", tags=["goals"])
 
+# Projections run a Monte Carlo simulation when not cached
+projection_limiter = RateLimiter("goal_projection", limit=30, window_seconds=60)
+
 
 @router.post("", response_model=GoalResponse)
 def create_goal(
     goal_data: GoalCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Create a new goal."""
     # If this is set as default, unset other defaults
@@ -40,7 +45,7 @@ def create_goal(
 @router.get("", response_model=List[GoalResponse])
 def get_goals(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Get all user's goals."""
     goals = db.query(Goal).filter(
@@ -54,7 +59,7 @@ def get_goals(
 def get_goal(
     goal_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Get a specific goal."""
     goal = db.query(Goal).filter(
@@ -71,12 +76,38 @@ def get_goal(
     return GoalResponse.model_validate(goal)
 
 
+@router.get(
+    "/{goal_id}/projection",
+    response_model=GoalProjectionResponse,
+    dependencies=[Depends(limit_by_user(projection_limiter))]
+)
+def get_goal_projection(
+    goal_id: int,
+    invested: bool = Query(False, description="Also simulate market returns on the balance"),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """Estimate when a goal will be reached (P10/P50/P90) from recent round-ups."""
+    goal = db.query(Goal).filter(
+        Goal.id == goal_id,
+        Goal.user_public_id == current_user.public_id
+    ).first()
+    
+    if not goal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Goal not found"
+        )
+    
+    return GoalProjectionResponse(**project_goal(db, goal, invested=invested))
+
+
 @router.put("/{goal_id}", response_model=GoalResponse)
 def update_goal(
     goal_id: int,
     goal_data: GoalCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Update a goal."""
     goal = db.query(Goal).filter(
@@ -113,7 +144,7 @@ def update_goal(
 def delete_goal(
     goal_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Delete a goal."""
     goal = db.query(Goal).filter(
@@ -137,7 +168,7 @@ def delete_goal(
 def set_default_goal(
     goal_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Set a goal as the default goal."""
     goal = db.query(Goal).filter(
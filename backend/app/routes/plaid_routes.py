@@ -1,20 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import datetime
+from typing import Dict, List
 from app.db import get_db
-from app.models import PlaidItem, User
-from app.auth import get_current_user
+from app.models import PlaidItem, Transaction
+from app.auth import UserSnapshot, get_current_user
 from app.plaid_client import PlaidClient
 from app.schemas import PlaidLinkTokenResponse, PlaidExchangeRequest, PlaidItemResponse
-from app.services.transaction_service import sync_plaid_transactions
+from app.services.transaction_service import backfill_plaid_item, sync_plaid_items
+from app.utils.rate_limit import RateLimiter, limit_by_user
 
 router = APIRouter(prefix="/plaid", tags=["plaid"])
 
 plaid_client = PlaidClient()
 
+# Calls that hit the Plaid API, per user
+plaid_limiter = RateLimiter("plaid", limit=20, window_seconds=10 * 60)
 
-@router.post("/link_token", response_model=PlaidLinkTokenResponse)
-def create_link_token(current_user: User = Depends(get_current_user)):
+
+@router.post(
+    "/link_token",
+    response_model=PlaidLinkTokenResponse,
+    dependencies=[Depends(limit_by_user(plaid_limiter))]
+)
+def create_link_token(current_user: UserSnapshot = Depends(get_current_user)):
     """Create a Plaid Link token for the current user."""
     try:
         link_token = plaid_client.create_link_token(current_user.public_id)
@@ -26,11 +35,11 @@ def create_link_token(current_user: User = Depends(get_current_user)):
         )
 
 
-@router.post("/exchange_public_token")
+@router.post("/exchange_public_token", dependencies=[Depends(limit_by_user(plaid_limiter))])
 def exchange_public_token(
     request: PlaidExchangeRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Exchange Plaid public token for access token and store item."""
     try:
@@ -58,6 +67,7 @@ def exchange_public_token(
                 existing_item.institution_id = institution_id
             if institution_name:
                 existing_item.institution_name = institution_name
+            plaid_item = existing_item
         else:
             # Create new item
             plaid_item = PlaidItem(
@@ -69,12 +79,18 @@ def exchange_public_token(
                 last_sync=datetime.utcnow()
             )
             db.add(plaid_item)
+            
+            # Real transactions replace the demo dataset
+            db.query(Transaction).filter(
+                Transaction.user_public_id == current_user.public_id,
+                Transaction.source == "local"
+            ).delete(synchronize_session=False)
         
         db.commit()
         
-        # Sync transactions
+        # Load transaction history
         try:
-            sync_plaid_transactions(db, current_user, access_token, plaid_client)
+            backfill_plaid_item(db, current_user, plaid_item, plaid_client)
         except Exception as e:
             # Log but don't fail the exchange
             print(f"Failed to sync transactions: {e}")
@@ -92,7 +108,7 @@ def exchange_public_token(
 @router.get("/item", response_model=PlaidItemResponse)
 def get_plaid_item(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Get the user's Plaid item information."""
     item = db.query(PlaidItem).filter(
@@ -112,30 +128,49 @@ def get_plaid_item(
     )
 
 
-@router.post("/sync")
+@router.post("/sync", dependencies=[Depends(limit_by_user(plaid_limiter))])
 def sync_transactions(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
-    """Manually sync transactions from Plaid."""
-    item = db.query(PlaidItem).filter(
+    """Manually sync transactions from all of the user's linked Plaid items."""
+    items = db.query(PlaidItem).filter(
         PlaidItem.user_public_id == current_user.public_id
-    ).first()
-    
-    if not item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No Plaid item connected"
-        )
+    ).all()
+    _require_items(items)
     
     try:
-        sync_plaid_transactions(db, current_user, item.access_token, plaid_client)
-        item.last_sync = datetime.utcnow()
-        db.commit()
-        return {"status": "success", "message": "Transactions synced"}
+        _, errors = sync_plaid_items(db, current_user, items, plaid_client)
     except Exception as e:
         db.rollback()
+        raise _sync_failed(e)
+    
+    return _sync_result(items, errors)
+
+
+def _require_items(items: List[PlaidItem]) -> None:
+    if not items:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to sync: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No Plaid item connected"
         )
+
+
+def _sync_failed(error: Exception) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Failed to sync: {str(error)}"
+    )
+
+
+def _sync_result(items: List[PlaidItem], errors: Dict[str, Exception]) -> dict:
+    """The /plaid/sync response; fails only if every item did. Shared with the async route."""
+    if len(errors) == len(items):
+        raise _sync_failed(next(iter(errors.values())))
+    
+    # Items that failed keep their cursor and are retried on the next sync
+    return {
+        "status": "success",
+        "message": "Transactions synced",
+        "failed_items": sorted(errors)
+    }
@@ -1,10 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.db import get_db
-from app.models import Transaction, User
-from app.auth import get_current_user
-from app.schemas import RoundupRequest, RoundupResponse
-from app.services.allocation_service import calculate_roundup, apply_roundup
+from app.models import Roundup, Transaction
+from app.auth import UserSnapshot, get_current_user
+from app.schemas import (
+    RoundupRequest, RoundupResponse, RoundupBatchRequest, RoundupBatchResponse, RoundupBatchItemResult,
+    PendingRoundup, PendingRoundupPage
+)
+from app.services.allocation_service import (
+    IdempotencyKeyReused, calculate_roundup, apply_roundup, apply_roundups, get_existing_roundups,
+    get_roundup_by_idempotency_key
+)
+from app.services.transaction_service import list_pending_roundups
 
 router = APIRouter(prefix="/roundup", tags=["roundup"])
 
@@ -13,7 +22,7 @@ router = APIRouter(prefix="/roundup", tags=["roundup"])
 def calculate_roundup_amount(
     transaction_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Calculate round-up amount for a transaction."""
     # Find transaction
@@ -38,13 +47,80 @@ def calculate_roundup_amount(
     }
 
 
+@router.get("/pending", response_model=PendingRoundupPage)
+def get_pending_roundups(
+    cursor: str = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """List transactions that haven't been rounded up yet, with the total available."""
+    return _pending_roundup_page(db, current_user.public_id, cursor, limit)
+
+
+def _pending_roundup_page(db: Session, user_public_id: str, cursor: str, limit: int) -> PendingRoundupPage:
+    """Build a /roundup/pending response; shared with the async route."""
+    try:
+        transactions, next_cursor, pending_count, pending_roundup_cents = list_pending_roundups(
+            db,
+            user_public_id,
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
+    return PendingRoundupPage(
+        transactions=[PendingRoundup.model_validate(t) for t in transactions],
+        pending_count=pending_count,
+        pending_roundup_cents=pending_roundup_cents,
+        next_cursor=next_cursor
+    )
+
+
+def _roundup_response(roundup: Roundup) -> RoundupResponse:
+    return RoundupResponse(
+        roundup_cents=roundup.roundup_cents,
+        savings_cents=roundup.savings_cents,
+        investing_cents=roundup.investing_cents,
+        goals_cents=roundup.goals_cents,
+        goal_id=roundup.goal_id
+    )
+
+
+def _key_reused_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail="Idempotency-Key was already used for a different transaction"
+    )
+
+
 @router.post("", response_model=RoundupResponse)
 def apply_roundup_to_transaction(
     request: RoundupRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
-    """Apply round-up to a transaction and allocate funds."""
+    """Apply round-up to a transaction and allocate funds.
+    
+    Retries are safe: a transaction is only ever rounded up once, and a
+    replayed request (same transaction or same Idempotency-Key header) gets
+    the stored result back.
+    """
+    if idempotency_key:
+        stored = get_roundup_by_idempotency_key(db, current_user.public_id, idempotency_key)
+        
+        if stored:
+            if stored.transaction_id != request.transaction_id:
+                raise _key_reused_error()
+            response.headers["Idempotent-Replayed"] = "true"
+            return _roundup_response(stored)
+    
     # Find transaction
     transaction = db.query(Transaction).filter(
         Transaction.transaction_id == request.transaction_id,
@@ -66,19 +142,99 @@ def apply_roundup_to_transaction(
             detail="No round-up available for this transaction"
         )
     
-    # Apply round-up
-    roundup = apply_roundup(
-        db,
-        current_user,
-        request.transaction_id,
-        roundup_cents,
-        request.goal_id
-    )
+    # Apply round-up (returns the stored one if the transaction was already rounded up)
+    try:
+        roundup = apply_roundup(
+            db,
+            current_user,
+            request.transaction_id,
+            roundup_cents,
+            request.goal_id,
+            idempotency_key=idempotency_key
+        )
+    except IdempotencyKeyReused:
+        # A concurrent request took the key first; same answer as if it had finished
+        raise _key_reused_error()
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The round-up conflicted with a concurrent update; retry the request"
+        )
     
-    return RoundupResponse(
-        roundup_cents=roundup.roundup_cents,
-        savings_cents=roundup.savings_cents,
-        investing_cents=roundup.investing_cents,
-        goals_cents=roundup.goals_cents,
-        goal_id=roundup.goal_id
+    if idempotency_key and roundup.idempotency_key != idempotency_key:
+        response.headers["Idempotent-Replayed"] = "true"
+    
+    return _roundup_response(roundup)
+
+
+@router.post("/batch", response_model=RoundupBatchResponse)
+def apply_roundup_batch(
+    request: RoundupBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """Apply round-ups to many transactions in one DB transaction.
+    
+    Transactions that were already rounded up are reported as
+    "already_applied" with their stored result, so a retried batch is safe.
+    """
+    transaction_ids = [item.transaction_id for item in request.items]
+    transactions = {
+        t.transaction_id: t
+        for t in db.query(Transaction).filter(
+            Transaction.user_public_id == current_user.public_id,
+            Transaction.transaction_id.in_(transaction_ids)
+        ).all()
+    }
+    existing = get_existing_roundups(db, current_user.public_id, transaction_ids)
+    
+    statuses = []
+    to_apply = []
+    seen = set()
+    for item in request.items:
+        transaction = transactions.get(item.transaction_id)
+        if item.transaction_id in seen:
+            statuses.append("duplicate")
+        elif item.transaction_id in existing:
+            statuses.append("already_applied")
+        elif not transaction:
+            statuses.append("not_found")
+        elif calculate_roundup(transaction.amount_cents) <= 0:
+            statuses.append("no_roundup")
+        else:
+            statuses.append("applied")
+            to_apply.append((
+                item.transaction_id,
+                calculate_roundup(transaction.amount_cents),
+                item.goal_id
+            ))
+        seen.add(item.transaction_id)
+    
+    try:
+        applied = iter(apply_roundups(db, current_user, to_apply) if to_apply else [])
+    except IntegrityError:
+        # A concurrent request rounded up one of these transactions first
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Some of these transactions were rounded up concurrently; retry the batch"
+        )
+    
+    results = []
+    for item, item_status in zip(request.items, statuses):
+        roundup = None
+        if item_status == "applied":
+            roundup = next(applied)
+        elif item_status == "already_applied":
+            roundup = existing[item.transaction_id]
+        results.append(RoundupBatchItemResult(
+            transaction_id=item.transaction_id,
+            status=item_status,
+            roundup=_roundup_response(roundup) if roundup else None
+        ))
+    
+    return RoundupBatchResponse(
+        results=results,
+        applied_count=len(to_apply),
+        total_roundup_cents=sum(roundup_cents for _, roundup_cents, _ in to_apply)
     )
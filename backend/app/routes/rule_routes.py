@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List
+from app.db import get_db
+from app.models import MerchantRule
+from app.auth import UserSnapshot, get_current_user
+from app.schemas import MerchantRuleCreate, MerchantRuleResponse
+from app.services.rules_engine import invalidate_rules
+
+router = APIRouter(prefix="/rules", tags=["rules"])
+
+
+@router.get("", response_model=List[MerchantRuleResponse])
+def get_rules(
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """Get all user's merchant rules."""
+    rules = db.query(MerchantRule).filter(
+        MerchantRule.user_public_id == current_user.public_id
+    ).order_by(MerchantRule.created_at.desc()).all()
+    
+    return [MerchantRuleResponse.model_validate(r) for r in rules]
+
+
+@router.post("", response_model=MerchantRuleResponse)
+def create_rule(
+    rule_data: MerchantRuleCreate,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """Create a merchant rule, e.g. always round up at a merchant."""
+    rule = MerchantRule(
+        user_public_id=current_user.public_id,
+        **rule_data.model_dump()
+    )
+    db.add(rule)
+    db.commit()
+    db.refresh(rule)
+    invalidate_rules(current_user.public_id)
+    
+    return MerchantRuleResponse.model_validate(rule)
+
+
+@router.put("/{rule_id}", response_model=MerchantRuleResponse)
+def update_rule(
+    rule_id: int,
+    rule_data: MerchantRuleCreate,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """Update a merchant rule."""
+    rule = db.query(MerchantRule).filter(
+        MerchantRule.id == rule_id,
+        MerchantRule.user_public_id == current_user.public_id
+    ).first()
+    
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Rule not found"
+        )
+    
+    for field, value in rule_data.model_dump().items():
+        setattr(rule, field, value)
+    
+    db.commit()
+    db.refresh(rule)
+    invalidate_rules(current_user.public_id)
+    
+    return MerchantRuleResponse.model_validate(rule)
+
+
+@router.delete("/{rule_id}")
+def delete_rule(
+    rule_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """Delete a merchant rule."""
+    rule = db.query(MerchantRule).filter(
+        MerchantRule.id == rule_id,
+        MerchantRule.user_public_id == current_user.public_id
+    ).first()
+    
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Rule not found"
+        )
+    
+    db.delete(rule)
+    db.commit()
+    invalidate_rules(current_user.public_id)
+    
+    return {"status": "success"}
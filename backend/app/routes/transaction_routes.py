@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from typing import List
 from app.db import get_db
-from app.models import Transaction, PlaidItem, User
-from app.auth import get_current_user
-from app.schemas import TransactionResponse
-from app.services.transaction_service import generate_demo_transactions, sync_plaid_transactions
+from app.models import PlaidItem
+from app.auth import UserSnapshot, get_current_user
+from app.config import settings
+from app.schemas import TransactionResponse, TransactionPage
+from app.services.transaction_service import (
+    generate_demo_transactions, ensure_demo_transactions, sync_plaid_items, list_transactions
+)
+from app.services.sync_service import schedule_plaid_refresh
 from app.plaid_client import PlaidClient
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
@@ -16,57 +20,107 @@ plaid_client = PlaidClient()
 
 @router.get("", response_model=List[TransactionResponse])
 def get_transactions(
+    background_tasks: BackgroundTasks,
     since: str = Query(None, description="ISO8601 timestamp to fetch transactions since"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Get user's transactions. Returns Plaid transactions if linked, otherwise demo transactions."""
     # Check if user has Plaid linked
-    plaid_item = db.query(PlaidItem).filter(
+    plaid_items = db.query(PlaidItem).filter(
         PlaidItem.user_public_id == current_user.public_id
-    ).first()
+    ).all()
     
-    if plaid_item:
-        # Try to sync latest transactions
-        try:
-            sync_plaid_transactions(db, current_user, plaid_item.access_token, plaid_client)
-            plaid_item.last_sync = datetime.utcnow()
-            db.commit()
-        except Exception:
-            db.rollback()
-            # Continue with cached transactions
-        
-        # Query transactions from DB
-        query = db.query(Transaction).filter(
-            Transaction.user_public_id == current_user.public_id
-        )
-        
-        if since:
+    refresh_items = []
+    if plaid_items:
+        if settings.transactions_stale_while_revalidate:
+            # Serve cached rows now, refresh from Plaid after the response if stale
+            refresh_items = plaid_items
+        else:
+            # Try to sync latest transactions; failed items keep their cached rows
             try:
-                since_dt = datetime.fromisoformat(since.replace('Z', '+00:00'))
-                query = query.filter(Transaction.timestamp >= since_dt)
-            except ValueError:
-                pass  # Invalid date format, ignore
-        
-        transactions = query.order_by(Transaction.timestamp.desc()).limit(100).all()
+                sync_plaid_items(db, current_user, plaid_items, plaid_client)
+            except Exception:
+                pass  # Continue with cached transactions
+    elif settings.demo_data_mode == "persisted":
+        # Store the user's stable demo dataset; only days since the last call are added
+        ensure_demo_transactions(db, current_user.public_id)
+    
+    # Query transactions from DB
+    transactions, _ = list_transactions(
+        db,
+        current_user.public_id,
+        since=_parse_since(since),
+        limit=100
+    )
+    
+    if transactions:
+        response = [TransactionResponse.model_validate(t) for t in transactions]
+    else:
+        # Fallback to demo transactions if no Plaid or no transactions
+        demo_txns = generate_demo_transactions(current_user.public_id, count=20)
         
-        if transactions:
-            return [TransactionResponse.model_validate(t) for t in transactions]
+        # Convert to TransactionResponse format
+        response = [
+            TransactionResponse(
+                id=i,
+                transaction_id=t["transaction_id"],
+                amount_cents=t["amount_cents"],
+                merchant=t["merchant"],
+                category=t["category"],
+                timestamp=t["timestamp"],
+                source=t["source"],
+                pending=t["pending"]
+            )
+            for i, t in enumerate(demo_txns)
+        ]
     
-    # Fallback to demo transactions if no Plaid or no transactions
-    demo_txns = generate_demo_transactions(current_user.public_id, count=20)
+    # Queued last, so a request that fails before this point doesn't claim the items
+    if refresh_items:
+        schedule_plaid_refresh(current_user.public_id, refresh_items, background_tasks, plaid_client)
     
-    # Convert to TransactionResponse format
-    return [
-        TransactionResponse(
-            id=i,
-            transaction_id=t["transaction_id"],
-            amount_cents=t["amount_cents"],
-            merchant=t["merchant"],
-            category=t["category"],
-            timestamp=t["timestamp"],
-            source=t["source"],
-            pending=t["pending"]
+    return response
+
+
+@router.get("/page", response_model=TransactionPage)
+def get_transactions_page(
+    cursor: str = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    since: str = Query(None, description="ISO8601 timestamp to fetch transactions since"),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """Page through the user's stored transactions, newest first."""
+    return _transaction_page(db, current_user.public_id, cursor, limit, since)
+
+
+def _transaction_page(db: Session, user_public_id: str, cursor: str, limit: int, since: str) -> TransactionPage:
+    """Build a /transactions/page response; shared with the async route."""
+    try:
+        transactions, next_cursor = list_transactions(
+            db,
+            user_public_id,
+            since=_parse_since(since),
+            cursor=cursor,
+            limit=limit
         )
-        for i, t in enumerate(demo_txns)
-    ]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
+    return TransactionPage(
+        transactions=[TransactionResponse.model_validate(t) for t in transactions],
+        next_cursor=next_cursor
+    )
+
+
+def _parse_since(since: str):
+    """Parse the `since` query parameter, ignoring invalid values."""
+    if not since:
+        return None
+    try:
+        return datetime.fromisoformat(since.replace('Z', '+00:00'))
+    except ValueError:
+        return None  # Invalid date format, ignore
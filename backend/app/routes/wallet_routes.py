@@ -1,18 +1,25 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta
 from app.db import get_db
-from app.models import Wallet, User
-from app.auth import get_current_user
-from app.schemas import WalletResponse
-from app.services.portfolio_simulator import get_portfolio_summary
+from app.models import Wallet
+from app.auth import UserSnapshot, get_current_user
+from app.schemas import WalletResponse, PortfolioHistoryPoint, PortfolioHistoryResponse
+from app.services.portfolio_simulator import (
+    get_investing_contributions, get_portfolio_summary, portfolio_history, value_investing_wallet
+)
+from app.utils.downsample import lttb
 
 router = APIRouter(prefix="/wallet", tags=["wallet"])
 
+# Days shown for each chart range; ALL starts at the first investing round-up
+HISTORY_RANGE_DAYS = {"1W": 7, "1M": 30, "1Y": 365}
+
 
 @router.get("", response_model=WalletResponse)
 def get_wallet(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Get user's wallet balances."""
     wallet = db.query(Wallet).filter(
@@ -35,7 +42,7 @@ def get_wallet(
 @router.get("/portfolio")
 def get_portfolio(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Get portfolio summary with returns."""
     wallet = db.query(Wallet).filter(
@@ -48,14 +55,48 @@ def get_portfolio(
         db.commit()
         db.refresh(wallet)
     
-    # Calculate initial investment (sum of all investing contributions)
-    # For simplicity, use current value as baseline
-    initial_investment = max(wallet.investing_cents, 1000)  # Min $10
+    # Cost basis and index units are kept on the wallet, so no ledger scan is needed
+    cost_basis_cents, current_value_cents = value_investing_wallet(wallet, date.today())
     
     summary = get_portfolio_summary(
         current_user.public_id,
-        initial_investment,
-        wallet.investing_cents
+        cost_basis_cents,
+        current_value_cents
     )
     
     return summary
+
+
+@router.get("/portfolio/history", response_model=PortfolioHistoryResponse)
+def get_portfolio_history(
+    range: str = Query("1M", pattern="^(1W|1M|1Y|ALL)$"),
+    points: int = Query(120, ge=3, le=1000, description="Maximum points to return"),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """Get the investing wallet's value over time, downsampled for charting."""
+    wallet = db.query(Wallet).filter(
+        Wallet.user_public_id == current_user.public_id
+    ).first()
+    investing_cents = wallet.investing_cents if wallet else 0
+    
+    contributions = get_investing_contributions(db, current_user.public_id)
+    # Contribution days are UTC dates, so end the range on today's UTC date too
+    today = datetime.utcnow().date()
+    if range in HISTORY_RANGE_DAYS:
+        first_day = today - timedelta(days=HISTORY_RANGE_DAYS[range])
+    else:
+        first_day = min(contributions[0][0], today) if contributions else today - timedelta(days=HISTORY_RANGE_DAYS["1M"])
+    
+    dates, values = portfolio_history(contributions, investing_cents, first_day, today)
+    
+    # Downsample on arrays so the payload stays small however long the history is
+    keep = lttb(dates.astype("int64"), values.astype("float64"), points)
+    
+    return PortfolioHistoryResponse(
+        range=range,
+        points=[
+            PortfolioHistoryPoint(date=str(day), value_cents=value)
+            for day, value in zip(dates[keep].tolist(), values[keep].tolist())
+        ]
+    )
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr, field_validator, model_validator
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
+from typing import List, Optional
+from datetime import date, datetime
 from app.utils.validation import (
     validate_email, validate_name, validate_school, validate_grad_year,
     validate_monthly_goal, validate_password
@@ -122,6 +122,11 @@ class TransactionResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class TransactionPage(BaseModel):
+    transactions: List[TransactionResponse]
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to get the next page
+
+
 class WalletResponse(BaseModel):
     savings_cents: int
     investing_cents: int
@@ -148,6 +153,27 @@ class GoalResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class GoalProjectionResponse(BaseModel):
+    goal_id: int
+    target_cents: int
+    current_cents: int
+    daily_contribution_cents: float  # Mean over the lookback window
+    # Dates by which 10/50/90% of simulated paths reach the target; None if beyond the horizon
+    p10_date: Optional[date] = None
+    p50_date: Optional[date] = None
+    p90_date: Optional[date] = None
+
+
+class PortfolioHistoryPoint(BaseModel):
+    date: str  # "YYYY-MM-DD"
+    value_cents: int
+
+
+class PortfolioHistoryResponse(BaseModel):
+    range: str
+    points: List[PortfolioHistoryPoint]
+
+
 class AllocationUpdate(BaseModel):
     savings_percent: float
     investing_percent: float
@@ -169,6 +195,43 @@ class AllocationResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class AllocationSimulationTotals(BaseModel):
+    roundup_cents: int
+    savings_cents: int
+    investing_cents: int
+    goals_cents: int
+
+
+class AllocationSimulationMonth(AllocationSimulationTotals):
+    month: str  # "YYYY-MM"
+
+
+class AllocationSimulationResponse(BaseModel):
+    transaction_count: int
+    totals: AllocationSimulationTotals
+    months: List[AllocationSimulationMonth]
+    current_totals: Optional[AllocationSimulationTotals] = None  # Same history under the current allocation
+
+
+class MerchantRuleCreate(BaseModel):
+    merchant: str
+    auto_roundup: bool = True
+    category: Optional[str] = None
+    min_amount_cents: Optional[int] = None
+    max_amount_cents: Optional[int] = None
+
+
+class MerchantRuleResponse(BaseModel):
+    id: int
+    merchant: str
+    auto_roundup: bool
+    category: Optional[str] = None
+    min_amount_cents: Optional[int] = None
+    max_amount_cents: Optional[int] = None
+    
+    model_config = {"from_attributes": True}
+
+
 class RoundupRequest(BaseModel):
     transaction_id: str
     goal_id: Optional[int] = None
@@ -182,6 +245,40 @@ class RoundupResponse(BaseModel):
     goal_id: Optional[int] = None
 
 
+class RoundupBatchRequest(BaseModel):
+    items: List[RoundupRequest] = Field(..., min_length=1, max_length=200)
+
+
+class RoundupBatchItemResult(BaseModel):
+    transaction_id: str
+    status: str  # "applied", "already_applied", "not_found", "no_roundup" or "duplicate"
+    roundup: Optional[RoundupResponse] = None
+
+
+class RoundupBatchResponse(BaseModel):
+    results: List[RoundupBatchItemResult]
+    applied_count: int
+    total_roundup_cents: int
+
+
+class PendingRoundup(BaseModel):
+    transaction_id: str
+    amount_cents: int
+    merchant: str
+    category: Optional[str] = None
+    timestamp: datetime
+    roundup_cents: int
+    
+    model_config = {"from_attributes": True}
+
+
+class PendingRoundupPage(BaseModel):
+    transactions: List[PendingRoundup]
+    pending_count: int  # All pending transactions, not just this page
+    pending_roundup_cents: int
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to get the next page
+
+
 class EventCreate(BaseModel):
     event_type: str
     metadata: Optional[str] = None
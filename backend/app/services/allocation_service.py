@@ -1,6 +1,11 @@
+from sqlalchemy import case, func, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 from app.models import Allocation, Wallet, Goal, Roundup, User
-from typing import Optional
+from app.services.market_index import market_index
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 def calculate_roundup(amount_cents: int) -> int:
@@ -13,14 +18,104 @@ def calculate_roundup(amount_cents: int) -> int:
     return 100 - (amount_cents % 100)
 
 
+def roundup_cents_sql(amount_cents):
+    """SQL expression computing calculate_roundup for an amount column."""
+    return case((amount_cents % 100 == 0, 100), else_=100 - amount_cents % 100)
+
+
+def split_roundup(roundup_cents: int, allocation: Allocation) -> Tuple[int, int, int]:
+    """Split a round-up into (savings, investing, goals) cents by allocation percentages."""
+    savings_cents = int(roundup_cents * allocation.savings_percent / 100)
+    investing_cents = int(roundup_cents * allocation.investing_percent / 100)
+    goals_cents = roundup_cents - savings_cents - investing_cents  # Remainder to goals
+    return savings_cents, investing_cents, goals_cents
+
+
+def find_default_goal(goals: Iterable[Goal]) -> Optional[Goal]:
+    """The goal round-ups without a goal_id go to; their goal share goes to savings if None."""
+    return next((goal for goal in goals if goal.is_default), None)
+
+
+def get_existing_roundups(
+    db: Session,
+    user_public_id: str,
+    transaction_ids: List[str]
+) -> Dict[str, Roundup]:
+    """Map transaction ids that were already rounded up to their Roundup rows.
+    
+    A single lookup on the unique (user_public_id, transaction_id) index.
+    """
+    if not transaction_ids:
+        return {}
+    
+    roundups = db.query(Roundup).filter(
+        Roundup.user_public_id == user_public_id,
+        Roundup.transaction_id.in_(transaction_ids)
+    ).all()
+    return {roundup.transaction_id: roundup for roundup in roundups}
+
+
+class IdempotencyKeyReused(Exception):
+    """Raised when an Idempotency-Key already belongs to a round-up of another transaction."""
+
+
+def get_roundup_by_idempotency_key(db: Session, user_public_id: str, idempotency_key: str) -> Optional[Roundup]:
+    """The round-up created with `idempotency_key`, if any."""
+    return db.query(Roundup).filter(
+        Roundup.user_public_id == user_public_id,
+        Roundup.idempotency_key == idempotency_key
+    ).first()
+
+
 def apply_roundup(
     db: Session,
     user: User,
     transaction_id: str,
     roundup_cents: int,
-    goal_id: Optional[int] = None
+    goal_id: Optional[int] = None,
+    idempotency_key: Optional[str] = None
 ) -> Roundup:
-    """Apply a round-up and allocate funds according to user's allocation settings."""
+    """Apply a round-up and allocate funds according to user's allocation settings.
+    
+    Idempotent per transaction: if it was already rounded up (including by a
+    concurrent request), the stored Roundup is returned and nothing changes.
+    Raises IdempotencyKeyReused if a concurrent request used the same key for
+    another transaction.
+    """
+    try:
+        roundup = apply_roundups(db, user, [(transaction_id, roundup_cents, goal_id)], commit=False)[0]
+        if roundup.id is None:
+            roundup.idempotency_key = idempotency_key
+        db.commit()
+        return roundup
+    
+    except IntegrityError:
+        # Lost a race with a concurrent request for the same transaction or key
+        db.rollback()
+        existing = get_existing_roundups(db, user.public_id, [transaction_id])
+        if transaction_id in existing:
+            return existing[transaction_id]
+        if idempotency_key and get_roundup_by_idempotency_key(db, user.public_id, idempotency_key):
+            raise IdempotencyKeyReused(idempotency_key)
+        raise
+
+
+def apply_roundups(
+    db: Session,
+    user: User,
+    roundups: List[Tuple[str, int, Optional[int]]],
+    commit: bool = True
+) -> List[Roundup]:
+    """Apply many round-ups at once.
+    
+    `roundups` holds (transaction_id, roundup_cents, goal_id) tuples. The
+    allocation, wallet and goals are loaded once, balance changes are summed
+    and applied with one atomic UPDATE per row, and all Roundup rows are added in the same commit.
+    Transactions that were already rounded up are skipped and their stored
+    Roundup is returned in their place.
+    """
+    existing = get_existing_roundups(db, user.public_id, [roundup[0] for roundup in roundups])
+    
     # Get user's allocation
     allocation = db.query(Allocation).filter(
         Allocation.user_public_id == user.public_id
@@ -37,56 +132,115 @@ def apply_roundup(
         db.add(allocation)
         db.flush()
     
-    # Calculate allocations
-    savings_cents = int(roundup_cents * allocation.savings_percent / 100)
-    investing_cents = int(roundup_cents * allocation.investing_percent / 100)
-    goals_cents = roundup_cents - savings_cents - investing_cents  # Remainder to goals
-    
-    # Get or create wallet
-    wallet = db.query(Wallet).filter(
-        Wallet.user_public_id == user.public_id
-    ).first()
+    goals = {
+        goal.id: goal
+        for goal in db.query(Goal).filter(Goal.user_public_id == user.public_id).all()
+    }
+    default_goal = find_default_goal(goals.values())
     
-    if not wallet:
-        wallet = Wallet(user_public_id=user.public_id)
-        db.add(wallet)
-    
-    # Update wallet balances
-    wallet.savings_cents += savings_cents
-    wallet.investing_cents += investing_cents
-    
-    # Apply goals allocation
-    if goals_cents > 0:
-        if goal_id:
-            goal = db.query(Goal).filter(
-                Goal.id == goal_id,
-                Goal.user_public_id == user.public_id
-            ).first()
-        else:
-            # Use default goal if exists
-            goal = db.query(Goal).filter(
-                Goal.user_public_id == user.public_id,
-                Goal.is_default == True
-            ).first()
+    savings_total = 0
+    investing_total = 0
+    goal_totals = {}
+    records = []
+    new_records = []
+    for transaction_id, roundup_cents, goal_id in roundups:
+        if transaction_id in existing:
+            records.append(existing[transaction_id])
+            continue
+        
+        savings_cents, investing_cents, goals_cents = split_roundup(roundup_cents, allocation)
         
-        if goal:
-            goal.current_cents += goals_cents
+        # Apply goals allocation, to the chosen goal or the default one
+        goal = goals.get(goal_id) if goal_id else default_goal
+        if goals_cents > 0 and goal:
+            goal_totals[goal.id] = goal_totals.get(goal.id, 0) + goals_cents
         else:
             # If no goal, add to savings instead
-            wallet.savings_cents += goals_cents
+            savings_cents += goals_cents
             goals_cents = 0
+        
+        savings_total += savings_cents
+        investing_total += investing_cents
+        
+        roundup = Roundup(
+            user_public_id=user.public_id,
+            transaction_id=transaction_id,
+            roundup_cents=roundup_cents,
+            savings_cents=savings_cents,
+            investing_cents=investing_cents,
+            goals_cents=goals_cents,
+            goal_id=goal.id if goals_cents > 0 else None
+        )
+        # A transaction listed twice is only rounded up once
+        existing[transaction_id] = roundup
+        records.append(roundup)
+        new_records.append(roundup)
     
-    # Create roundup record
-    roundup = Roundup(
-        user_public_id=user.public_id,
-        transaction_id=transaction_id,
-        roundup_cents=roundup_cents,
-        savings_cents=savings_cents,
-        investing_cents=investing_cents,
-        goals_cents=goals_cents,
-        goal_id=goal_id if goals_cents > 0 else None
+    # Update wallet and goal balances in SQL so concurrent round-ups can't lose updates.
+    # Investing contributions also add to the cost basis and buy index units at today's level.
+    if new_records:
+        investing_units = investing_total / market_index.level(date.today())
+        if increment_wallet(db, user.public_id, savings_total, investing_total, investing_units) is None:
+            db.add(Wallet(
+                user_public_id=user.public_id,
+                savings_cents=savings_total,
+                investing_cents=investing_total,
+                investing_cost_basis_cents=investing_total,
+                investing_units=investing_units
+            ))
+        for goal_id, goals_cents in goal_totals.items():
+            set_committed_value(goals[goal_id], "current_cents", increment_goal(db, goal_id, goals_cents))
+    
+    db.add_all(new_records)
+    if commit:
+        db.commit()
+    
+    return records
+
+
+def increment_wallet(
+    db: Session,
+    user_public_id: str,
+    savings_cents: int = 0,
+    investing_cents: int = 0,
+    investing_units: float = 0.0
+) -> Optional[Tuple[int, int]]:
+    """Add to a wallet's balances with a single UPDATE ... SET x = x + delta.
+    
+    Investing cents also count towards the cost basis, alongside the index
+    units they bought. Returns the new (savings_cents, investing_cents), or
+    None if the user has no wallet.
+    """
+    stmt = update(Wallet).where(Wallet.user_public_id == user_public_id).values(
+        savings_cents=Wallet.savings_cents + savings_cents,
+        investing_cents=Wallet.investing_cents + investing_cents,
+        # NULL on wallets created before these columns existed; start them from zero
+        investing_cost_basis_cents=func.coalesce(Wallet.investing_cost_basis_cents, 0) + investing_cents,
+        investing_units=func.coalesce(Wallet.investing_units, 0.0) + investing_units
     )
-    db.add(roundup)
-    db.commit()
+    row = _execute_increment(db, stmt, Wallet.savings_cents, Wallet.investing_cents)
+    return tuple(row) if row else None
+
+
+def increment_goal(db: Session, goal_id: int, cents: int) -> Optional[int]:
+    """Add to a goal's balance with a single UPDATE; returns the new current_cents."""
+    stmt = update(Goal).where(Goal.id == goal_id).values(
+        current_cents=Goal.current_cents + cents
+    )
+    row = _execute_increment(db, stmt, Goal.current_cents)
+    return row[0] if row else None
+
+
+def _execute_increment(db: Session, stmt, *columns):
+    """Run an increment UPDATE and return the row's new values (None if no row matched).
+    
+    Uses UPDATE ... RETURNING where the dialect supports it, otherwise reads
+    the values back inside the same transaction.
+    """
+    stmt = stmt.execution_options(synchronize_session=False)
+    if db.get_bind().dialect.update_returning:
+        return db.execute(stmt.returning(*columns)).first()
     
-    return roundup
+    if db.execute(stmt).rowcount == 0:
+        return None
+    return db.execute(select(*columns).where(stmt.whereclause)).first()
@@ -0,0 +1,97 @@
+import numpy as np
+from sqlalchemy import extract, func, select
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional, Tuple
+from app.models import Allocation, Goal, Transaction
+from app.services.allocation_service import find_default_goal
+
+
+def roundups_for_amounts(amounts_cents: np.ndarray) -> np.ndarray:
+    """Vectorized calculate_roundup: always rounds up to the next dollar."""
+    remainder = amounts_cents % 100
+    return np.where(remainder == 0, 100, 100 - remainder)
+
+
+def split_roundups(
+    roundups_cents: np.ndarray,
+    allocation: Allocation,
+    has_goal: bool = True
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized split_roundup, including apply_roundup's no-goal fallback to savings."""
+    # Same float operations as split_roundup, so results match it cent for cent
+    savings = np.trunc(roundups_cents * allocation.savings_percent / 100).astype(np.int64)
+    investing = np.trunc(roundups_cents * allocation.investing_percent / 100).astype(np.int64)
+    goals = roundups_cents - savings - investing
+    if not has_goal:
+        savings = savings + goals
+        goals = np.zeros_like(goals)
+    return savings, investing, goals
+
+
+def simulate_allocation(
+    db: Session,
+    user_public_id: str,
+    allocation: Allocation,
+    current_allocation: Optional[Allocation] = None
+) -> Dict[str, Any]:
+    """Replay the user's transaction history as if every posted transaction had been
+    rounded up under `allocation`.
+    
+    Returns totals plus a per-month breakdown, computed over NumPy arrays, and
+    the totals under `current_allocation` for comparison when given.
+    """
+    # The round-up only depends on amount_cents % 100, so let the DB collapse the
+    # history to one row per (month, cents remainder) with a count
+    month_index = extract("year", Transaction.timestamp) * 12 + extract("month", Transaction.timestamp) - 1
+    remainder = Transaction.amount_cents % 100
+    rows = db.connection().execute(
+        select(month_index, remainder, func.count()).where(
+            Transaction.user_public_id == user_public_id,
+            Transaction.pending.isnot(True)
+        ).group_by(month_index, remainder)
+    ).all()
+    # Round-ups without a goal_id only credit the default goal, as in apply_roundups
+    goals = db.query(Goal).filter(Goal.user_public_id == user_public_id).all()
+    has_goal = find_default_goal(goals) is not None
+    
+    if rows:
+        month_indexes, remainders, counts = (np.asarray(column, dtype=np.int64) for column in zip(*rows))
+    else:
+        month_indexes = remainders = counts = np.zeros(0, dtype=np.int64)
+    
+    roundups = roundups_for_amounts(remainders)
+    savings, investing, goals = split_roundups(roundups, allocation, has_goal)
+    
+    # Sum each component per month: bincount over the index of each row's month
+    months, inverse = np.unique(month_indexes, return_inverse=True)
+    monthly = [
+        np.bincount(inverse, weights=values * counts, minlength=len(months)).astype(np.int64)
+        for values in (roundups, savings, investing, goals)
+    ]
+    
+    result = {
+        "transaction_count": int(counts.sum()),
+        "totals": _totals(*(column.sum() for column in monthly)),
+        "months": [
+            {"month": f"{month // 12:04d}-{month % 12 + 1:02d}", **_totals(*values)}
+            for month, *values in zip(months.tolist(), *(column.tolist() for column in monthly))
+        ],
+        "current_totals": None
+    }
+    
+    if current_allocation is not None:
+        current = split_roundups(roundups, current_allocation, has_goal)
+        result["current_totals"] = _totals(
+            (roundups * counts).sum(), *((values * counts).sum() for values in current)
+        )
+    
+    return result
+
+
+def _totals(roundup_cents, savings_cents, investing_cents, goals_cents) -> Dict[str, int]:
+    return {
+        "roundup_cents": int(roundup_cents),
+        "savings_cents": int(savings_cents),
+        "investing_cents": int(investing_cents),
+        "goals_cents": int(goals_cents)
+    }
@@ -0,0 +1,228 @@
+"""Monte Carlo projection of when a goal will be reached.
+
+Weekly contributions are bootstrapped from the goal's recent round-ups, so
+paths reflect how irregular spending really is. Invested goals also
+compound returns with the market index parameters. Paths are simulated
+together as NumPy arrays until enough of them have reached the target to
+read off P10/P50/P90.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db import sql_date
+from app.models import Goal, Roundup
+from app.services.market_index import MEAN_DAILY_RETURN, STD_DAILY_RETURN
+from app.utils.cache import TTLCache
+
+LOOKBACK_DAYS = 90
+HORIZON_DAYS = 3650
+DEFAULT_PATHS = 5000
+PERCENTILES = (10, 50, 90)
+# Weeks of random draws generated per step
+BLOCK_WEEKS = 26
+
+# Keyed by the goal's latest round-up among other inputs, so a new round-up
+# for the goal starts a fresh entry; the TTL drops the superseded ones
+_projection_cache = TTLCache(maxsize=4096, ttl_seconds=24 * 3600)
+
+
+def get_daily_contributions(
+    db: Session,
+    goal_ids: List[int],
+    today: date,
+    lookback_days: int = LOOKBACK_DAYS
+) -> Dict[int, np.ndarray]:
+    """Daily goals_cents per goal over the lookback window ending today, zero-filled, oldest first."""
+    first_day = today - timedelta(days=lookback_days - 1)
+    day = func.date(Roundup.created_at)
+    rows = db.query(Roundup.goal_id, day, func.sum(Roundup.goals_cents)).filter(
+        Roundup.goal_id.in_(goal_ids),
+        Roundup.created_at >= datetime.combine(first_day, datetime.min.time())
+    ).group_by(Roundup.goal_id, day).all()
+    
+    contributions = {goal_id: np.zeros(lookback_days, dtype=np.float64) for goal_id in goal_ids}
+    for goal_id, row_day, cents in rows:
+        offset = (sql_date(row_day) - first_day).days
+        if 0 <= offset < lookback_days:
+            contributions[goal_id][offset] += cents
+    return contributions
+
+
+def simulate_completion_days(
+    target_cents: int,
+    daily_contributions: np.ndarray,
+    current_cents: int = 0,
+    invested: bool = False,
+    paths: int = DEFAULT_PATHS,
+    horizon_days: int = HORIZON_DAYS,
+    seed: Optional[Tuple[int, ...]] = None,
+    early_stop: bool = True
+) -> Dict[int, Optional[int]]:
+    """Days until `current_cents` grows to `target_cents` at P10/P50/P90 (None beyond the horizon).
+    
+    Paths step a week at a time. Each week's contribution is drawn from the
+    rolling 7-day sums of `daily_contributions`, which keeps the shape of
+    real spending with a seventh of the draws. If `invested`, the balance
+    also compounds a normally distributed return each week. The day a path
+    reaches the target is interpolated within the week it crosses. With
+    `early_stop` the simulation ends once the percentiles can no longer
+    change; the result is the same as running to the horizon.
+    """
+    if current_cents >= target_cents:
+        return {p: 0 for p in PERCENTILES}
+    if not daily_contributions.any() and not (invested and current_cents > 0):
+        return {p: None for p in PERCENTILES}
+    
+    rng = np.random.default_rng(seed)
+    # Wrap around so every day is in exactly seven windows and the mean is kept
+    wrapped = np.concatenate((daily_contributions, daily_contributions[:6]))
+    weekly_contributions = np.convolve(wrapped, np.ones(7), mode="valid")
+    weeks = -(-horizon_days // 7)
+    balance = np.full(paths, float(current_cents))
+    completion_day = np.full(paths, np.inf)
+    # percentile(method="higher") reads sorted index ceil(q * (paths - 1)), so that many
+    # paths plus one must have finished before the slowest percentile is settled
+    needed = int(np.ceil(max(PERCENTILES) / 100 * (paths - 1))) + 1
+    
+    week = 0
+    while week < weeks:
+        # Draw a block of weeks at once; balances[:, i] is each path's balance after week + i + 1
+        block = min(BLOCK_WEEKS, weeks - week)
+        draws = rng.choice(weekly_contributions, (paths, block))
+        start_balance = balance
+        if invested:
+            growth = 1 + rng.normal(7 * MEAN_DAILY_RETURN, np.sqrt(7) * STD_DAILY_RETURN, (paths, block))
+            balances = np.empty((paths, block))
+            for i in range(block):
+                balance = balance * growth[:, i] + draws[:, i]
+                balances[:, i] = balance
+        else:
+            balances = balance[:, None] + np.cumsum(draws, axis=1)
+        
+        balance = balances[:, -1]
+        
+        reached = balances >= target_cents
+        newly_done = np.flatnonzero(np.isinf(completion_day) & reached.any(axis=1))
+        crossing = reached[newly_done].argmax(axis=1)
+        after = balances[newly_done, crossing]
+        before = np.where(
+            crossing > 0,
+            balances[newly_done, np.maximum(crossing - 1, 0)],
+            start_balance[newly_done]
+        )
+        fraction = (target_cents - before) / np.maximum(after - before, 1e-9)
+        completion_day[newly_done] = (week + crossing) * 7 + np.ceil(7 * np.clip(fraction, 0, 1)).clip(1, 7)
+        week += block
+        
+        # Once the slowest percentile's paths are done, later weeks can't change the answer
+        if early_stop and np.count_nonzero(np.isfinite(completion_day)) >= needed:
+            break
+    
+    days = np.percentile(completion_day, PERCENTILES, method="higher")
+    return {
+        p: int(d) if np.isfinite(d) and d <= horizon_days else None
+        for p, d in zip(PERCENTILES, days)
+    }
+
+
+def project_goal(
+    db: Session,
+    goal: Goal,
+    invested: bool = False,
+    paths: int = DEFAULT_PATHS
+) -> Dict[str, Any]:
+    """Project a goal's completion dates, cached until its next round-up."""
+    today = date.today()
+    latest_roundup_id = db.query(func.max(Roundup.id)).filter(Roundup.goal_id == goal.id).scalar()
+    key = _cache_key(goal, latest_roundup_id, invested, paths, today)
+    
+    projection = _projection_cache.get(key)
+    if projection is None:
+        contributions = get_daily_contributions(db, [goal.id], today)[goal.id]
+        days = simulate_completion_days(*_job(goal, latest_roundup_id, contributions, invested, paths, today))
+        projection = _projection(goal, contributions, days, today)
+        _projection_cache.set(key, projection)
+    
+    return projection
+
+
+def project_goals_batch(
+    db: Session,
+    goals: List[Goal],
+    invested: bool = False,
+    paths: int = DEFAULT_PATHS,
+    max_workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Project many goals at once, e.g. an overnight recompute for every user.
+    
+    Inputs come from two grouped queries; the CPU-bound simulations fan out
+    over a process pool. Results are the same as project_goal's and are
+    cached the same way.
+    """
+    today = date.today()
+    goal_ids = [goal.id for goal in goals]
+    contributions = get_daily_contributions(db, goal_ids, today)
+    latest_roundup_ids = dict(
+        db.query(Roundup.goal_id, func.max(Roundup.id)).filter(
+            Roundup.goal_id.in_(goal_ids)
+        ).group_by(Roundup.goal_id).all()
+    )
+    
+    jobs = [
+        _job(goal, latest_roundup_ids.get(goal.id), contributions[goal.id], invested, paths, today)
+        for goal in goals
+    ]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(_simulate_job, jobs, chunksize=max(1, len(jobs) // 64)))
+    
+    projections = []
+    for goal, days in zip(goals, results):
+        projection = _projection(goal, contributions[goal.id], days, today)
+        _projection_cache.set(_cache_key(goal, latest_roundup_ids.get(goal.id), invested, paths, today), projection)
+        projections.append(projection)
+    return projections
+
+
+def _job(
+    goal: Goal,
+    latest_roundup_id: Optional[int],
+    contributions: np.ndarray,
+    invested: bool,
+    paths: int,
+    today: date
+) -> Tuple:
+    """Arguments for simulate_completion_days; plain data, so they pickle to worker processes."""
+    # Seeded from the inputs, so every process returns the same projection for them
+    seed = (goal.id, latest_roundup_id or 0, today.toordinal())
+    return (goal.target_cents, contributions, goal.current_cents, invested, paths, HORIZON_DAYS, seed)
+
+
+def _simulate_job(job: Tuple) -> Dict[int, Optional[int]]:
+    return simulate_completion_days(*job)
+
+
+def _cache_key(goal: Goal, latest_roundup_id: Optional[int], invested: bool, paths: int, today: date) -> Tuple:
+    return (goal.id, latest_roundup_id, goal.current_cents, goal.target_cents, invested, paths, today)
+
+
+def _projection(
+    goal: Goal,
+    contributions: np.ndarray,
+    days: Dict[int, Optional[int]],
+    today: date
+) -> Dict[str, Any]:
+    def completion_date(p: int) -> Optional[date]:
+        return today + timedelta(days=days[p]) if days[p] is not None else None
+    
+    return {
+        "goal_id": goal.id,
+        "target_cents": goal.target_cents,
+        "current_cents": goal.current_cents,
+        "daily_contribution_cents": float(contributions.mean()),
+        "p10_date": completion_date(10),
+        "p50_date": completion_date(50),
+        "p90_date": completion_date(90)
+    }
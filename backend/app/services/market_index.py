@@ -0,0 +1,76 @@
+"""Simulated market index shared by every user's portfolio.
+
+One series of daily index levels is generated from a fixed seed with NumPy,
+cached for the life of the process and extended in blocks as dates advance.
+Holdings are valued as contributions times the ratio of index levels, so
+valuing a portfolio costs O(contributions) rather than a walk over every
+day, and no request touches the process-global `random` state.
+"""
+import threading
+from datetime import date
+from typing import Iterable, Tuple
+import numpy as np
+
+INDEX_START = date(2000, 1, 1)
+INDEX_SEED = 20240301
+
+# Daily return parameters (mean ~0.03%, std ~1.5%)
+MEAN_DAILY_RETURN = 0.0003
+STD_DAILY_RETURN = 0.015
+
+# Days generated past the one requested, so the series grows in blocks rather than daily
+EXTEND_AHEAD_DAYS = 366
+
+
+class MarketIndex:
+    """Daily index levels from `start` onwards, starting at 1.0."""
+    
+    def __init__(self, start: date = INDEX_START, seed: int = INDEX_SEED):
+        self.start = start
+        self._rng = np.random.default_rng(seed)
+        self._levels = np.ones(1)
+        self._lock = threading.Lock()
+    
+    def level(self, day: date) -> float:
+        """Index level at the close of `day`; flat before the start of the series."""
+        offset = (day - self.start).days
+        if offset <= 0:
+            return 1.0
+        return float(self._ensure(offset)[offset])
+    
+    def levels(self, first_day: date, days: int) -> np.ndarray:
+        """Index levels for `days` consecutive days starting at `first_day`."""
+        offsets = np.arange(days) + (first_day - self.start).days
+        levels = self._ensure(int(offsets[-1])) if days else self._levels
+        return levels[np.clip(offsets, 0, None)]
+    
+    def growth(self, since: date, until: date) -> float:
+        """Factor a holding bought at the close of `since` has grown by at `until`."""
+        return self.level(until) / self.level(since)
+    
+    def _ensure(self, offset: int) -> np.ndarray:
+        """Return the levels array, extended to cover `offset` if needed."""
+        levels = self._levels
+        if offset < len(levels):
+            return levels
+        
+        with self._lock:
+            levels = self._levels
+            if offset >= len(levels):
+                count = offset - len(levels) + 1 + EXTEND_AHEAD_DAYS
+                daily_returns = self._rng.normal(MEAN_DAILY_RETURN, STD_DAILY_RETURN, count)
+                # Multiply on from the last level so the series is identical
+                # however it was extended
+                extension = np.cumprod(np.concatenate(([levels[-1]], 1 + daily_returns)))[1:]
+                levels = np.concatenate((levels, extension))
+                self._levels = levels
+        return levels
+
+
+market_index = MarketIndex()
+
+
+def value_holdings(contributions: Iterable[Tuple[date, int]], on: date) -> int:
+    """Value (day, cents) contributions bought at the index on their day, as of `on`."""
+    level = market_index.level(on)
+    return int(sum(cents * level / market_index.level(day) for day, cents in contributions))
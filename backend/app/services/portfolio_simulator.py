@@ -1,7 +1,35 @@
-import hashlib
-import random
-from datetime import datetime, timedelta
-from typing import List, Tuple
+import numpy as np
+from datetime import date, datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from app.db import sql_date
+from app.models import Roundup, Wallet
+from app.services.market_index import market_index
+from app.utils.cache import TTLCache
+
+
+# Daily summaries, keyed by (public_id, date, initial, current); the date rolls them over
+_summary_cache = TTLCache(maxsize=4096, ttl_seconds=24 * 3600)
+
+
+def portfolio_value_series(
+    initial_investment_cents: int,
+    days: int = 365,
+    end: Optional[date] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Daily values of an investment made `days` before `end` (default today).
+    
+    Returns (dates as datetime64[D], values in cents as int64), computed from
+    the shared market index without a Python loop.
+    """
+    end = end or date.today()
+    first_day = end - timedelta(days=days)
+    levels = market_index.levels(first_day, days)
+    
+    dates = np.datetime64(first_day, "D") + np.arange(days)
+    values = (initial_investment_cents * (levels / levels[0])).astype(np.int64) if days else np.zeros(0, np.int64)
+    return dates, values
 
 
 def generate_portfolio_returns(
@@ -10,30 +38,23 @@ def generate_portfolio_returns(
     days: int = 365
 ) -> List[Tuple[datetime, int]]:
     """
-    Generate deterministic portfolio returns based on user public_id.
-    Uses a seeded random walk to simulate daily returns.
+    Generate portfolio values for an investment made `days` ago.
+    Follows the shared market index, so every user sees the same market.
+    Prefer portfolio_value_series; this builds the same data as tuples.
     """
-    # Seed random with user public_id hash for determinism
-    seed = int(hashlib.md5(user_public_id.encode()).hexdigest(), 16) % (2**32)
-    random.seed(seed)
-    
-    # Daily return parameters (mean ~0.03%, std ~1.5%)
-    mean_daily_return = 0.0003
-    std_daily_return = 0.015
-    
-    returns = []
-    current_value_cents = initial_investment_cents
     base_date = datetime.now() - timedelta(days=days)
-    
-    for day in range(days):
-        # Generate daily return
-        daily_return = random.gauss(mean_daily_return, std_daily_return)
-        current_value_cents = int(current_value_cents * (1 + daily_return))
-        
-        date = base_date + timedelta(days=day)
-        returns.append((date, current_value_cents))
-    
-    return returns
+    _, values = portfolio_value_series(initial_investment_cents, days, base_date.date() + timedelta(days=days))
+    return [(base_date + timedelta(days=day), value) for day, value in enumerate(values.tolist())]
+
+
+def get_investing_contributions(db: Session, user_public_id: str) -> List[Tuple[date, int]]:
+    """Sum the user's investing round-ups per day of created_at (UTC), oldest first."""
+    day = func.date(Roundup.created_at)
+    rows = db.query(day, func.sum(Roundup.investing_cents)).filter(
+        Roundup.user_public_id == user_public_id,
+        Roundup.investing_cents > 0
+    ).group_by(day).order_by(day).all()
+    return [(sql_date(row_day), cents) for row_day, cents in rows]
 
 
 def get_portfolio_summary(
@@ -41,22 +62,82 @@ def get_portfolio_summary(
     initial_investment_cents: int,
     current_investment_cents: int
 ) -> dict:
-    """Get portfolio summary with today and all-time returns."""
+    """Get portfolio summary with today and all-time returns. Cached for the day."""
+    today = date.today()
+    key = (user_public_id, today, initial_investment_cents, current_investment_cents)
+    summary = _summary_cache.get(key)
+    if summary is not None:
+        return dict(summary)
+    
     # Calculate all-time return
     total_return_cents = current_investment_cents - initial_investment_cents
     total_return_percent = (total_return_cents / initial_investment_cents * 100) if initial_investment_cents > 0 else 0
     
-    # Get today's return (simulate)
-    seed = int(hashlib.md5((user_public_id + str(datetime.now().date())).encode()).hexdigest(), 16) % (2**32)
-    random.seed(seed)
-    today_return = random.gauss(0.0003, 0.015)
+    # Today's return is the market index's move since yesterday's close
+    today_return = market_index.growth(today - timedelta(days=1), today) - 1
     today_return_cents = int(current_investment_cents * today_return)
     today_return_percent = today_return * 100
     
-    return {
+    summary = {
         "current_value_cents": current_investment_cents,
         "total_return_cents": total_return_cents,
         "total_return_percent": total_return_percent,
         "today_return_cents": today_return_cents,
         "today_return_percent": today_return_percent
     }
+    _summary_cache.set(key, summary)
+    return dict(summary)
+
+
+def value_investing_wallet(wallet: Wallet, on: date) -> Tuple[int, int]:
+    """Return (cost_basis_cents, current_value_cents) for the investing wallet in O(1).
+    
+    Uses the running cost basis and index units apply_roundups keeps on the
+    wallet. Any part of the balance not covered by them is counted at cost.
+    """
+    cost_basis_cents = wallet.investing_cost_basis_cents or 0
+    units = wallet.investing_units or 0.0
+    unexplained_cents = max((wallet.investing_cents or 0) - cost_basis_cents, 0)
+    return (
+        cost_basis_cents + unexplained_cents,
+        round(units * market_index.level(on)) + unexplained_cents
+    )
+
+
+def portfolio_history(
+    contributions: List[Tuple[date, int]],
+    investing_cents: int,
+    first_day: date,
+    end: date
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Daily value of the investing wallet from `first_day` through `end`.
+    
+    Each contribution buys index units on its day; the value on a day is the
+    units held times that day's index level. Computed on arrays: one bincount
+    and one cumsum over the range. Balance not covered by contributions is
+    counted at cost, as in value_investing_wallet, and so are contributions
+    dated after `end`.
+    """
+    days = (end - first_day).days + 1
+    dates = np.datetime64(first_day, "D") + np.arange(days)
+    
+    contributions = [(day, cents) for day, cents in contributions if day <= end]
+    if not contributions:
+        return dates, np.full(days, investing_cents, dtype=np.int64)
+    
+    contribution_days = np.array([day for day, _ in contributions], dtype="datetime64[D]")
+    cents = np.array([cents for _, cents in contributions], dtype=np.float64)
+    
+    # One slice of the index covers both the contribution days and the range
+    span_start = min(contributions[0][0], first_day)
+    span_levels = market_index.levels(span_start, (end - span_start).days + 1)
+    levels = span_levels[(first_day - span_start).days:]
+    units = cents / span_levels[(contribution_days - np.datetime64(span_start, "D")).astype(np.int64)]
+    
+    # Units bought before the range are already held on its first day
+    positions = np.clip((contribution_days - dates[0]).astype(np.int64), 0, None)
+    units_held = np.cumsum(np.bincount(positions, weights=units, minlength=days)[:days])
+    
+    unexplained_cents = max(investing_cents - int(cents.sum()), 0)
+    values = (units_held * levels).astype(np.int64) + unexplained_cents
+    return dates, values
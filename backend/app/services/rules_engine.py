@@ -0,0 +1,117 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.models import MerchantRule, Roundup, User
+from app.services.allocation_service import calculate_roundup, apply_roundups
+from app.utils.cache import TTLCache
+
+# Compiled matchers per user. Rule routes invalidate entries on change; the TTL
+# bounds staleness for changes made through another worker process.
+_rules_cache = TTLCache(maxsize=4096, ttl_seconds=60)
+
+# Trailing store numbers and legal suffixes, e.g. "STARBUCKS #1234" or "Amazon.com Inc"
+_STORE_NUMBER = re.compile(r"\s*#?\d+$")
+_LEGAL_SUFFIX = re.compile(r"\s+(inc|llc|ltd|co|corp)$")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_merchant(merchant: str) -> str:
+    """Normalize a merchant name so variants like "STARBUCKS #123" match "Starbucks"."""
+    name = merchant.strip().lower()
+    name = _STORE_NUMBER.sub("", name)
+    name = _NON_ALNUM.sub(" ", name).strip()
+    name = _LEGAL_SUFFIX.sub("", name)
+    return name.replace(" ", "")
+
+
+@dataclass(frozen=True)
+class _RulePredicate:
+    category: Optional[str] = None
+    min_amount_cents: Optional[int] = None
+    max_amount_cents: Optional[int] = None
+    
+    def matches(self, transaction: Dict[str, Any]) -> bool:
+        amount_cents = transaction["amount_cents"]
+        if self.min_amount_cents is not None and amount_cents < self.min_amount_cents:
+            return False
+        if self.max_amount_cents is not None and amount_cents > self.max_amount_cents:
+            return False
+        if self.category is not None:
+            return self.category in (transaction.get("category") or "").lower()
+        return True
+
+
+class CompiledRules:
+    """In-memory matcher for a user's auto-round-up rules.
+    
+    Transactions are looked up by exact merchant name first and then by
+    normalized name, so matching costs a dict lookup per transaction rather
+    than a scan over the rules.
+    """
+    
+    def __init__(self, rules: List[MerchantRule]):
+        self.exact = {}
+        self.normalized = {}
+        for rule in rules:
+            if not rule.auto_roundup:
+                continue
+            predicate = _RulePredicate(
+                category=rule.category.lower() if rule.category else None,
+                min_amount_cents=rule.min_amount_cents,
+                max_amount_cents=rule.max_amount_cents
+            )
+            self.exact.setdefault(rule.merchant, []).append(predicate)
+            self.normalized.setdefault(normalize_merchant(rule.merchant), []).append(predicate)
+    
+    def __bool__(self) -> bool:
+        return bool(self.exact)
+    
+    def matches(self, transaction: Dict[str, Any]) -> bool:
+        merchant = transaction["merchant"]
+        predicates = self.exact.get(merchant)
+        if predicates is None:
+            predicates = self.normalized.get(normalize_merchant(merchant), [])
+        return any(predicate.matches(transaction) for predicate in predicates)
+
+
+def get_compiled_rules(db: Session, user_public_id: str) -> CompiledRules:
+    """Get the user's compiled rules, from the cache when possible."""
+    compiled = _rules_cache.get(user_public_id)
+    if compiled is None:
+        rules = db.query(MerchantRule).filter(
+            MerchantRule.user_public_id == user_public_id,
+            MerchantRule.auto_roundup == True
+        ).all()
+        compiled = CompiledRules(rules)
+        _rules_cache.set(user_public_id, compiled)
+    return compiled
+
+
+def invalidate_rules(user_public_id: str) -> None:
+    """Drop the user's compiled rules; call after any rule change."""
+    _rules_cache.invalidate(user_public_id)
+
+
+def apply_auto_roundups(
+    db: Session,
+    user: User,
+    transactions: List[Dict[str, Any]]
+) -> List[Roundup]:
+    """Round up newly stored transactions that match the user's rules. Does not commit.
+    
+    Pending transactions are skipped; they are rounded up once they post.
+    """
+    compiled = get_compiled_rules(db, user.public_id)
+    if not compiled:
+        return []
+    
+    to_apply = [
+        (txn["transaction_id"], calculate_roundup(txn["amount_cents"]), None)
+        for txn in transactions
+        if not txn.get("pending") and compiled.matches(txn)
+    ]
+    if not to_apply:
+        return []
+    
+    return apply_roundups(db, user, to_apply, commit=False)
@@ -0,0 +1,77 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List
+from fastapi import BackgroundTasks
+from app.config import settings
+from app.db import SessionLocal
+from app.models import PlaidItem, User
+from app.services.transaction_service import sync_plaid_items
+
+# Item ids with a background refresh queued or running, shared by all requests, and when
+# each was claimed. A claim whose task never ran (the request failed) expires after this long.
+REFRESH_CLAIM_TIMEOUT_SECONDS = 600
+_refreshing_items = {}
+_refreshing_lock = threading.Lock()
+
+
+def is_sync_stale(item: PlaidItem) -> bool:
+    """Check whether an item's last sync is older than the configured TTL."""
+    if item.last_sync is None:
+        return True
+    
+    # last_sync is stored as naive UTC; SQLite drops tzinfo but Postgres keeps it
+    last_sync = item.last_sync.replace(tzinfo=None)
+    ttl = timedelta(seconds=settings.transactions_sync_ttl_seconds)
+    return datetime.utcnow() - last_sync >= ttl
+
+
+def schedule_plaid_refresh(
+    user_public_id: str,
+    items: List[PlaidItem],
+    background_tasks: BackgroundTasks,
+    plaid_client
+) -> bool:
+    """Queue one background sync for a user's stale items.
+    
+    Items that are still fresh, or that already have a refresh queued or
+    running, are skipped so concurrent requests collapse into one sync.
+    Call it once the response is ready: tasks of a failed request never run.
+    Returns False if there was nothing to refresh.
+    """
+    stale_ids = [item.id for item in items if is_sync_stale(item)]
+    
+    now = time.monotonic()
+    with _refreshing_lock:
+        item_ids = [
+            item_id for item_id in stale_ids
+            if item_id not in _refreshing_items
+            or now - _refreshing_items[item_id] >= REFRESH_CLAIM_TIMEOUT_SECONDS
+        ]
+        _refreshing_items.update(dict.fromkeys(item_ids, now))
+    
+    if not item_ids:
+        return False
+    
+    background_tasks.add_task(refresh_plaid_items, user_public_id, item_ids, plaid_client)
+    return True
+
+
+def refresh_plaid_items(user_public_id: str, item_ids: List[int], plaid_client) -> None:
+    """Sync Plaid items in their own DB session. Runs after the response is sent."""
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.public_id == user_public_id).first()
+        items = db.query(PlaidItem).filter(PlaidItem.id.in_(item_ids)).all()
+        if user and items:
+            _, errors = sync_plaid_items(db, user, items, plaid_client)
+            for item_id, error in errors.items():
+                # Cached rows stay in place; the next stale read schedules another try
+                print(f"Background sync failed for Plaid item {item_id}: {error}")
+    except Exception as e:
+        print(f"Background sync failed for user {user_public_id}: {e}")
+    finally:
+        db.close()
+        with _refreshing_lock:
+            for item_id in item_ids:
+                _refreshing_items.pop(item_id, None)
@@ -1,42 +1,63 @@
-from sqlalchemy.orm import Session
-from app.models import Transaction, User
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from sqlalchemy import and_, case, exists, func, insert, or_, select, true, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+from app.config import settings
+from app.db import SessionLocal
+from app.models import Transaction, PlaidItem, Roundup, User
+from app.services.allocation_service import roundup_cents_sql
+from app.services.rules_engine import apply_auto_roundups
+from app.utils.pagination import encode_cursor, decode_cursor
+from datetime import date, datetime, time, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
 import random
 
+# Rows per IN (...) lookup / INSERT batch; stays under SQLite's bound-parameter limit
+INGEST_CHUNK_SIZE = 500
 
-def generate_demo_transactions(user_public_id: str, count: int = 10) -> List[Dict[str, Any]]:
-    """Generate demo transactions for offline/local use."""
-    merchants = [
-        "Starbucks", "Target", "Amazon", "Chipotle", "Uber Eats",
-        "Spotify", "Netflix", "Apple Store", "CVS", "Whole Foods",
-        "McDonald's", "Subway", "Pizza Hut", "Best Buy", "Trader Joe's"
-    ]
-    
-    categories = [
-        "Food and Drink", "Shopping", "Entertainment", "Transportation",
-        "Groceries", "Restaurants", "General Merchandise"
-    ]
+# Shared by all requests, so it bounds this process's concurrent Plaid calls; see
+# settings.plaid_sync_max_workers for sizing
+_plaid_executor = ThreadPoolExecutor(
+    max_workers=settings.plaid_sync_max_workers,
+    thread_name_prefix="plaid-sync"
+)
+
+
+DEMO_MERCHANTS = [
+    "Starbucks", "Target", "Amazon", "Chipotle", "Uber Eats",
+    "Spotify", "Netflix", "Apple Store", "CVS", "Whole Foods",
+    "McDonald's", "Subway", "Pizza Hut", "Best Buy", "Trader Joe's"
+]
+
+DEMO_CATEGORIES = [
+    "Food and Drink", "Shopping", "Entertainment", "Transportation",
+    "Groceries", "Restaurants", "General Merchandise"
+]
+
+
+def generate_demo_transactions_for_day(user_public_id: str, day: date) -> List[Dict[str, Any]]:
+    """Generate a user's demo transactions for one day.
     
-    transactions = []
-    base_time = datetime.now()
+    The RNG is seeded from the user's public_id and the day, so the same
+    inputs always produce the same transactions and transaction ids.
+    """
+    rng = random.Random(f"{user_public_id}:{day.isoformat()}")
     
-    for i in range(count):
-        days_ago = random.randint(0, 30)
-        timestamp = base_time - timedelta(days=days_ago, hours=random.randint(0, 23))
+    transactions = []
+    for i in range(rng.randint(0, 2)):
+        timestamp = datetime.combine(day, time(hour=rng.randint(7, 22), minute=rng.randint(0, 59)))
         
         # Random amount between $1 and $50
-        amount = random.uniform(1.0, 50.0)
+        amount = rng.uniform(1.0, 50.0)
         amount_cents = int(amount * 100)
         
-        merchant = random.choice(merchants)
-        category = random.choice(categories)
-        
         transactions.append({
-            "transaction_id": f"demo_{user_public_id}_{i}_{int(timestamp.timestamp())}",
+            "transaction_id": f"demo_{user_public_id}_{day.strftime('%Y%m%d')}_{i}",
             "amount_cents": amount_cents,
-            "merchant": merchant,
-            "category": category,
+            "merchant": rng.choice(DEMO_MERCHANTS),
+            "category": rng.choice(DEMO_CATEGORIES),
             "timestamp": timestamp,
             "source": "local",
             "pending": False
@@ -45,45 +66,361 @@ def generate_demo_transactions(user_public_id: str, count: int = 10) -> List[Dic
     return transactions
 
 
+def generate_demo_transactions(user_public_id: str, count: int = 10) -> List[Dict[str, Any]]:
+    """Generate the user's `count` most recent demo transactions, newest first."""
+    transactions = []
+    day = date.today() - timedelta(days=1)
+    oldest = day - timedelta(days=settings.demo_history_days)
+    
+    while len(transactions) < count and day > oldest:
+        transactions.extend(reversed(generate_demo_transactions_for_day(user_public_id, day)))
+        day -= timedelta(days=1)
+    
+    return transactions[:count]
+
+
+def ensure_demo_transactions(db: Session, user_public_id: str) -> int:
+    """Materialize the user's demo dataset into the transactions table.
+    
+    The first call stores the last `demo_history_days` days; later calls only
+    add the days since the newest stored demo transaction, so an up-to-date
+    user costs a single indexed read. Days are materialized through yesterday
+    so a stored day never changes. Returns the number of rows added.
+    """
+    latest = db.query(func.max(Transaction.timestamp)).filter(
+        Transaction.user_public_id == user_public_id,
+        Transaction.source == "local"
+    ).scalar()
+    
+    last_day = date.today() - timedelta(days=1)
+    first_day = last_day - timedelta(days=settings.demo_history_days - 1)
+    if latest:
+        first_day = max(first_day, latest.date() + timedelta(days=1))
+    
+    if first_day > last_day:
+        return 0
+    
+    transactions = []
+    day = first_day
+    while day <= last_day:
+        transactions.extend(generate_demo_transactions_for_day(user_public_id, day))
+        day += timedelta(days=1)
+    
+    try:
+        new_transactions = _store_new_transactions(db, user_public_id, transactions, source="local")
+        db.commit()
+    except IntegrityError:
+        # A concurrent request materialized the same days first
+        db.rollback()
+        return 0
+    
+    return len(new_transactions)
+
+
+def list_transactions(
+    db: Session,
+    user_public_id: str,
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Tuple[List[Transaction], Optional[str]]:
+    """List a user's transactions newest first, one keyset page at a time.
+    
+    Pages are ordered by (timestamp, id) descending and start after `cursor`,
+    so each page is a single range scan on the composite index no matter how
+    deep into the history it is. Returns the page and the cursor for the next
+    one (None on the last page). Raises ValueError for a malformed cursor.
+    """
+    query = db.query(Transaction).filter(
+        Transaction.user_public_id == user_public_id
+    )
+    
+    if since:
+        query = query.filter(Transaction.timestamp >= since)
+    
+    if cursor:
+        query = query.filter(_after_cursor(cursor))
+    
+    # Fetch one extra row to know whether there is a next page
+    rows = query.order_by(
+        Transaction.timestamp.desc(),
+        Transaction.id.desc()
+    ).limit(limit + 1).all()
+    
+    if len(rows) <= limit:
+        return rows, None
+    
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].timestamp, rows[-1].id)
+
+
+def list_pending_roundups(
+    db: Session,
+    user_public_id: str,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> Tuple[List[Any], Optional[str], int, int]:
+    """List posted transactions that have not been rounded up yet, newest first.
+    
+    One statement: an anti-join against roundups (served by its unique index)
+    with the round-up computed in SQL, paged like list_transactions, plus the
+    count and total round-up of everything pending. Returns (rows,
+    next_cursor, pending_count, pending_roundup_cents); rows carry a
+    roundup_cents column. Raises ValueError for a malformed cursor.
+    """
+    not_rounded_up = and_(
+        Transaction.user_public_id == user_public_id,
+        Transaction.pending.isnot(True),
+        ~exists().where(
+            Roundup.user_public_id == Transaction.user_public_id,
+            Roundup.transaction_id == Transaction.transaction_id
+        )
+    )
+    
+    page = select(
+        Transaction.id,
+        Transaction.transaction_id,
+        Transaction.amount_cents,
+        Transaction.merchant,
+        Transaction.category,
+        Transaction.timestamp,
+        roundup_cents_sql(Transaction.amount_cents).label("roundup_cents")
+    ).where(not_rounded_up)
+    if cursor:
+        page = page.where(_after_cursor(cursor))
+    # Fetch one extra row to know whether there is a next page
+    page = page.order_by(Transaction.timestamp.desc(), Transaction.id.desc()).limit(limit + 1).subquery()
+    
+    totals = select(
+        func.count().label("pending_count"),
+        func.coalesce(func.sum(roundup_cents_sql(Transaction.amount_cents)), 0).label("pending_roundup_cents")
+    ).where(not_rounded_up).subquery()
+    
+    # Outer join so the totals come back even when the page is empty
+    rows = db.execute(
+        select(totals, page)
+        .select_from(totals.outerjoin(page, true()))
+        .order_by(page.c.timestamp.desc(), page.c.id.desc())
+    ).all()
+    
+    pending_count = rows[0].pending_count
+    pending_roundup_cents = rows[0].pending_roundup_cents
+    rows = [row for row in rows if row.id is not None]
+    
+    if len(rows) <= limit:
+        return rows, None, pending_count, pending_roundup_cents
+    
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].timestamp, rows[-1].id), pending_count, pending_roundup_cents
+
+
+def _after_cursor(cursor: str):
+    """Keyset filter for rows after `cursor` in (timestamp, id) descending order."""
+    position = decode_cursor(cursor)
+    if position is None:
+        raise ValueError("Invalid cursor")
+    
+    timestamp, row_id = position
+    return or_(
+        Transaction.timestamp < timestamp,
+        and_(Transaction.timestamp == timestamp, Transaction.id < row_id)
+    )
+
+
 def sync_plaid_transactions(
     db: Session,
     user: User,
     access_token: str,
-    plaid_client
-) -> List[Transaction]:
-    """Sync transactions from Plaid and store in DB."""
-    # Get transactions from last 30 days
+    plaid_client,
+    days: int = 30
+) -> int:
+    """Sync the last `days` days of transactions from Plaid and store in DB.
+    
+    Pages are streamed from Plaid and committed one at a time, so memory
+    stays bounded by the page size however long the range is. Returns the
+    number of new transactions stored.
+    """
     end_date = datetime.now().date()
-    start_date = (end_date - timedelta(days=30)).isoformat()
+    start_date = (end_date - timedelta(days=days)).isoformat()
     end_date_str = end_date.isoformat()
     
     try:
-        plaid_transactions = plaid_client.get_transactions(
+        stored = 0
+        for batch in plaid_client.iter_transactions(
             access_token,
             start_date,
-            end_date_str
+            end_date_str,
+            page_size=settings.plaid_page_size
+        ):
+            stored += len(_store_new_transactions(db, user.public_id, batch))
+            db.commit()
+        
+        return stored
+    
+    except Exception as e:
+        db.rollback()
+        raise e
+
+
+def backfill_plaid_item(
+    db: Session,
+    user: User,
+    item: PlaidItem,
+    plaid_client
+) -> int:
+    """Load a newly linked item's history, committing page by page; returns the number stored.
+    
+    The cursor is saved after the last page, so an interrupted backfill restarts idempotently.
+    """
+    if settings.plaid_sync_mode != "cursor":
+        stored = sync_plaid_transactions(
+            db, user, item.access_token, plaid_client, days=settings.plaid_backfill_days
+        )
+        item.last_sync = datetime.utcnow()
+        db.commit()
+        return stored
+    
+    try:
+        stored = 0
+        cursor = item.sync_cursor
+        for page in plaid_client.iter_transaction_sync(
+            item.access_token,
+            item.sync_cursor,
+            page_size=settings.plaid_page_size
+        ):
+            stored += len(apply_transaction_changes(db, user.public_id, page))
+            db.commit()
+            cursor = page["next_cursor"]
+        
+        item.sync_cursor = cursor
+        item.last_sync = datetime.utcnow()
+        db.commit()
+        return stored
+    
+    except Exception as e:
+        db.rollback()
+        raise e
+
+
+def sync_plaid_items(
+    db: Session,
+    user: User,
+    items: List[PlaidItem],
+    plaid_client
+) -> Tuple[List[Dict[str, Any]], Dict[str, Exception]]:
+    """Sync a user's Plaid items in parallel and commit the successful ones together.
+    
+    Returns the new transactions and the failures by item_id.
+    """
+    # Without a cursor Plaid returns the whole history; stream it page by page instead
+    backfills = _submit_backfills(user, items, plaid_client, sessionmaker(bind=db.get_bind(), autoflush=False))
+    _, errors = _wait_for(backfills)
+    items = _items_to_fetch(db, items, backfills, errors)
+    
+    fetched, fetch_errors = _wait_for(_submit_item_fetches(items, plaid_client))
+    errors.update(fetch_errors)
+    
+    return _apply_fetched_changes(db, user, items, fetched), errors
+
+
+async def sync_plaid_items_async(
+    db: AsyncSession,
+    user: User,
+    items: List[PlaidItem],
+    plaid_client
+) -> Tuple[List[Dict[str, Any]], Dict[str, Exception]]:
+    """sync_plaid_items for async routes; awaits the Plaid pool instead of blocking on it."""
+    backfills = _submit_backfills(user, items, plaid_client, SessionLocal)
+    _, errors = await _gather_futures(backfills)
+    items = await db.run_sync(_items_to_fetch, items, backfills, errors)
+    
+    fetched, fetch_errors = await _gather_futures(_submit_item_fetches(items, plaid_client))
+    errors.update(fetch_errors)
+    
+    return await db.run_sync(_apply_fetched_changes, user, items, fetched), errors
+
+
+def _wait_for(futures: Dict[str, Future]) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """Wait for pool futures; returns (results, errors) by item_id."""
+    results = []
+    for future in futures.values():
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return _split_results(futures, results)
+
+
+async def _gather_futures(futures: Dict[str, Future]) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """_wait_for from the event loop, without blocking it."""
+    results = await asyncio.gather(
+        *(asyncio.wrap_future(future) for future in futures.values()),
+        return_exceptions=True
+    )
+    return _split_results(futures, results)
+
+
+def _split_results(futures: Dict[str, Future], results: List[Any]) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    succeeded = {}
+    errors = {}
+    for item_id, result in zip(futures, results):
+        if isinstance(result, Exception):
+            errors[item_id] = result
+        else:
+            succeeded[item_id] = result
+    return succeeded, errors
+
+
+def _items_to_fetch(
+    db: Session,
+    items: List[PlaidItem],
+    backfills: Dict[str, Future],
+    errors: Dict[str, Exception]
+) -> List[PlaidItem]:
+    """Reload the items that were backfilled; returns the others, which still need fetching."""
+    for item in items:
+        if item.item_id in backfills and item.item_id not in errors:
+            db.refresh(item)
+    # Backfilled items are already up to date and failed ones are reported
+    return [item for item in items if item.item_id not in backfills]
+
+
+def _submit_item_fetches(items: List[PlaidItem], plaid_client) -> Dict[str, Future]:
+    """Start fetching every item's changes on the Plaid pool."""
+    # Read ORM attributes here; the worker threads only talk to Plaid
+    return {
+        item.item_id: _plaid_executor.submit(
+            _fetch_item_changes, plaid_client, item.access_token, item.sync_cursor
         )
+        for item in items
+    }
+
+
+def _apply_fetched_changes(
+    db: Session,
+    user: User,
+    items: List[PlaidItem],
+    fetched: Dict[str, Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Write the changes fetched for `items` in one commit and advance their cursors."""
+    if not fetched:
+        return []
+    
+    merged = {"added": [], "modified": [], "removed": []}
+    for changes in fetched.values():
+        for key in merged:
+            merged[key].extend(changes[key])
+    
+    try:
+        new_transactions = apply_transaction_changes(db, user.public_id, merged)
+        # Matching auto round-ups go into the same commit as the transactions
+        apply_auto_roundups(db, user, new_transactions)
         
-        new_transactions = []
-        for txn_data in plaid_transactions:
-            # Check if transaction already exists
-            existing = db.query(Transaction).filter(
-                Transaction.transaction_id == txn_data["transaction_id"]
-            ).first()
-            
-            if not existing:
-                transaction = Transaction(
-                    user_public_id=user.public_id,
-                    transaction_id=txn_data["transaction_id"],
-                    amount_cents=txn_data["amount_cents"],
-                    merchant=txn_data["merchant"],
-                    category=txn_data.get("category"),
-                    timestamp=txn_data["timestamp"],
-                    source="plaid",
-                    pending=txn_data.get("pending", False)
-                )
-                db.add(transaction)
-                new_transactions.append(transaction)
+        now = datetime.utcnow()
+        for item in items:
+            if item.item_id in fetched:
+                item.sync_cursor = fetched[item.item_id]["next_cursor"]
+                item.last_sync = now
         
         db.commit()
         return new_transactions
@@ -91,3 +428,178 @@ def sync_plaid_transactions(
     except Exception as e:
         db.rollback()
         raise e
+
+
+def _submit_backfills(
+    user: User,
+    items: List[PlaidItem],
+    plaid_client,
+    session_factory
+) -> Dict[str, Future]:
+    """Start backfilling every item without a cursor on the Plaid pool (in cursor mode)."""
+    if settings.plaid_sync_mode != "cursor":
+        return {}
+    return {
+        item.item_id: _plaid_executor.submit(
+            _backfill_in_new_session, session_factory, user.public_id, item.id, plaid_client
+        )
+        for item in items
+        if item.sync_cursor is None
+    }
+
+
+def _backfill_in_new_session(session_factory, user_public_id: str, item_id: int, plaid_client) -> None:
+    """Run backfill_plaid_item in a session of its own, for callers off the request's thread."""
+    db = session_factory()
+    try:
+        user = db.query(User).filter(User.public_id == user_public_id).first()
+        item = db.query(PlaidItem).filter(PlaidItem.id == item_id).first()
+        backfill_plaid_item(db, user, item, plaid_client)
+    finally:
+        db.close()
+
+
+def _fetch_item_changes(plaid_client, access_token: str, cursor: Optional[str]) -> Dict[str, Any]:
+    """Fetch an item's transaction changes from Plaid. Makes no DB calls."""
+    if settings.plaid_sync_mode == "cursor":
+        return plaid_client.sync_transactions(access_token, cursor)
+    
+    # Window mode: re-pull the last 30 days; unchanged rows are skipped on insert
+    end_date = datetime.now().date()
+    start_date = end_date - timedelta(days=30)
+    return {
+        "added": plaid_client.get_transactions(access_token, start_date.isoformat(), end_date.isoformat()),
+        "modified": [],
+        "removed": [],
+        "next_cursor": cursor
+    }
+
+
+def apply_transaction_changes(
+    db: Session,
+    user_public_id: str,
+    changes: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Apply added/modified/removed transactions from a Plaid sync. Does not commit.
+    
+    Works on the whole batch with set-based statements: posted transactions
+    first take over the round-ups of the pending rows they replace, then
+    removed and superseded rows are deleted and the rest is upserted.
+    """
+    # Modifications to transactions we never stored are treated as new
+    upserts = changes["added"] + changes["modified"]
+    
+    superseded = {
+        txn["pending_transaction_id"]: txn["transaction_id"]
+        for txn in upserts
+        if txn.get("pending_transaction_id")
+    }
+    _reconcile_pending_transactions(db, user_public_id, superseded)
+    
+    removed_ids = list(changes["removed"])
+    for chunk in _chunks(removed_ids, INGEST_CHUNK_SIZE):
+        db.query(Transaction).filter(
+            Transaction.user_public_id == user_public_id,
+            Transaction.transaction_id.in_(chunk)
+        ).delete(synchronize_session=False)
+    
+    return _store_new_transactions(db, user_public_id, upserts, update_existing=True)
+
+
+def _reconcile_pending_transactions(
+    db: Session,
+    user_public_id: str,
+    superseded: Dict[str, str]
+) -> None:
+    """Replace pending rows with their posted successors. Does not commit.
+    
+    `superseded` maps pending transaction ids to the ids they posted under.
+    Round-ups made on the pending transaction are moved to the posted one so
+    it isn't offered for a second round-up, and the pending rows are deleted.
+    Plaid doesn't always list the pending id as removed (e.g. /transactions/get).
+    """
+    pending_ids = list(superseded)
+    for chunk in _chunks(pending_ids, INGEST_CHUNK_SIZE):
+        posted_id = case({pending_id: superseded[pending_id] for pending_id in chunk}, value=Roundup.transaction_id)
+        db.execute(
+            update(Roundup)
+            .where(
+                Roundup.user_public_id == user_public_id,
+                Roundup.transaction_id.in_(chunk)
+            )
+            .values(transaction_id=posted_id)
+            .execution_options(synchronize_session=False)
+        )
+        
+        db.query(Transaction).filter(
+            Transaction.user_public_id == user_public_id,
+            Transaction.transaction_id.in_(chunk),
+            Transaction.pending == True
+        ).delete(synchronize_session=False)
+
+
+def _store_new_transactions(
+    db: Session,
+    user_public_id: str,
+    transactions: List[Dict[str, Any]],
+    update_existing: bool = False,
+    source: str = "plaid"
+) -> List[Dict[str, Any]]:
+    """Insert transactions that aren't in the DB yet, in chunks. Does not commit.
+    
+    Existing rows are found with one IN (...) lookup per chunk instead of a
+    query per transaction. With `update_existing`, rows that are already
+    stored are updated in place with a bulk UPDATE by primary key.
+    Returns the inserted rows.
+    """
+    # Last occurrence wins if Plaid sends the same transaction twice
+    incoming = {txn["transaction_id"]: txn for txn in transactions}
+    existing_ids = _existing_transaction_ids(db, user_public_id, list(incoming))
+    
+    new_rows = []
+    updated_rows = []
+    for transaction_id, txn_data in incoming.items():
+        row = {
+            "transaction_id": transaction_id,
+            "amount_cents": txn_data["amount_cents"],
+            "merchant": txn_data["merchant"],
+            "category": txn_data.get("category"),
+            "timestamp": txn_data["timestamp"],
+            "pending": txn_data.get("pending", False),
+            "pending_transaction_id": txn_data.get("pending_transaction_id")
+        }
+        
+        if transaction_id in existing_ids:
+            if update_existing:
+                row["id"] = existing_ids[transaction_id]
+                updated_rows.append(row)
+        else:
+            row["user_public_id"] = user_public_id
+            row["source"] = source
+            new_rows.append(row)
+    
+    for chunk in _chunks(new_rows, INGEST_CHUNK_SIZE):
+        db.execute(insert(Transaction), chunk)
+    
+    for chunk in _chunks(updated_rows, INGEST_CHUNK_SIZE):
+        db.execute(update(Transaction), chunk)
+    
+    return new_rows
+
+
+def _existing_transaction_ids(db: Session, user_public_id: str, transaction_ids: List[str]) -> Dict[str, int]:
+    """Map the user's already-stored transaction ids to their row ids."""
+    existing = {}
+    for chunk in _chunks(transaction_ids, INGEST_CHUNK_SIZE):
+        rows = db.query(Transaction.transaction_id, Transaction.id).filter(
+            Transaction.user_public_id == user_public_id,
+            Transaction.transaction_id.in_(chunk)
+        ).all()
+        existing.update(rows)
+    return existing
+
+
+def _chunks(items: List[Any], size: int):
+    """Yield successive slices of `items` of at most `size` elements."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
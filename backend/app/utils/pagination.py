@@ -0,0 +1,21 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Encode a (timestamp, id) keyset position as an opaque URL-safe cursor."""
+    raw = f"{timestamp.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """Decode a cursor from encode_cursor. Returns None if it's malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        timestamp_str, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp_str), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
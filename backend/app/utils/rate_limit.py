@@ -0,0 +1,210 @@
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from fastapi import Depends, HTTPException, Request, status
+from app.auth import UserSnapshot, get_current_user
+from app.config import settings
+
+# (window_start, previous_window_count, current_window_count)
+WindowState = Tuple[int, int, int]
+
+
+class MemoryBackend:
+    """Per-process counters; holds at most `max_keys`, evicting the least recently used."""
+    
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def update(self, key: str, fn: Callable, expires_at: float):
+        """Atomically replace the state for `key` with fn(state)[0]; returns fn(state)[1]."""
+        with self._lock:
+            state, result = fn(self._data.get(key))
+            self._data[key] = state
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_keys:
+                self._data.popitem(last=False)
+            return result
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteBackend:
+    """Counters in a SQLite file, shared by every worker process on the host.
+    
+    Each update is one BEGIN IMMEDIATE transaction, so workers serialize on
+    the file lock. Expired keys are pruned every `PRUNE_EVERY` writes, and
+    beyond `max_keys` the ones closest to expiring are dropped first.
+    """
+    
+    PRUNE_EVERY = 1000
+    
+    def __init__(self, path: str, max_keys: int = 10000):
+        self.path = path
+        self.max_keys = max_keys
+        self._local = threading.local()
+        self._writes = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            "key TEXT PRIMARY KEY, window_start INTEGER NOT NULL, previous INTEGER NOT NULL, "
+            "current INTEGER NOT NULL, expires_at REAL NOT NULL)"
+        )
+    
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; transactions are opened explicitly in update()
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+    
+    def update(self, key: str, fn: Callable, expires_at: float):
+        """Atomically replace the state for `key` with fn(state)[0]; returns fn(state)[1]."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT window_start, previous, current FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()
+            state, result = fn(tuple(row) if row else None)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?, ?, ?)",
+                (key, *state, expires_at)
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._prune(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+    
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM rate_limits WHERE expires_at < ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM rate_limits WHERE key IN ("
+            "SELECT key FROM rate_limits ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_keys,)
+        )
+    
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM rate_limits")
+    
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+
+_default_backend = None
+_default_backend_lock = threading.Lock()
+
+
+def default_backend():
+    """The backend chosen by settings.rate_limit_backend, created on first use."""
+    global _default_backend
+    with _default_backend_lock:
+        if _default_backend is None:
+            if settings.rate_limit_backend == "sqlite":
+                _default_backend = SQLiteBackend(settings.rate_limit_sqlite_path, settings.rate_limit_max_keys)
+            else:
+                _default_backend = MemoryBackend(settings.rate_limit_max_keys)
+        return _default_backend
+
+
+class RateLimiter:
+    """Sliding-window-counter limiter: at most `limit` hits per key per `window_seconds`.
+    
+    Keeps only this window's and the previous window's counts per key. The
+    previous count is weighted by how much of it still overlaps the sliding
+    window, which approximates a true sliding log in O(1) memory. Rejected
+    hits are not counted.
+    """
+    
+    def __init__(self, name: str, limit: int, window_seconds: int, backend=None):
+        self.name = name
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.backend = backend
+    
+    def hit(self, key: str, now: Optional[float] = None) -> Tuple[bool, int]:
+        """Record a hit for `key`; returns (allowed, seconds until a retry would be allowed)."""
+        now = time.time() if now is None else now
+        window = self.window_seconds
+        window_start = int(now // window) * window
+        
+        def apply(state: Optional[WindowState]):
+            state = _roll(state, window_start, window)
+            _, previous, current = state
+            weight = 1 - (now - window_start) / window
+            if previous * weight + current + 1 <= self.limit:
+                return (window_start, previous, current + 1), (True, 0)
+            return state, (False, _retry_after(state, now, self.limit, window))
+        
+        backend = self.backend if self.backend is not None else default_backend()
+        return backend.update(f"{self.name}:{key}", apply, window_start + 2 * window)
+
+
+def _roll(state: Optional[WindowState], window_start: int, window: int) -> WindowState:
+    """Advance a stored state to the window starting at `window_start`."""
+    if state is None or state[0] < window_start - window:
+        return (window_start, 0, 0)
+    if state[0] < window_start:
+        return (window_start, state[2], 0)
+    return state
+
+
+def _retry_after(state: WindowState, now: float, limit: int, window: int) -> int:
+    """Seconds until one more hit would fit under `limit`."""
+    window_start, previous, current = state
+    room = limit - 1 - current
+    if room >= 0 and previous > 0:
+        # Wait for the previous window's weight to fall to the room left
+        allowed_at = window_start + window * (1 - room / previous)
+    else:
+        # This window is full; wait until it has faded enough in the next one
+        allowed_at = window_start + window + window * max(0.0, 1 - (limit - 1) / max(current, 1))
+    return max(1, math.ceil(allowed_at - now))
+
+
+def _raise_limited(retry_after: int, detail: str) -> None:
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(retry_after)}
+    )
+
+
+def limit_by_ip(limiter: RateLimiter, detail: str = "Too many requests. Please try again later."):
+    """Route dependency applying `limiter` per client IP."""
+    def dependency(request: Request) -> None:
+        client_ip = request.client.host if request.client else "unknown"
+        allowed, retry_after = limiter.hit(client_ip)
+        if not allowed:
+            _raise_limited(retry_after, detail)
+    return dependency
+
+
+def limit_by_user(
+    limiter: RateLimiter,
+    detail: str = "Too many requests. Please try again later.",
+    user_dependency: Callable = get_current_user
+):
+    """Route dependency applying `limiter` per authenticated user.
+    
+    Pass get_current_user_async as `user_dependency` on async routes.
+    """
+    def dependency(current_user: UserSnapshot = Depends(user_dependency)) -> None:
+        allowed, retry_after = limiter.hit(current_user.public_id)
+        if not allowed:
+            _raise_limited(retry_after, detail)
+    return dependency
@@ -1,19 +1,57 @@
 from passlib.context import CryptContext
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
+from typing import Optional, Tuple
+import threading
 from app.config import settings
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=settings.argon2_time_cost,
+    argon2__memory_cost=settings.argon2_memory_cost,
+    argon2__parallelism=settings.argon2_parallelism
+)
+
+# argon2-cffi releases the GIL while hashing, so a thread pool hashes in parallel
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_max_workers,
+    thread_name_prefix="argon2"
+)
+# One slot per running or queued hash
+_hash_slots = threading.BoundedSemaphore(
+    settings.password_hash_max_workers + settings.password_hash_max_queue
+)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hashes are already running or queued."""
+
+
+def _run_bounded(fn, *args):
+    """Run `fn` on the hashing pool, failing fast if its queue is full."""
+    if not _hash_slots.acquire(blocking=False):
+        raise PasswordHasherBusy()
+    try:
+        return _hash_executor.submit(fn, *args).result()
+    finally:
+        _hash_slots.release()
 
 
 def hash_password(password: str) -> str:
     """Hash a password using Argon2."""
-    return pwd_context.hash(password)
+    return _run_bounded(pwd_context.hash, password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return _run_bounded(pwd_context.verify, plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; also return a new hash if the stored one uses outdated Argon2 parameters."""
+    return _run_bounded(pwd_context.verify_and_update, plain_password, hashed_password)
 
 
 def create_access_token(data: dict) -> str:
@@ -0,0 +1,165 @@
+"""Benchmark the sync and async request paths at the same worker count.
+
+Usage:
+    python scripts/bench_async.py [--users N] [--sync-clients N] [--read-clients N]
+        [--latency-ms MS] [--seconds S] [--port PORT]
+
+Starts one uvicorn worker per mode (ASYNC_MODE=false, then true) on a
+throwaway SQLite database with the fake Plaid backend. Sync clients loop
+POST /plaid/sync, each call waiting `latency-ms` on Plaid, while read
+clients loop GET /wallet. Reports requests/s completed within the run and
+/wallet latency for each; pass --sync-clients 0 for a read-only run.
+"""
+import sys
+import os
+import argparse
+import asyncio
+import subprocess
+import tempfile
+import time
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=64)
+    parser.add_argument("--sync-clients", type=int, default=64)
+    parser.add_argument("--read-clients", type=int, default=16)
+    parser.add_argument("--latency-ms", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8766)
+    return parser.parse_args()
+
+
+args = parse_args()
+
+_db_dir = tempfile.mkdtemp(prefix="piggie-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+os.environ["PLAID_BACKEND"] = "fake"
+os.environ["PLAID_FAKE_LATENCY_MS"] = str(args.latency_ms)
+os.environ["PLAID_FAKE_HISTORY_DAYS"] = "7"
+
+import httpx
+import numpy as np
+from app.db import Base, engine, SessionLocal
+from app.models import User, PlaidItem, Wallet
+from app.utils.security import create_access_token
+
+BASE_URL = f"http://127.0.0.1:{args.port}"
+
+
+def setup_users() -> list:
+    """Create users with a linked item each; returns their bearer tokens."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    tokens = []
+    for u in range(args.users):
+        public_id = f"bench{u}"
+        db.add(User(
+            public_id=public_id,
+            email=f"{public_id}@bench.local",
+            hashed_password="x",
+            name="Bench",
+            school="Bench",
+            grad_year=2026,
+            monthly_goal_cents=0
+        ))
+        db.add(Wallet(user_public_id=public_id))
+        db.add(PlaidItem(
+            user_public_id=public_id,
+            item_id=f"item-bench-{u}",
+            access_token=f"access-bench-{u}",
+            sync_cursor="0"
+        ))
+        tokens.append(create_access_token({"sub": public_id}))
+    db.commit()
+    db.close()
+    return tokens
+
+
+def start_server(async_mode: bool) -> subprocess.Popen:
+    env = dict(os.environ, ASYNC_MODE=str(async_mode).lower())
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+         "--workers", "1", "--log-level", "warning"],
+        cwd=os.path.abspath(os.path.join(os.path.dirname(__file__), '..')),
+        env=env
+    )
+    for _ in range(200):
+        try:
+            httpx.get(f"{BASE_URL}/health")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+
+async def run_load(tokens: list) -> dict:
+    stop_at = time.perf_counter() + args.seconds
+    syncs = []
+    reads = []
+    
+    async def request(client: httpx.AsyncClient, method: str, url: str, token: str) -> int:
+        try:
+            response = await client.request(method, url, headers={"Authorization": f"Bearer {token}"})
+            return response.status_code
+        except httpx.TransportError:
+            return 0
+    
+    async def sync_client(client: httpx.AsyncClient, token: str) -> None:
+        while time.perf_counter() < stop_at:
+            status = await request(client, "POST", "/plaid/sync", token)
+            if time.perf_counter() < stop_at:
+                syncs.append(status)
+    
+    async def read_client(client: httpx.AsyncClient, token: str) -> None:
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            status = await request(client, "GET", "/wallet", token)
+            if time.perf_counter() < stop_at:
+                reads.append((status, time.perf_counter() - start))
+    
+    limits = httpx.Limits(max_connections=args.sync_clients + args.read_clients)
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=120, limits=limits) as client:
+        await asyncio.gather(
+            *(sync_client(client, tokens[i % len(tokens)]) for i in range(args.sync_clients)),
+            *(read_client(client, tokens[i % len(tokens)]) for i in range(args.read_clients))
+        )
+    
+    latencies = np.array([latency for status, latency in reads if status == 200]) * 1000
+    return {
+        "syncs": syncs.count(200) / args.seconds,
+        "reads": len(latencies) / args.seconds,
+        "errors": len(syncs) - syncs.count(200) + len(reads) - len(latencies),
+        "p50": np.percentile(latencies, 50) if len(latencies) else float("nan"),
+        "p99": np.percentile(latencies, 99) if len(latencies) else float("nan")
+    }
+
+
+def main() -> None:
+    print(
+        f"{args.sync_clients} /plaid/sync clients ({args.latency_ms}ms Plaid latency), "
+        f"{args.read_clients} GET /wallet clients, {args.seconds:.0f}s, 1 worker"
+    )
+    print(f"{'mode':>6} {'syncs/s':>8} {'reads/s':>8} {'errors':>7} {'read p50':>10} {'read p99':>10}")
+    for async_mode in (False, True):
+        tokens = setup_users()
+        server = start_server(async_mode)
+        try:
+            result = asyncio.run(run_load(tokens))
+        finally:
+            server.terminate()
+            server.wait()
+        print(
+            f"{'async' if async_mode else 'sync':>6} {result['syncs']:8.1f} {result['reads']:8.1f} "
+            f"{result['errors']:7d} {result['p50']:8.1f}ms {result['p99']:8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Benchmark concurrent SQLite writes with default vs tuned connection PRAGMAs.
+
+Usage:
+    python scripts/bench_db_writes.py [--writers N] [--readers N] [--seconds S]
+
+Writer threads apply round-ups (an INSERT plus wallet/goal UPDATEs per
+commit) for their own users while reader threads page pending round-ups.
+Runs once on a fresh database file with SQLite's defaults (rollback
+journal, synchronous=FULL) and once with the settings' PRAGMAs (WAL,
+synchronous=NORMAL, busy_timeout, mmap, cache). Reports commits/s,
+reads/s, commit latency and "database is locked" errors.
+"""
+import sys
+import os
+import argparse
+import tempfile
+import threading
+import time
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    return parser.parse_args()
+
+
+args = parse_args()
+
+_db_dir = tempfile.mkdtemp(prefix="piggie-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'app.db')}"
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.db import Base, apply_sqlite_pragmas, sqlite_pragmas
+from app.models import Allocation, Goal, User, Wallet
+from app.services.allocation_service import apply_roundup
+from app.services.transaction_service import list_pending_roundups
+
+
+def make_engine(name: str, pragmas: dict):
+    engine = create_engine(
+        f"sqlite:///{os.path.join(_db_dir, name + '.db')}",
+        connect_args={"check_same_thread": False}
+    )
+    apply_sqlite_pragmas(engine, pragmas)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def setup_users(Session, count: int) -> None:
+    db = Session()
+    for u in range(count):
+        public_id = f"bench{u}"
+        db.add(User(
+            public_id=public_id,
+            email=f"{public_id}@bench.local",
+            hashed_password="x",
+            name="Bench",
+            school="Bench",
+            grad_year=2026
+        ))
+        db.add(Wallet(user_public_id=public_id))
+        db.add(Allocation(user_public_id=public_id, savings_percent=40.0, investing_percent=30.0, goals_percent=30.0))
+        db.add(Goal(user_public_id=public_id, name="Default", target_cents=100000, is_default=True))
+    db.commit()
+    db.close()
+
+
+def run(name: str, pragmas: dict) -> None:
+    engine = make_engine(name, pragmas)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    setup_users(Session, args.writers)
+    
+    stop_at = time.perf_counter() + args.seconds
+    commit_latencies = []
+    reads = []
+    locked = []
+    
+    def writer(u: int) -> None:
+        db = Session()
+        user = db.query(User).filter(User.public_id == f"bench{u}").first()
+        n = 0
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            try:
+                apply_roundup(db, user, f"t{u}-{n}", 37)
+                commit_latencies.append(time.perf_counter() - start)
+            except OperationalError:
+                db.rollback()
+                locked.append(1)
+            n += 1
+        db.close()
+    
+    def reader(u: int) -> None:
+        db = Session()
+        while time.perf_counter() < stop_at:
+            try:
+                list_pending_roundups(db, f"bench{u % args.writers}", limit=50)
+                reads.append(1)
+            except OperationalError:
+                locked.append(1)
+            db.rollback()
+        db.close()
+    
+    threads = [threading.Thread(target=writer, args=(u,)) for u in range(args.writers)]
+    threads += [threading.Thread(target=reader, args=(u,)) for u in range(args.readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    
+    latencies = np.array(commit_latencies) * 1000
+    p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (float("nan"), float("nan"))
+    print(
+        f"{name:>8} {len(latencies) / args.seconds:10.1f} {len(reads) / args.seconds:8.1f} "
+        f"{p50:9.1f}ms {p99:9.1f}ms {len(locked):7d}"
+    )
+
+
+def main() -> None:
+    print(f"{args.writers} writers, {args.readers} readers, {args.seconds:.0f}s")
+    print(f"{'pragmas':>8} {'commits/s':>10} {'reads/s':>8} {'commit p50':>11} {'commit p99':>11} {'locked':>7}")
+    run("default", {})
+    run("tuned", sqlite_pragmas())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark transaction ingest: per-row existence query vs batched ingest.
+
+Usage:
+    python scripts/bench_ingest.py [sizes...]
+
+Runs against a throwaway SQLite database, so no Plaid credentials are needed.
+"""
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+_db_dir = tempfile.mkdtemp(prefix="piggie-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+os.environ.setdefault("PLAID_CLIENT_ID", "bench")
+os.environ.setdefault("PLAID_SECRET", "bench")
+
+from app.db import Base, engine, SessionLocal
+from app.models import User, Transaction
+from app.services.transaction_service import _store_new_transactions
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def make_transactions(prefix: str, count: int) -> list:
+    """Build `count` normalized Plaid-style transactions."""
+    base_time = datetime(2024, 1, 1)
+    return [
+        {
+            "transaction_id": f"{prefix}_{i}",
+            "amount_cents": 100 + (i * 37) % 5000,
+            "merchant": f"Merchant {i % 50}",
+            "category": "Food and Drink",
+            "timestamp": base_time + timedelta(minutes=i),
+            "pending": False
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_ingest(db, user_public_id: str, transactions: list) -> None:
+    """The original ingest loop: one existence query and one add per row."""
+    for txn_data in transactions:
+        existing = db.query(Transaction).filter(
+            Transaction.transaction_id == txn_data["transaction_id"]
+        ).first()
+        
+        if not existing:
+            db.add(Transaction(
+                user_public_id=user_public_id,
+                transaction_id=txn_data["transaction_id"],
+                amount_cents=txn_data["amount_cents"],
+                merchant=txn_data["merchant"],
+                category=txn_data.get("category"),
+                timestamp=txn_data["timestamp"],
+                source="plaid",
+                pending=txn_data.get("pending", False)
+            ))
+    db.commit()
+
+
+def batched_ingest(db, user_public_id: str, transactions: list) -> None:
+    _store_new_transactions(db, user_public_id, transactions)
+    db.commit()
+
+
+def timed(fn, user_public_id: str, transactions: list) -> float:
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        fn(db, user_public_id, transactions)
+        return time.perf_counter() - start
+    finally:
+        db.close()
+
+
+def main(sizes: list) -> None:
+    Base.metadata.create_all(bind=engine)
+    
+    print(f"{'rows':>8} {'path':>8} {'fresh (s)':>10} {'resync (s)':>11}")
+    for size in sizes:
+        for name, fn in (("legacy", legacy_ingest), ("batched", batched_ingest)):
+            user_public_id = f"{name}{size}"
+            db = SessionLocal()
+            db.add(User(
+                public_id=user_public_id,
+                email=f"{user_public_id}@bench.local",
+                hashed_password="x",
+                name="Bench",
+                school="Bench",
+                grad_year=2026
+            ))
+            db.commit()
+            db.close()
+            
+            transactions = make_transactions(user_public_id, size)
+            # First run inserts everything, second run finds every row already stored
+            fresh = timed(fn, user_public_id, transactions)
+            resync = timed(fn, user_public_id, transactions)
+            print(f"{size:>8} {name:>8} {fresh:>10.3f} {resync:>11.3f}")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    main(sizes)
@@ -0,0 +1,129 @@
+"""Benchmark a login storm: login throughput vs p99 latency of other endpoints.
+
+Usage:
+    python scripts/bench_login.py [--login-clients N] [--seconds S] [--port PORT]
+
+Serves the app with uvicorn on a throwaway SQLite database. Many clients
+log in concurrently while one client polls GET /wallet; reports logins/s,
+503s and the /wallet latency percentiles, first with hashing inline in the
+request thread (the original behaviour) and then on the bounded pool.
+"""
+import sys
+import os
+import argparse
+import tempfile
+import threading
+import time
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--login-clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    return parser.parse_args()
+
+
+args = parse_args()
+
+_db_dir = tempfile.mkdtemp(prefix="piggie-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+
+import httpx
+import numpy as np
+import uvicorn
+from app.main import app
+from app.routes import auth_routes
+from app.utils import security
+
+BASE_URL = f"http://127.0.0.1:{args.port}"
+EMAIL = "bench@bench.edu"
+PASSWORD = "Passw0rd!23"
+
+# Measure hashing, not the per-IP login limiter
+auth_routes.login_limiter.limit = sys.maxsize
+
+bounded_run = security._run_bounded
+
+
+def inline_run(fn, *args):
+    """The original behaviour: hash in the request thread, no limit."""
+    return fn(*args)
+
+
+def start_server() -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, port=args.port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def run(name: str, token: str) -> None:
+    stop = threading.Event()
+    login_statuses = []
+    probe_latencies = []
+    
+    def login_client() -> None:
+        with httpx.Client(base_url=BASE_URL, timeout=60) as client:
+            while not stop.is_set():
+                response = client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+                login_statuses.append(response.status_code)
+    
+    def probe_client() -> None:
+        with httpx.Client(base_url=BASE_URL, timeout=60) as client:
+            headers = {"Authorization": f"Bearer {token}"}
+            while not stop.is_set():
+                start = time.perf_counter()
+                client.get("/wallet", headers=headers)
+                probe_latencies.append(time.perf_counter() - start)
+                time.sleep(0.01)
+    
+    threads = [threading.Thread(target=login_client) for _ in range(args.login_clients)]
+    threads.append(threading.Thread(target=probe_client))
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    
+    ok = login_statuses.count(200)
+    busy = login_statuses.count(503)
+    p50, p99 = np.percentile(probe_latencies, [50, 99]) * 1000
+    print(
+        f"{name:>7}: {ok / args.seconds:7.1f} logins/s  {busy:>6} x 503  "
+        f"/wallet p50 {p50:8.1f}ms  p99 {p99:8.1f}ms  ({len(probe_latencies)} probes)"
+    )
+
+
+def main() -> None:
+    start_server()
+    with httpx.Client(base_url=BASE_URL, timeout=60) as client:
+        response = client.post("/auth/signup", json={
+            "email": EMAIL,
+            "password": PASSWORD,
+            "name": "Bench",
+            "school": "Bench University",
+            "grad_year": 2026,
+            "monthly_goal": 50
+        })
+        token = response.json()["access_token"]
+    
+    print(
+        f"{args.login_clients} login clients for {args.seconds:.0f}s, "
+        f"{security.settings.password_hash_max_workers} hash workers, "
+        f"queue {security.settings.password_hash_max_queue}"
+    )
+    security._run_bounded = inline_run
+    run("inline", token)
+    security._run_bounded = bounded_run
+    run("pool", token)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Benchmark Plaid sync throughput offline against the in-process fake Plaid backend.
+
+Usage:
+    python scripts/bench_plaid_sync.py [--users N] [--items-per-user N]
+        [--latency-ms MS] [--error-rate RATE] [--concurrency N] [--fixture PATH]
+
+Each user gets linked items, an initial backfill and then an incremental
+sync. Reports items/s and transactions/s for both phases.
+"""
+import sys
+import os
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--items-per-user", type=int, default=2)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--fixture", default=None, help="Replay a recorded fixture instead of synthetic data")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+_db_dir = tempfile.mkdtemp(prefix="piggie-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+os.environ["PLAID_BACKEND"] = "fake"
+os.environ["PLAID_FAKE_LATENCY_MS"] = str(args.latency_ms)
+os.environ["PLAID_FAKE_ERROR_RATE"] = str(args.error_rate)
+if args.fixture:
+    os.environ["PLAID_FAKE_FIXTURE_PATH"] = args.fixture
+
+from app.db import Base, engine, SessionLocal
+from app.models import User, PlaidItem, Transaction
+from app.plaid_client import PlaidClient
+from app.services.transaction_service import sync_plaid_items
+
+plaid_client = PlaidClient()
+
+
+def setup_users() -> list:
+    """Create users with linked items (bypassing error injection)."""
+    db = SessionLocal()
+    public_ids = []
+    for u in range(args.users):
+        public_id = f"bench{u}"
+        db.add(User(
+            public_id=public_id,
+            email=f"{public_id}@bench.local",
+            hashed_password="x",
+            name="Bench",
+            school="Bench",
+            grad_year=2026
+        ))
+        for i in range(args.items_per_user):
+            db.add(PlaidItem(
+                user_public_id=public_id,
+                item_id=f"item-bench-{public_id}-{i}",
+                access_token=f"access-bench-{public_id}-{i}"
+            ))
+        public_ids.append(public_id)
+    db.commit()
+    db.close()
+    return public_ids
+
+
+def sync_user(public_id: str) -> int:
+    """Sync all of a user's items; returns the number of failed items."""
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.public_id == public_id).first()
+        items = db.query(PlaidItem).filter(PlaidItem.user_public_id == public_id).all()
+        _, errors = sync_plaid_items(db, user, items, plaid_client)
+        return len(errors)
+    except Exception:
+        return args.items_per_user
+    finally:
+        db.close()
+
+
+def run_phase(name: str, public_ids: list) -> None:
+    db = SessionLocal()
+    before = db.query(Transaction).count()
+    db.close()
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        failed = sum(pool.map(sync_user, public_ids))
+    elapsed = time.perf_counter() - start
+    
+    db = SessionLocal()
+    stored = db.query(Transaction).count() - before
+    db.close()
+    
+    items = len(public_ids) * args.items_per_user
+    print(
+        f"{name:>12}: {elapsed:7.2f}s  {items / elapsed:8.1f} items/s  "
+        f"{stored / elapsed:10.1f} txns/s  ({stored} new txns, {failed} failed items)"
+    )
+
+
+def main() -> None:
+    Base.metadata.create_all(bind=engine)
+    public_ids = setup_users()
+    print(
+        f"{args.users} users x {args.items_per_user} items, {args.latency_ms}ms Plaid latency, "
+        f"{args.error_rate:.0%} errors, {args.concurrency} concurrent users"
+    )
+    run_phase("backfill", public_ids)
+    run_phase("incremental", public_ids)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark portfolio return generation: per-user Python random walk vs NumPy series.
+
+Usage:
+    python scripts/bench_portfolio_returns.py [days...]
+
+Compares the original per-user random.gauss loop, the tuple-list API and the
+array API on top of the shared market index, plus cached daily summaries.
+"""
+import sys
+import os
+import hashlib
+import random
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+
+from app.services.market_index import market_index
+from app.services.portfolio_simulator import (
+    generate_portfolio_returns, get_portfolio_summary, portfolio_value_series
+)
+
+DEFAULT_DAYS = [365, 3_650, 36_500]
+USERS = 50
+
+
+def legacy_portfolio_returns(user_public_id: str, initial_investment_cents: int, days: int) -> list:
+    """The original implementation: reseeds the global RNG and walks day by day."""
+    seed = int(hashlib.md5(user_public_id.encode()).hexdigest(), 16) % (2**32)
+    random.seed(seed)
+    
+    returns = []
+    current_value_cents = initial_investment_cents
+    base_date = datetime.now() - timedelta(days=days)
+    for day in range(days):
+        daily_return = random.gauss(0.0003, 0.015)
+        current_value_cents = int(current_value_cents * (1 + daily_return))
+        returns.append((base_date + timedelta(days=day), current_value_cents))
+    return returns
+
+
+def timed(fn, days: int) -> float:
+    """Mean seconds per user for `fn(public_id, days)`."""
+    start = time.perf_counter()
+    for u in range(USERS):
+        fn(f"bench{u}", days)
+    return (time.perf_counter() - start) / USERS
+
+
+def main(days_list: list) -> None:
+    # Generate the shared index once up front, as a running server would have
+    market_index.level(datetime.now().date())
+    
+    paths = (
+        ("legacy", lambda public_id, days: legacy_portfolio_returns(public_id, 100_000, days)),
+        ("tuples", lambda public_id, days: generate_portfolio_returns(public_id, 100_000, days)),
+        ("arrays", lambda public_id, days: portfolio_value_series(100_000, days))
+    )
+    
+    print(f"{'days':>8} " + " ".join(f"{name + ' (ms)':>13}" for name, _ in paths))
+    for days in days_list:
+        timings = [timed(fn, days) * 1000 for _, fn in paths]
+        print(f"{days:>8} " + " ".join(f"{ms:>13.3f}" for ms in timings))
+    
+    uncached = timed(lambda public_id, days: get_portfolio_summary(public_id, 100_000, 104_000), 0)
+    cached = timed(lambda public_id, days: get_portfolio_summary(public_id, 100_000, 104_000), 0)
+    print(f"summary: {uncached * 1e6:.1f}us first call, {cached * 1e6:.1f}us cached")
+
+
+if __name__ == "__main__":
+    days_list = [int(arg) for arg in sys.argv[1:]] or DEFAULT_DAYS
+    main(days_list)
@@ -0,0 +1,141 @@
+"""Stress concurrent round-ups against one wallet: read-modify-write vs atomic SQL increments.
+
+Usage:
+    python scripts/bench_roundup_concurrency.py [--threads N] [--roundups-per-thread N] [--database-url URL]
+
+Every thread rounds up its own transactions for the same user. Reports
+round-ups/s and how many cents were lost to races for each path.
+"""
+import sys
+import os
+import argparse
+import tempfile
+import threading
+import time
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--roundups-per-thread", type=int, default=100)
+    parser.add_argument("--database-url", default=None, help="Defaults to a throwaway SQLite database")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+if args.database_url:
+    os.environ["DATABASE_URL"] = args.database_url
+else:
+    _db_dir = tempfile.mkdtemp(prefix="piggie-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+
+from app.db import Base, engine, SessionLocal
+from app.models import Allocation, Goal, Roundup, User, Wallet
+from app.services.allocation_service import apply_roundup, split_roundup
+
+ROUNDUP_CENTS = 37
+
+
+def legacy_apply_roundup(db, user, transaction_id: str, roundup_cents: int) -> None:
+    """The original path: load balances into Python, add, write back."""
+    allocation = db.query(Allocation).filter(Allocation.user_public_id == user.public_id).first()
+    savings_cents, investing_cents, goals_cents = split_roundup(roundup_cents, allocation)
+    
+    wallet = db.query(Wallet).filter(Wallet.user_public_id == user.public_id).first()
+    goal = db.query(Goal).filter(Goal.user_public_id == user.public_id, Goal.is_default == True).first()
+    wallet.savings_cents += savings_cents
+    wallet.investing_cents += investing_cents
+    goal.current_cents += goals_cents
+    
+    db.add(Roundup(
+        user_public_id=user.public_id,
+        transaction_id=transaction_id,
+        roundup_cents=roundup_cents,
+        savings_cents=savings_cents,
+        investing_cents=investing_cents,
+        goals_cents=goals_cents,
+        goal_id=goal.id
+    ))
+    db.commit()
+
+
+def atomic_apply_roundup(db, user, transaction_id: str, roundup_cents: int) -> None:
+    apply_roundup(db, user, transaction_id, roundup_cents)
+
+
+def setup_user(public_id: str) -> None:
+    db = SessionLocal()
+    db.add(User(
+        public_id=public_id,
+        email=f"{public_id}@bench.local",
+        hashed_password="x",
+        name="Bench",
+        school="Bench",
+        grad_year=2026
+    ))
+    db.add(Wallet(user_public_id=public_id, savings_cents=0, investing_cents=0))
+    db.add(Allocation(
+        user_public_id=public_id, savings_percent=40.0, investing_percent=30.0, goals_percent=30.0
+    ))
+    db.add(Goal(user_public_id=public_id, name="Bench", target_cents=10**9, current_cents=0, is_default=True))
+    db.commit()
+    db.close()
+
+
+def balance_total(public_id: str) -> int:
+    db = SessionLocal()
+    wallet = db.query(Wallet).filter(Wallet.user_public_id == public_id).first()
+    goal = db.query(Goal).filter(Goal.user_public_id == public_id).first()
+    total = wallet.savings_cents + wallet.investing_cents + goal.current_cents
+    db.close()
+    return total
+
+
+def run(name: str, fn) -> None:
+    public_id = f"{name}-user"
+    setup_user(public_id)
+    errors = []
+    
+    def worker(thread_id: int) -> None:
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.public_id == public_id).first()
+            for i in range(args.roundups_per_thread):
+                try:
+                    fn(db, user, f"{name}_{thread_id}_{i}", ROUNDUP_CENTS)
+                except Exception as e:
+                    db.rollback()
+                    errors.append(e)
+        finally:
+            db.close()
+    
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    applied = args.threads * args.roundups_per_thread - len(errors)
+    lost = applied * ROUNDUP_CENTS - balance_total(public_id)
+    print(
+        f"{name:>8}: {elapsed:7.2f}s  {applied / elapsed:8.1f} round-ups/s  "
+        f"{lost:>7} cents lost  ({len(errors)} failed)"
+    )
+
+
+def main() -> None:
+    Base.metadata.create_all(bind=engine)
+    print(f"{args.threads} threads x {args.roundups_per_thread} round-ups on one wallet ({engine.dialect.name})")
+    run("legacy", legacy_apply_roundup)
+    run("atomic", atomic_apply_roundup)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,11 +8,14 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from app.db import Base, engine
 # Import all models so they're registered with Base
 from app.models import User, PlaidItem, Transaction, Wallet, Goal, Allocation, MerchantRule, Roundup, Event
+from app.migrations import upgrade_schema
 
 if __name__ == "__main__":
     print("Creating database tables...")
     try:
         Base.metadata.create_all(bind=engine)
+        # Bring tables from older versions up to date
+        upgrade_schema(engine)
         print("Database initialized successfully!")
     except Exception as e:
         print(f"Error initializing database: {e}")
@@ -0,0 +1,96 @@
+"""Recompute goal-completion projections for every goal, fanned out over processes.
+
+Usage:
+    python scripts/project_goals.py [--workers N] [--paths N] [--invested] [--demo-goals N]
+
+Uses DATABASE_URL like the API. With --demo-goals it runs against a
+throwaway SQLite database seeded with N goals and a few months of
+round-ups, which is handy for timing. Reports goals/s for the process pool
+and for a single process.
+"""
+import sys
+import os
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=None, help="Defaults to the CPU count")
+    parser.add_argument("--paths", type=int, default=5000)
+    parser.add_argument("--invested", action="store_true")
+    parser.add_argument("--demo-goals", type=int, default=0)
+    return parser.parse_args()
+
+
+args = parse_args()
+
+if args.demo_goals:
+    _db_dir = tempfile.mkdtemp(prefix="piggie-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+    os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+
+from app.db import Base, engine, SessionLocal
+from app.models import Goal, Roundup, User
+from app.services.goal_projection import project_goals_batch, _projection_cache
+
+
+def seed_demo_goals(count: int) -> None:
+    """Create `count` users with one goal each and ~90 days of round-ups."""
+    db = SessionLocal()
+    rng = random.Random(0)
+    now = datetime.now()
+    for u in range(count):
+        public_id = f"bench{u}"
+        db.add(User(
+            public_id=public_id,
+            email=f"{public_id}@bench.local",
+            hashed_password="x",
+            name="Bench",
+            school="Bench",
+            grad_year=2026
+        ))
+        goal = Goal(user_public_id=public_id, name="Trip", target_cents=rng.randint(5_000, 200_000), current_cents=0)
+        db.add(goal)
+        db.flush()
+        for i in range(rng.randint(20, 200)):
+            db.add(Roundup(
+                user_public_id=public_id,
+                transaction_id=f"{public_id}_{i}",
+                roundup_cents=100,
+                goals_cents=rng.randint(1, 60),
+                goal_id=goal.id,
+                created_at=now - timedelta(days=rng.randint(0, 89))
+            ))
+    db.commit()
+    db.close()
+
+
+def main() -> None:
+    if args.demo_goals:
+        Base.metadata.create_all(bind=engine)
+        seed_demo_goals(args.demo_goals)
+    
+    db = SessionLocal()
+    goals = db.query(Goal).all()
+    print(f"{len(goals)} goals, {args.paths} paths each{' (invested)' if args.invested else ''}")
+    
+    for name, workers in (("pool", args.workers), ("single", 1)):
+        _projection_cache.clear()
+        start = time.perf_counter()
+        projections = project_goals_batch(db, goals, invested=args.invested, paths=args.paths, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        reachable = sum(1 for p in projections if p["p50_date"] is not None)
+        print(f"{name:>8}: {elapsed:7.2f}s  {len(goals) / elapsed:8.1f} goals/s  ({reachable} with a P50 date)")
+    
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,10 @@ def test_config():
             return False
         print("✓ SECRET_KEY is set")
         
+        if settings.plaid_backend == "fake":
+            print("✓ Using the fake Plaid backend (no credentials needed)")
+            return True
+        
         if not settings.plaid_client_id:
             print("✗ PLAID_CLIENT_ID is not set")
             return False
@@ -0,0 +1,58 @@
+"""Shared test configuration."""
+import os
+
+# Settings are read when app modules are imported; give tests a throwaway config
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db import Base
+from app.models import User
+
+
+@pytest.fixture
+def engine():
+    """An in-memory database with every table; all connections share it."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    """A database file with every table, for tests that write from several connections."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db):
+    user = User(
+        public_id="user1",
+        email="user1@test.edu",
+        hashed_password="x",
+        name="Test",
+        school="Test",
+        grad_year=2026,
+        monthly_goal_cents=0
+    )
+    db.add(user)
+    db.commit()
+    return user
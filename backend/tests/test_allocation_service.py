@@ -0,0 +1,159 @@
+"""Tests for round-up allocation."""
+import threading
+from datetime import date, datetime, timedelta
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+from app.models import Allocation, Roundup, Transaction, User, Wallet
+from app.services.allocation_service import IdempotencyKeyReused, apply_roundup, apply_roundups, calculate_roundup
+from app.services.market_index import market_index
+from app.services.portfolio_simulator import value_investing_wallet
+from app.services.transaction_service import list_pending_roundups
+
+
+def wallet_total(db, user):
+    wallet = db.query(Wallet).filter(Wallet.user_public_id == user.public_id).first()
+    return wallet.savings_cents + wallet.investing_cents
+
+
+def test_calculate_roundup():
+    assert calculate_roundup(1234) == 66
+    assert calculate_roundup(1200) == 100
+
+
+def test_apply_roundup_is_idempotent(db, user):
+    first = apply_roundup(db, user, "t1", 66, idempotency_key="key1")
+    replay = apply_roundup(db, user, "t1", 66)
+    
+    assert replay.id == first.id
+    assert replay.idempotency_key == "key1"
+    assert wallet_total(db, user) == 66
+    assert db.query(Roundup).count() == 1
+
+
+def test_apply_roundup_rejects_key_used_for_another_transaction(db, user):
+    apply_roundup(db, user, "t1", 66, idempotency_key="key1")
+    
+    # What a request racing the first one sees once its INSERT hits the key's unique index
+    with pytest.raises(IdempotencyKeyReused):
+        apply_roundup(db, user, "t2", 10, idempotency_key="key1")
+    
+    assert wallet_total(db, user) == 66
+    assert db.query(Roundup).count() == 1
+
+
+def test_apply_roundups_skips_existing_and_repeated(db, user):
+    apply_roundup(db, user, "t1", 66)
+    
+    records = apply_roundups(db, user, [("t1", 66, None), ("t2", 10, None), ("t2", 10, None)])
+    
+    assert [record.transaction_id for record in records] == ["t1", "t2", "t2"]
+    assert records[1] is records[2]
+    assert wallet_total(db, user) == 76
+    assert db.query(Roundup).count() == 2
+
+
+def test_concurrent_roundups_do_not_lose_updates(file_engine):
+    Session = sessionmaker(bind=file_engine, autoflush=False)
+    
+    session = Session()
+    session.add(User(
+        public_id="user1",
+        email="user1@test.edu",
+        hashed_password="x",
+        name="Test",
+        school="Test",
+        grad_year=2026
+    ))
+    # Signup creates both, so concurrent round-ups never race to create them
+    session.add(Wallet(user_public_id="user1", savings_cents=0, investing_cents=0))
+    session.add(Allocation(
+        user_public_id="user1", savings_percent=40.0, investing_percent=30.0, goals_percent=30.0
+    ))
+    session.commit()
+    session.close()
+    
+    def worker(thread_id):
+        session = Session()
+        try:
+            user = session.query(User).filter(User.public_id == "user1").first()
+            for i in range(25):
+                apply_roundup(session, user, f"t{thread_id}_{i}", 10)
+        finally:
+            session.close()
+    
+    threads = [threading.Thread(target=worker, args=(thread_id,)) for thread_id in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    session = Session()
+    assert wallet_total(session, User(public_id="user1")) == 8 * 25 * 10
+    session.close()
+
+
+def test_list_pending_roundups(db, user):
+    base_time = datetime(2024, 1, 1)
+    for i, amount_cents in enumerate([1234, 500, 999, 4321, 250]):
+        db.add(Transaction(
+            user_public_id=user.public_id,
+            transaction_id=f"t{i}",
+            amount_cents=amount_cents,
+            merchant="Store",
+            source="plaid",
+            timestamp=base_time + timedelta(days=i),
+            pending=False
+        ))
+    db.add(Transaction(
+        user_public_id=user.public_id,
+        transaction_id="pending",
+        amount_cents=101,
+        merchant="Store",
+        source="plaid",
+        timestamp=base_time,
+        pending=True
+    ))
+    db.commit()
+    apply_roundup(db, user, "t1", 100)
+    apply_roundup(db, user, "t3", 79)
+    
+    rows, cursor, count, total = list_pending_roundups(db, user.public_id, limit=2)
+    assert [row.transaction_id for row in rows] == ["t4", "t2"]
+    assert [row.roundup_cents for row in rows] == [50, 1]
+    assert (count, total) == (3, 50 + 1 + 66)
+    
+    rows, cursor, count, total = list_pending_roundups(db, user.public_id, cursor=cursor, limit=2)
+    assert [row.transaction_id for row in rows] == ["t0"]
+    assert cursor is None
+    assert (count, total) == (3, 117)
+
+
+def test_roundups_track_investing_cost_basis(db, user):
+    apply_roundups(db, user, [("t1", 66, None), ("t2", 10, None)])
+    apply_roundup(db, user, "t3", 50)
+    
+    wallet = db.query(Wallet).filter(Wallet.user_public_id == user.public_id).first()
+    investing_total = sum(r.investing_cents for r in db.query(Roundup).all())
+    
+    assert wallet.investing_cost_basis_cents == wallet.investing_cents == investing_total
+    assert wallet.investing_units == pytest.approx(investing_total / market_index.level(date.today()))
+    assert value_investing_wallet(wallet, date.today()) == (investing_total, investing_total)
+
+
+def test_roundups_start_cost_basis_on_legacy_wallets(db, user):
+    # A wallet from before the cost basis/units columns: both NULL, balance already invested
+    db.add(Wallet(user_public_id=user.public_id, investing_cents=500))
+    db.flush()
+    db.execute(update(Wallet).values(investing_cost_basis_cents=None, investing_units=None))
+    db.commit()
+    
+    apply_roundup(db, user, "t1", 66)
+    
+    wallet = db.query(Wallet).filter(Wallet.user_public_id == user.public_id).first()
+    db.refresh(wallet)
+    investing_cents = db.query(Roundup).one().investing_cents
+    
+    assert wallet.investing_cost_basis_cents == investing_cents
+    assert wallet.investing_units == pytest.approx(investing_cents / market_index.level(date.today()))
+    assert value_investing_wallet(wallet, date.today()) == (500 + investing_cents, 500 + investing_cents)
@@ -0,0 +1,52 @@
+"""Tests for the vectorized allocation simulator."""
+from datetime import datetime
+import numpy as np
+from app.models import Allocation, Goal, Transaction, Wallet
+from app.services.allocation_service import apply_roundups, calculate_roundup, split_roundup
+from app.services.allocation_simulator import roundups_for_amounts, simulate_allocation, split_roundups
+
+
+def test_matches_scalar_roundup_and_split():
+    amounts = np.arange(1, 20_001, dtype=np.int64) * 7
+    allocation = Allocation(savings_percent=33.3, investing_percent=33.3, goals_percent=33.4)
+    
+    roundups = roundups_for_amounts(amounts)
+    savings, investing, goals = split_roundups(roundups, allocation)
+    
+    expected = [split_roundup(calculate_roundup(int(a)), allocation) for a in amounts]
+    assert roundups.tolist() == [calculate_roundup(int(a)) for a in amounts]
+    assert list(zip(savings.tolist(), investing.tolist(), goals.tolist())) == expected
+
+
+def test_no_goal_moves_goal_share_to_savings():
+    allocation = Allocation(savings_percent=40.0, investing_percent=30.0, goals_percent=30.0)
+    
+    savings, investing, goals = split_roundups(np.array([66, 100]), allocation, has_goal=False)
+    
+    assert savings.tolist() == [47, 70]
+    assert investing.tolist() == [19, 30]
+    assert goals.tolist() == [0, 0]
+
+
+def test_simulation_matches_roundups_when_no_goal_is_default(db, user):
+    allocation = Allocation(user_public_id="user1", savings_percent=40.0, investing_percent=30.0, goals_percent=30.0)
+    db.add_all([allocation, Wallet(user_public_id="user1"), Goal(user_public_id="user1", name="Trip", target_cents=10000)])
+    amounts = [1234, 550, 999]
+    db.add_all([
+        Transaction(
+            user_public_id="user1",
+            transaction_id=f"t{i}",
+            amount_cents=amount,
+            merchant="Store",
+            timestamp=datetime(2026, 1, i + 1),
+            source="plaid"
+        )
+        for i, amount in enumerate(amounts)
+    ])
+    db.commit()
+    
+    simulated = simulate_allocation(db, "user1", allocation)["totals"]
+    roundups = apply_roundups(db, user, [(f"t{i}", calculate_roundup(amount), None) for i, amount in enumerate(amounts)])
+    
+    assert simulated["goals_cents"] == sum(roundup.goals_cents for roundup in roundups) == 0
+    assert simulated["savings_cents"] == sum(roundup.savings_cents for roundup in roundups)
@@ -0,0 +1,125 @@
+"""Tests for the async-mode routes on an aiosqlite engine."""
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.auth import _user_cache, _token_cache
+from app.config import settings
+from app.db import async_database_url, get_async_db
+from app.models import Goal, PlaidItem, Transaction, Wallet
+from app.plaid_client import PlaidClient
+from app.routes import async_routes
+from app.routes.async_routes import router
+from app.services import transaction_service
+from app.utils.security import create_access_token
+
+
+@pytest.fixture
+def engine(file_engine):
+    # The sync and async engines open the same file
+    return file_engine
+
+
+@pytest.fixture
+def client(engine, db, user):
+    db.add_all([
+        Wallet(user_public_id="user1", savings_cents=250, investing_cents=100),
+        Goal(user_public_id="user1", name="Trip", target_cents=10000)
+    ])
+    db.add_all([
+        Transaction(
+            user_public_id="user1",
+            transaction_id=f"t{i}",
+            amount_cents=amount,
+            merchant="Starbucks",
+            timestamp=datetime(2026, 1, i + 1),
+            source="plaid"
+        )
+        for i, amount in enumerate([450, 1200, 399])
+    ])
+    db.commit()
+    
+    async_engine = create_async_engine(async_database_url(str(engine.url)))
+    session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    
+    async def override_get_async_db():
+        async with session_factory() as session:
+            yield session
+    
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as test_client:
+        test_client.headers["Authorization"] = f"Bearer {create_access_token({'sub': 'user1'})}"
+        yield test_client
+    _user_cache.clear()
+    _token_cache.clear()
+
+
+def test_async_database_url():
+    assert async_database_url("sqlite:///./piggie.db") == "sqlite+aiosqlite:///./piggie.db"
+    assert async_database_url("postgresql://u:p@db/piggie") == "postgresql+asyncpg://u:p@db/piggie"
+    assert async_database_url("postgresql+asyncpg://db/piggie") == "postgresql+asyncpg://db/piggie"
+
+
+def test_wallet_and_goals(client):
+    assert client.get("/wallet").json() == {"savings_cents": 250, "investing_cents": 100}
+    assert [goal["name"] for goal in client.get("/goals").json()] == ["Trip"]
+
+
+def test_pages_run_sync_services(client):
+    page = client.get("/transactions/page", params={"limit": 2}).json()
+    assert [t["transaction_id"] for t in page["transactions"]] == ["t2", "t1"]
+    
+    rest = client.get("/transactions/page", params={"cursor": page["next_cursor"]}).json()
+    assert [t["transaction_id"] for t in rest["transactions"]] == ["t0"]
+    
+    pending = client.get("/roundup/pending").json()
+    assert pending["pending_count"] == 3
+    assert pending["pending_roundup_cents"] == 50 + 100 + 1
+
+
+def test_invalid_token_is_rejected(client):
+    response = client.get("/wallet", headers={"Authorization": "Bearer invalid"})
+    
+    assert response.status_code == 401
+
+
+def test_plaid_sync_backfills_fetches_and_reports_failed_items(client, engine, db, monkeypatch):
+    monkeypatch.setattr(settings, "plaid_backend", "fake")
+    monkeypatch.setattr(settings, "plaid_fake_fixture_path", None)
+    monkeypatch.setattr(settings, "plaid_fake_history_days", 3)
+    monkeypatch.setattr(settings, "plaid_sync_mode", "cursor")
+    fake_client = PlaidClient()
+    calls = []
+    transactions_sync = fake_client.client.transactions_sync
+    
+    def failing_transactions_sync(request):
+        calls.append(request["access_token"])
+        if request["access_token"] == "access-fake-3":
+            raise RuntimeError("bank unavailable")
+        return transactions_sync(request)
+    
+    fake_client.client.transactions_sync = failing_transactions_sync
+    monkeypatch.setattr(async_routes, "plaid_client", fake_client)
+    # Backfills write through sync sessions on the Plaid pool
+    monkeypatch.setattr(transaction_service, "SessionLocal", sessionmaker(bind=engine, autoflush=False))
+    
+    db.add_all([
+        PlaidItem(user_public_id="user1", item_id="item1", access_token="access-fake-1"),
+        PlaidItem(user_public_id="user1", item_id="item2", access_token="access-fake-2", sync_cursor="0"),
+        PlaidItem(user_public_id="user1", item_id="item3", access_token="access-fake-3", sync_cursor="0")
+    ])
+    db.commit()
+    
+    response = client.post("/plaid/sync")
+    
+    assert response.status_code == 200
+    assert response.json()["failed_items"] == ["item3"]
+    # The new item is backfilled once and not fetched again
+    assert sorted(calls) == ["access-fake-1", "access-fake-2", "access-fake-3"]
+    cursors = {item.item_id: item.sync_cursor for item in db.query(PlaidItem)}
+    assert cursors["item3"] == "0"
+    assert int(cursors["item1"]) + int(cursors["item2"]) + 3 == db.query(Transaction).count()
@@ -0,0 +1,56 @@
+"""Tests for the authenticated-user and token caches."""
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from app.auth import UserSnapshot, get_current_user, _user_cache, _token_cache
+from app.utils.security import create_access_token
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    _user_cache.clear()
+    _token_cache.clear()
+
+
+def credentials(public_id):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token({"sub": public_id}))
+
+
+def test_snapshot_is_cached_until_user_changes(db, user):
+    creds = credentials("user1")
+    
+    snapshot = get_current_user(creds, db)
+    assert isinstance(snapshot, UserSnapshot)
+    assert snapshot.name == "Test"
+    
+    # Served from the cache: no session needed
+    assert get_current_user(creds, None) == snapshot
+    
+    user.name = "Renamed"
+    db.commit()
+    assert get_current_user(creds, db).name == "Renamed"
+
+
+def test_snapshot_is_invalidated_on_commit_not_flush(db, user):
+    creds = credentials("user1")
+    get_current_user(creds, db)
+    
+    user.name = "Rolled back"
+    db.flush()
+    assert get_current_user(creds, None).name == "Test"
+    db.rollback()
+    assert get_current_user(creds, None).name == "Test"
+    
+    user.name = "Renamed"
+    db.flush()
+    assert get_current_user(creds, None).name == "Test"
+    db.commit()
+    assert get_current_user(creds, db).name == "Renamed"
+
+
+def test_invalid_token_and_unknown_user(db):
+    with pytest.raises(HTTPException):
+        get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials="not-a-token"), db)
+    with pytest.raises(HTTPException):
+        get_current_user(credentials("missing"), db)
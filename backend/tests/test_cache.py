@@ -0,0 +1,45 @@
+"""Tests for the LRU+TTL cache."""
+import time
+from app.utils.cache import TTLCache
+
+
+def test_get_and_set():
+    cache = TTLCache(maxsize=10)
+    assert cache.get("a") is None
+    assert cache.get("a", "default") == "default"
+    
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+    
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_ttl_expiry():
+    cache = TTLCache(maxsize=10, ttl_seconds=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=10)
+    time.sleep(0.06)
+    
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_invalidate():
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.invalidate("a")
+    cache.invalidate("missing")
+    assert cache.get("a") is None
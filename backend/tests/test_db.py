@@ -0,0 +1,26 @@
+"""Tests for engine pool options and SQLite connection PRAGMAs."""
+from sqlalchemy import create_engine, text
+from app.db import apply_sqlite_pragmas, pool_options, sqlite_pragmas
+
+
+def test_pool_options_only_apply_to_server_databases():
+    assert pool_options("sqlite:///./piggie.db") == {}
+    assert pool_options("postgresql+asyncpg://db/piggie") == {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800
+    }
+
+
+def test_sqlite_pragmas_applied_on_connect(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pragmas.db'}")
+    apply_sqlite_pragmas(engine, sqlite_pragmas())
+    
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -64 * 1024
+    engine.dispose()
+
@@ -0,0 +1,72 @@
+"""Tests for the persisted demo transaction dataset."""
+from datetime import date, timedelta
+import pytest
+from app.config import settings
+from app.models import Transaction
+from app.services import transaction_service
+from app.services.transaction_service import ensure_demo_transactions
+
+
+class FakeDate(date):
+    today_value = date(2026, 3, 15)
+    
+    @classmethod
+    def today(cls):
+        return cls.today_value
+
+
+@pytest.fixture
+def today(monkeypatch):
+    monkeypatch.setattr(transaction_service, "date", FakeDate)
+    monkeypatch.setattr(settings, "demo_history_days", 30)
+    FakeDate.today_value = date(2026, 3, 15)
+    return FakeDate
+
+
+def stored(db, user_public_id):
+    rows = db.query(Transaction).filter(Transaction.user_public_id == user_public_id)
+    return {row.transaction_id: (row.amount_cents, row.merchant, row.timestamp) for row in rows}
+
+
+def test_first_call_persists_history_once(db, user, today):
+    added = ensure_demo_transactions(db, "user1")
+    
+    transactions = stored(db, "user1")
+    assert added == len(transactions) > 0
+    days = {timestamp.date() for _, _, timestamp in transactions.values()}
+    assert min(days) >= date(2026, 2, 13)
+    assert max(days) <= date(2026, 3, 14)  # through yesterday
+    
+    assert ensure_demo_transactions(db, "user1") == 0
+    assert stored(db, "user1") == transactions
+
+
+def test_dataset_is_deterministic_per_user(db, user, today):
+    ensure_demo_transactions(db, "user1")
+    first = stored(db, "user1")
+    ensure_demo_transactions(db, "user2")
+    
+    db.query(Transaction).filter(Transaction.user_public_id == "user1").delete()
+    db.commit()
+    ensure_demo_transactions(db, "user1")
+    
+    assert stored(db, "user1") == first
+    assert stored(db, "user2") != {}
+    assert sorted(amount for amount, _, _ in stored(db, "user2").values()) != sorted(
+        amount for amount, _, _ in first.values()
+    )
+
+
+def test_later_calls_only_add_new_days(db, user, today):
+    ensure_demo_transactions(db, "user1")
+    before = stored(db, "user1")
+    newest = max(timestamp for _, _, timestamp in before.values()).date()
+    
+    today.today_value += timedelta(days=5)
+    added = ensure_demo_transactions(db, "user1")
+    
+    after = stored(db, "user1")
+    assert added == len(after) - len(before) > 0
+    assert {k: v for k, v in after.items() if k in before} == before
+    new_days = {after[k][2].date() for k in after.keys() - before.keys()}
+    assert all(newest < day <= date(2026, 3, 19) for day in new_days)
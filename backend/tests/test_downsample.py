@@ -0,0 +1,22 @@
+"""Tests for chart downsampling."""
+import numpy as np
+from app.utils.downsample import lttb
+
+
+def test_small_series_is_unchanged():
+    x = np.arange(5)
+    assert lttb(x, x * 2.0, 10).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_keeps_endpoints_and_spikes():
+    x = np.arange(1000)
+    y = np.zeros(1000)
+    y[437] = 50.0
+    y[812] = -30.0
+    
+    indices = lttb(x, y, 20)
+    
+    assert len(indices) == 20
+    assert indices[0] == 0 and indices[-1] == 999
+    assert np.all(np.diff(indices) > 0)
+    assert 437 in indices and 812 in indices
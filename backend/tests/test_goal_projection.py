@@ -0,0 +1,105 @@
+"""Tests for Monte Carlo goal projections."""
+import numpy as np
+import pytest
+from app.models import Goal, Roundup
+from app.services import goal_projection
+from app.services.goal_projection import project_goal, project_goals_batch, simulate_completion_days
+
+
+@pytest.fixture
+def goals(db, user):
+    goals = [
+        Goal(user_public_id="user1", name="Trip", target_cents=5_000, current_cents=0),
+        Goal(user_public_id="user1", name="Laptop", target_cents=20_000, current_cents=1_000)
+    ]
+    db.add_all(goals)
+    db.flush()
+    for i, cents in enumerate([40, 0, 75, 20, 90, 10, 55]):
+        for goal in goals:
+            db.add(Roundup(
+                user_public_id="user1",
+                transaction_id=f"t{goal.id}-{i}",
+                roundup_cents=cents,
+                goals_cents=cents,
+                goal_id=goal.id
+            ))
+    db.commit()
+    yield goals
+    goal_projection._projection_cache.clear()
+
+
+def test_constant_contributions_give_exact_days():
+    contributions = np.full(90, 10.0)
+    
+    assert simulate_completion_days(95, contributions, paths=100, seed=(1,)) == {10: 10, 50: 10, 90: 10}
+    assert simulate_completion_days(70, contributions, paths=100, seed=(1,)) == {10: 7, 50: 7, 90: 7}
+
+
+def test_percentiles_are_ordered_and_reproducible():
+    contributions = np.zeros(90)
+    contributions[::3] = [5 * (i % 7) for i in range(30)]
+    
+    days = simulate_completion_days(5_000, contributions, paths=2000, seed=(7, 1))
+    
+    assert days[10] <= days[50] <= days[90]
+    assert days == simulate_completion_days(5_000, contributions, paths=2000, seed=(7, 1))
+
+
+def test_invested_balance_compounds():
+    contributions = np.full(90, 5.0)
+    
+    options = {"invested": True, "paths": 500, "seed": (3,)}
+    
+    # A balance already close to the target gets there on returns alone
+    assert simulate_completion_days(10_100, np.zeros(90), current_cents=10_000, **options)[50] is not None
+    
+    # Returns on the 40,000 already saved beat saving the last 10,000 from nothing
+    with_balance = simulate_completion_days(50_000, contributions, current_cents=40_000, **options)
+    contributions_only = simulate_completion_days(10_000, contributions, **options)
+    assert with_balance[50] < contributions_only[50]
+
+
+def test_unreachable_and_finished_goals():
+    assert simulate_completion_days(5_000, np.zeros(90)) == {10: None, 50: None, 90: None}
+    assert simulate_completion_days(10**9, np.full(90, 1.0), paths=100)[50] is None
+    assert simulate_completion_days(0, np.zeros(90)) == {10: 0, 50: 0, 90: 0}
+
+
+def test_early_stop_matches_full_run():
+    # Small path counts are where stopping one finished path early moves P90
+    for seed in range(20):
+        rng = np.random.default_rng(seed)
+        contributions = np.where(rng.random(90) < 0.3, rng.integers(1, 100, 90), 0).astype(float)
+        for paths in (10, 20):
+            assert simulate_completion_days(2_000, contributions, paths=paths, seed=(seed,)) == \
+                simulate_completion_days(2_000, contributions, paths=paths, seed=(seed,), early_stop=False)
+
+
+def test_batch_matches_single_projections(db, goals):
+    batch = project_goals_batch(db, goals, paths=200, max_workers=1)
+    goal_projection._projection_cache.clear()
+    
+    assert batch == [project_goal(db, goal, paths=200) for goal in goals]
+    assert batch[0]["p50_date"] is not None
+
+
+def test_new_roundup_resets_cached_projection(db, goals):
+    goal = goals[0]
+    first = project_goal(db, goal, paths=200)
+    misses = goal_projection._projection_cache.misses
+    
+    assert project_goal(db, goal, paths=200) == first
+    assert goal_projection._projection_cache.misses == misses
+    
+    db.add(Roundup(
+        user_public_id="user1",
+        transaction_id="big",
+        roundup_cents=100,
+        goals_cents=4_000,
+        goal_id=goal.id
+    ))
+    db.commit()
+    second = project_goal(db, goal, paths=200)
+    
+    assert goal_projection._projection_cache.misses == misses + 1
+    assert second["daily_contribution_cents"] > first["daily_contribution_cents"]
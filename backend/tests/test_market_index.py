@@ -0,0 +1,64 @@
+"""Tests for the shared market index and portfolio valuation."""
+from datetime import date, timedelta
+from app.services.market_index import MarketIndex, value_holdings, market_index
+from app.services.portfolio_simulator import portfolio_history, portfolio_value_series
+
+
+def test_series_is_deterministic_however_it_is_extended():
+    start = date(2020, 1, 1)
+    stepwise = MarketIndex(start=start, seed=1)
+    at_once = MarketIndex(start=start, seed=1)
+    
+    for offset in range(0, 400, 7):
+        stepwise.level(start + timedelta(days=offset))
+    
+    assert at_once.level(start + timedelta(days=399)) == stepwise.level(start + timedelta(days=399))
+    assert at_once.level(start + timedelta(days=123)) == stepwise.level(start + timedelta(days=123))
+
+
+def test_flat_before_start():
+    index = MarketIndex(start=date(2020, 1, 1), seed=1)
+    assert index.level(date(1999, 1, 1)) == 1.0
+
+
+def test_value_holdings():
+    today = date(2024, 6, 1)
+    contributions = [(today, 1000), (today - timedelta(days=30), 500)]
+    
+    expected = 1000 + 500 * market_index.growth(today - timedelta(days=30), today)
+    assert value_holdings(contributions, today) == int(expected)
+    assert value_holdings([], today) == 0
+
+
+def test_portfolio_value_series_follows_index():
+    end = date(2024, 6, 1)
+    dates, values = portfolio_value_series(10_000, days=30, end=end)
+    
+    first_day = end - timedelta(days=30)
+    assert len(dates) == len(values) == 30
+    assert str(dates[0]) == first_day.isoformat()
+    assert values[0] == 10_000
+    assert values[-1] == int(10_000 * market_index.growth(first_day, end - timedelta(days=1)))
+
+
+def test_portfolio_history_tracks_units_held():
+    end = date(2024, 6, 30)
+    contributions = [(date(2024, 5, 1), 1000), (date(2024, 6, 10), 500)]
+    
+    dates, values = portfolio_history(contributions, 1600, date(2024, 6, 1), end)
+    
+    assert len(dates) == len(values) == 30
+    # The May contribution is held from the start; 100 cents aren't explained by round-ups
+    assert values[0] == int(1000 * market_index.growth(date(2024, 5, 1), date(2024, 6, 1))) + 100
+    assert abs(values[-1] - (value_holdings(contributions, end) + 100)) <= 1
+
+
+def test_portfolio_history_counts_later_contributions_at_cost():
+    # A round-up already dated tomorrow in UTC, seen from a clock west of UTC
+    end = date(2024, 6, 30)
+    contributions = [(date(2024, 6, 1), 1000), (end + timedelta(days=1), 40)]
+    
+    dates, values = portfolio_history(contributions, 1040, date(2024, 6, 24), end)
+    
+    assert len(dates) == len(values) == 7
+    assert values[-1] == int(1000 * market_index.growth(date(2024, 6, 1), end)) + 40
@@ -0,0 +1,79 @@
+"""Tests for upgrading databases created by older versions."""
+from datetime import datetime
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from app.db import Base
+from app.migrations import upgrade_schema
+from app.models import Goal, Roundup, Wallet
+from app.services.market_index import market_index
+
+
+def test_upgrade_schema_adds_missing_columns_and_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(bind=engine)
+    # Roll the tables back to a schema from before these columns existed
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ux_roundups_user_idempotency_key"))
+        conn.execute(text("ALTER TABLE roundups DROP COLUMN idempotency_key"))
+        conn.execute(text("ALTER TABLE plaid_items DROP COLUMN sync_cursor"))
+        conn.execute(text("ALTER TABLE wallets DROP COLUMN investing_cost_basis_cents"))
+        conn.execute(text("ALTER TABLE wallets DROP COLUMN investing_units"))
+        conn.execute(text("INSERT INTO wallets (user_public_id, savings_cents, investing_cents) VALUES ('user1', 0, 500)"))
+    
+    upgrade_schema(engine)
+    upgrade_schema(engine)
+    
+    inspector = inspect(engine)
+    assert "sync_cursor" in {column["name"] for column in inspector.get_columns("plaid_items")}
+    assert "ux_roundups_user_idempotency_key" in {index["name"] for index in inspector.get_indexes("roundups")}
+    with engine.connect() as conn:
+        wallet = conn.execute(text("SELECT investing_cost_basis_cents, investing_units FROM wallets")).one()
+    assert tuple(wallet) == (0, 0.0)
+    engine.dispose()
+
+
+def test_upgrade_collapses_duplicate_roundups(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ux_roundups_user_transaction"))
+    
+    # t1 was rounded up three times by racing retries, t2 once
+    created_at = datetime(2025, 6, 2)
+    units = 30 / market_index.level(created_at.date())
+    db = sessionmaker(bind=engine)()
+    goal = Goal(user_public_id="user1", name="Trip", target_cents=10000, current_cents=4 * 30)
+    db.add(goal)
+    db.flush()
+    db.add(Wallet(
+        user_public_id="user1",
+        savings_cents=4 * 40,
+        investing_cents=4 * 30,
+        investing_cost_basis_cents=4 * 30,
+        investing_units=4 * units
+    ))
+    for transaction_id in ["t1", "t1", "t1", "t2"]:
+        db.add(Roundup(
+            user_public_id="user1",
+            transaction_id=transaction_id,
+            roundup_cents=100,
+            savings_cents=40,
+            investing_cents=30,
+            goals_cents=30,
+            goal_id=goal.id,
+            created_at=created_at
+        ))
+    db.commit()
+    db.close()
+    
+    upgrade_schema(engine)
+    
+    assert "ux_roundups_user_transaction" in {index["name"] for index in inspect(engine).get_indexes("roundups")}
+    db = sessionmaker(bind=engine)()
+    assert sorted(roundup.transaction_id for roundup in db.query(Roundup)) == ["t1", "t2"]
+    wallet = db.query(Wallet).one()
+    assert (wallet.savings_cents, wallet.investing_cents, wallet.investing_cost_basis_cents) == (80, 60, 60)
+    assert abs(wallet.investing_units - 2 * units) < 1e-9
+    assert db.query(Goal).one().current_cents == 60
+    db.close()
+    engine.dispose()
@@ -0,0 +1,73 @@
+"""Tests for keyset pagination cursors and transaction pages."""
+from datetime import datetime, timezone
+import pytest
+from app.models import Transaction
+from app.services.transaction_service import list_transactions
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    timestamp = datetime(2024, 3, 15, 12, 30, 45, 123456)
+    assert decode_cursor(encode_cursor(timestamp, 42)) == (timestamp, 42)
+    
+    # Timezone-aware timestamps keep their offset
+    aware = datetime(2024, 3, 15, 12, 30, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(aware, 7)) == (aware, 7)
+
+
+def test_cursor_is_opaque():
+    cursor = encode_cursor(datetime(2024, 1, 1), 1)
+    assert "|" not in cursor
+    assert "=" not in cursor
+
+
+def test_decode_invalid_cursor():
+    assert decode_cursor("") is None
+    assert decode_cursor("not a cursor") is None
+    assert decode_cursor("bm90fGFuIGlk") is None  # "not|an id"
+
+
+def add_transactions(db, days):
+    db.add_all([
+        Transaction(
+            user_public_id="user1",
+            transaction_id=f"t{i}",
+            amount_cents=450,
+            merchant="Starbucks",
+            timestamp=datetime(2026, 1, day),
+            source="local"
+        )
+        for i, day in enumerate(days)
+    ])
+    db.commit()
+
+
+def page_through(db, limit, since=None):
+    pages = []
+    cursor = None
+    while True:
+        rows, cursor = list_transactions(db, "user1", since=since, cursor=cursor, limit=limit)
+        pages.append([row.transaction_id for row in rows])
+        if cursor is None:
+            return pages
+
+
+def test_pages_split_timestamp_ties_by_id(db, user):
+    # t1..t4 share a timestamp, so pages break in the middle of the tie
+    add_transactions(db, [1, 2, 2, 2, 2, 3])
+    
+    assert page_through(db, limit=2) == [["t5", "t4"], ["t3", "t2"], ["t1", "t0"]]
+    assert page_through(db, limit=4) == [["t5", "t4", "t3", "t2"], ["t1", "t0"]]
+
+
+def test_since_applies_to_every_page(db, user):
+    add_transactions(db, [1, 2, 2, 3, 4])
+    
+    pages = page_through(db, limit=2, since=datetime(2026, 1, 2))
+    
+    assert pages == [["t4", "t3"], ["t2", "t1"]]
+
+
+def test_malformed_cursor_is_rejected(db, user):
+    with pytest.raises(ValueError):
+        list_transactions(db, "user1", cursor="not a cursor")
@@ -0,0 +1,37 @@
+"""Tests for bounded password hashing and rehash-on-login."""
+import pytest
+from passlib.context import CryptContext
+from app.utils import security
+from app.utils.security import (
+    PasswordHasherBusy, hash_password, verify_password, verify_and_update_password
+)
+
+
+def test_hash_and_verify():
+    hashed = hash_password("Passw0rd!23")
+    
+    assert verify_password("Passw0rd!23", hashed)
+    assert verify_and_update_password("Passw0rd!23", hashed) == (True, None)
+    assert verify_and_update_password("wrong", hashed) == (False, None)
+
+
+def test_outdated_hash_is_upgraded():
+    old_context = CryptContext(schemes=["argon2"], argon2__time_cost=1, argon2__memory_cost=1024)
+    old_hash = old_context.hash("Passw0rd!23")
+    
+    verified, new_hash = verify_and_update_password("Passw0rd!23", old_hash)
+    
+    assert verified
+    assert new_hash is not None and not security.pwd_context.needs_update(new_hash)
+
+
+def test_full_queue_fails_fast():
+    slots = []
+    while security._hash_slots.acquire(blocking=False):
+        slots.append(True)
+    try:
+        with pytest.raises(PasswordHasherBusy):
+            hash_password("Passw0rd!23")
+    finally:
+        for _ in slots:
+            security._hash_slots.release()
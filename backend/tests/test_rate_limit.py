@@ -0,0 +1,70 @@
+"""Tests for the sliding-window-counter rate limiter and its backends."""
+import pytest
+from app.utils.rate_limit import MemoryBackend, RateLimiter, SQLiteBackend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteBackend(str(tmp_path / "rate_limits.db"))
+    return MemoryBackend()
+
+
+def test_limit_within_window(backend):
+    limiter = RateLimiter("login", limit=5, window_seconds=900, backend=backend)
+    
+    assert all(limiter.hit("1.2.3.4", now=900 + i)[0] for i in range(5))
+    allowed, retry_after = limiter.hit("1.2.3.4", now=910)
+    
+    assert not allowed
+    # Next window, once the 5 hits are weighted down to 4: t = 1800 + 900 * (1 - 4/5)
+    assert retry_after == 1070
+    assert limiter.hit("5.6.7.8", now=910)[0]
+
+
+def test_previous_window_is_weighted(backend):
+    limiter = RateLimiter("login", limit=10, window_seconds=100, backend=backend)
+    for _ in range(10):
+        assert limiter.hit("ip", now=150)[0]
+    
+    # A quarter into the next window, 7.5 of the previous 10 hits still count
+    assert limiter.hit("ip", now=225)[0]
+    assert limiter.hit("ip", now=225)[0]
+    allowed, retry_after = limiter.hit("ip", now=225)
+    
+    assert not allowed
+    # Room for 7 of the previous hits once their weight falls to 0.7, at t=230
+    assert retry_after == 5
+    # Two windows later the old hits are gone entirely
+    assert limiter.hit("ip", now=400)[0]
+
+
+def test_rejected_hits_are_not_counted(backend):
+    limiter = RateLimiter("signup", limit=2, window_seconds=60, backend=backend)
+    for now in (0, 1, 2, 3, 4):
+        limiter.hit("ip", now=now)
+    
+    # Only the two accepted hits carry over into the next window
+    assert limiter.hit("ip", now=90)[0]
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_keys=3)
+    limiter = RateLimiter("login", limit=1, window_seconds=60, backend=backend)
+    for ip in ("a", "b", "c", "d"):
+        limiter.hit(ip, now=0)
+    
+    assert len(backend) == 3
+    assert limiter.hit("a", now=1)[0]
+    assert not limiter.hit("d", now=1)[0]
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "rate_limits.db")
+    worker_a = RateLimiter("login", limit=3, window_seconds=60, backend=SQLiteBackend(path))
+    worker_b = RateLimiter("login", limit=3, window_seconds=60, backend=SQLiteBackend(path))
+    
+    assert worker_a.hit("ip", now=0)[0]
+    assert worker_b.hit("ip", now=1)[0]
+    assert worker_a.hit("ip", now=2)[0]
+    assert not worker_b.hit("ip", now=3)[0]
@@ -0,0 +1,138 @@
+"""Tests for the round-up routes' batch statuses and idempotency responses."""
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from app.auth import _user_cache, _token_cache
+from app.db import get_db
+from app.models import Roundup, Transaction, Wallet
+from app.routes import roundup_routes
+from app.utils.security import create_access_token
+
+
+@pytest.fixture
+def client(engine, db, user):
+    db.add_all([
+        Transaction(
+            user_public_id="user1",
+            transaction_id=f"t{i}",
+            amount_cents=amount,
+            merchant="Starbucks",
+            timestamp=datetime(2026, 1, i + 1),
+            source="plaid"
+        )
+        for i, amount in enumerate([450, 1200, 399])
+    ])
+    db.commit()
+    
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+    
+    app = FastAPI()
+    app.include_router(roundup_routes.router)
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as test_client:
+        test_client.headers["Authorization"] = f"Bearer {create_access_token({'sub': 'user1'})}"
+        yield test_client
+    _user_cache.clear()
+    _token_cache.clear()
+
+
+def wallet_total(db):
+    db.expire_all()
+    wallet = db.query(Wallet).filter(Wallet.user_public_id == "user1").one()
+    return wallet.savings_cents + wallet.investing_cents
+
+
+def test_batch_reports_a_status_per_item(client, db):
+    response = client.post("/roundup/batch", json={"items": [
+        {"transaction_id": "t0"},
+        {"transaction_id": "t0"},
+        {"transaction_id": "missing"},
+        {"transaction_id": "t1"},
+        {"transaction_id": "t2"}
+    ]})
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["status"] for r in body["results"]] == ["applied", "duplicate", "not_found", "applied", "applied"]
+    assert [r["roundup"]["roundup_cents"] if r["roundup"] else None for r in body["results"]] == [50, None, None, 100, 1]
+    assert body["applied_count"] == 3
+    assert body["total_roundup_cents"] == 151
+    assert db.query(Roundup).count() == 3
+
+
+def test_retried_batch_is_already_applied(client, db):
+    client.post("/roundup/batch", json={"items": [{"transaction_id": "t0"}]})
+    credited = wallet_total(db)
+    
+    body = client.post("/roundup/batch", json={"items": [{"transaction_id": "t0"}]}).json()
+    
+    assert [r["status"] for r in body["results"]] == ["already_applied"]
+    assert body["results"][0]["roundup"]["roundup_cents"] == 50
+    assert body["applied_count"] == 0
+    assert wallet_total(db) == credited
+    assert db.query(Roundup).count() == 1
+
+
+def test_batch_conflict_is_409(client, db, monkeypatch):
+    def conflicting_apply_roundups(*args, **kwargs):
+        raise IntegrityError("INSERT INTO roundups", {}, Exception("UNIQUE constraint failed"))
+    
+    monkeypatch.setattr(roundup_routes, "apply_roundups", conflicting_apply_roundups)
+    
+    response = client.post("/roundup/batch", json={"items": [{"transaction_id": "t0"}]})
+    
+    assert response.status_code == 409
+    assert db.query(Roundup).count() == 0
+
+
+def test_idempotency_key_replays_the_stored_roundup(client, db):
+    first = client.post("/roundup", json={"transaction_id": "t0"}, headers={"Idempotency-Key": "k1"})
+    credited = wallet_total(db)
+    replay = client.post("/roundup", json={"transaction_id": "t0"}, headers={"Idempotency-Key": "k1"})
+    
+    assert first.status_code == replay.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json() == first.json()
+    assert wallet_total(db) == credited
+
+
+def test_idempotency_key_reused_for_another_transaction_is_422(client, db):
+    client.post("/roundup", json={"transaction_id": "t0"}, headers={"Idempotency-Key": "k1"})
+    
+    response = client.post("/roundup", json={"transaction_id": "t2"}, headers={"Idempotency-Key": "k1"})
+    
+    assert response.status_code == 422
+    assert db.query(Roundup).count() == 1
+
+
+def test_idempotency_key_taken_concurrently_is_422(client, db, monkeypatch):
+    client.post("/roundup", json={"transaction_id": "t0"}, headers={"Idempotency-Key": "k1"})
+    # The key's round-up commits between the route's lookup and its insert
+    monkeypatch.setattr(roundup_routes, "get_roundup_by_idempotency_key", lambda *args: None)
+    
+    response = client.post("/roundup", json={"transaction_id": "t2"}, headers={"Idempotency-Key": "k1"})
+    
+    assert response.status_code == 422
+    assert db.query(Roundup).count() == 1
+
+
+def test_other_conflicts_are_409(client, monkeypatch):
+    def conflicting_apply_roundup(*args, **kwargs):
+        raise IntegrityError("UPDATE wallets", {}, Exception("constraint failed"))
+    
+    monkeypatch.setattr(roundup_routes, "apply_roundup", conflicting_apply_roundup)
+    
+    response = client.post("/roundup", json={"transaction_id": "t0"})
+    
+    assert response.status_code == 409
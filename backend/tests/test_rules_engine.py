@@ -0,0 +1,48 @@
+"""Tests for merchant rule matching."""
+from app.models import MerchantRule
+from app.services.rules_engine import CompiledRules, normalize_merchant
+
+
+def txn(merchant, amount_cents=1234, category=None, pending=False):
+    return {
+        "transaction_id": "t1",
+        "merchant": merchant,
+        "amount_cents": amount_cents,
+        "category": category,
+        "pending": pending
+    }
+
+
+def test_normalize_merchant():
+    assert normalize_merchant("Starbucks") == "starbucks"
+    assert normalize_merchant("STARBUCKS #1234") == "starbucks"
+    assert normalize_merchant("  Trader Joe's ") == "traderjoes"
+    assert normalize_merchant("Acme Coffee Inc") == "acmecoffee"
+
+
+def test_exact_and_normalized_match():
+    rules = CompiledRules([MerchantRule(merchant="Starbucks", auto_roundup=True)])
+    
+    assert rules.matches(txn("Starbucks"))
+    assert rules.matches(txn("STARBUCKS #1234"))
+    assert not rules.matches(txn("Target"))
+
+
+def test_predicates():
+    rules = CompiledRules([
+        MerchantRule(merchant="Amazon", auto_roundup=True, min_amount_cents=500, max_amount_cents=5000),
+        MerchantRule(merchant="Uber", auto_roundup=True, category="taxi")
+    ])
+    
+    assert rules.matches(txn("Amazon", amount_cents=1000))
+    assert not rules.matches(txn("Amazon", amount_cents=100))
+    assert not rules.matches(txn("Amazon", amount_cents=9000))
+    assert rules.matches(txn("Uber", category="Travel, Taxi"))
+    assert not rules.matches(txn("Uber", category="Food and Drink"))
+
+
+def test_disabled_rules_are_ignored():
+    rules = CompiledRules([MerchantRule(merchant="Netflix", auto_roundup=False)])
+    
+    assert not rules
+    assert not rules.matches(txn("Netflix"))
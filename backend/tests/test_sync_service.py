@@ -0,0 +1,67 @@
+"""Tests for stale-while-revalidate Plaid refreshes."""
+from datetime import datetime, timedelta
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.models import PlaidItem
+from app.services import sync_service
+from app.services.sync_service import is_sync_stale, refresh_plaid_items, schedule_plaid_refresh
+
+
+class FailingPlaidClient:
+    def sync_transactions(self, access_token, cursor=None):
+        raise RuntimeError("bank unavailable")
+
+
+@pytest.fixture
+def items(db, user):
+    items = [
+        PlaidItem(user_public_id="user1", item_id="fresh", access_token="a1", sync_cursor="0",
+                  last_sync=datetime.utcnow()),
+        PlaidItem(user_public_id="user1", item_id="stale", access_token="a2", sync_cursor="0",
+                  last_sync=datetime.utcnow() - timedelta(seconds=settings.transactions_sync_ttl_seconds + 1))
+    ]
+    db.add_all(items)
+    db.commit()
+    yield items
+    sync_service._refreshing_items.clear()
+
+
+def test_is_sync_stale():
+    assert is_sync_stale(PlaidItem(last_sync=None))
+    assert not is_sync_stale(PlaidItem(last_sync=datetime.utcnow()))
+    assert is_sync_stale(PlaidItem(
+        last_sync=datetime.utcnow() - timedelta(seconds=settings.transactions_sync_ttl_seconds)
+    ))
+
+
+def test_concurrent_requests_collapse_into_one_refresh(items):
+    first = BackgroundTasks()
+    second = BackgroundTasks()
+    
+    assert schedule_plaid_refresh("user1", items, first, None)
+    assert not schedule_plaid_refresh("user1", items, second, None)
+    
+    assert len(first.tasks) == 1 and len(second.tasks) == 0
+    # Only the stale item is refreshed
+    assert first.tasks[0].args[1] == [items[1].id]
+
+
+def test_claims_of_tasks_that_never_ran_expire(items, monkeypatch):
+    assert schedule_plaid_refresh("user1", items, BackgroundTasks(), None)
+    
+    # The request failed, so its task never ran and released the claim
+    monkeypatch.setattr(sync_service, "REFRESH_CLAIM_TIMEOUT_SECONDS", 0)
+    assert schedule_plaid_refresh("user1", items, BackgroundTasks(), None)
+
+
+def test_failed_refresh_releases_its_claim(engine, items, monkeypatch):
+    monkeypatch.setattr(sync_service, "SessionLocal", sessionmaker(bind=engine, autoflush=False))
+    tasks = BackgroundTasks()
+    schedule_plaid_refresh("user1", items, tasks, FailingPlaidClient())
+    
+    refresh_plaid_items(*tasks.tasks[0].args)
+    
+    assert sync_service._refreshing_items == {}
+    assert schedule_plaid_refresh("user1", items, BackgroundTasks(), None)
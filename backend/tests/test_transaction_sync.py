@@ -0,0 +1,225 @@
+"""Tests for Plaid cursor syncs against the fake Plaid backend."""
+import hashlib
+import json
+from datetime import datetime
+import pytest
+from sqlalchemy.exc import IntegrityError
+from app.config import settings
+from app.models import MerchantRule, PlaidItem, Roundup, Transaction, User, Wallet
+from app.plaid_client import PlaidClient
+from app.services.allocation_service import apply_roundup
+from app.services.rules_engine import invalidate_rules
+from app.services.transaction_service import apply_transaction_changes, backfill_plaid_item, sync_plaid_items
+
+
+def fake_transaction(transaction_id, day, amount, pending=False, pending_transaction_id=None):
+    return {
+        "transaction_id": transaction_id,
+        "amount": amount,
+        "merchant_name": "Starbucks",
+        "name": "STARBUCKS",
+        "category": ["Food and Drink"],
+        "date": f"2026-01-{day:02d}",
+        "pending": pending,
+        "pending_transaction_id": pending_transaction_id
+    }
+
+
+def record_sync_calls(client):
+    """Record the access token of each /transactions/sync call in client.sync_calls."""
+    client.sync_calls = []
+    transactions_sync = client.client.transactions_sync
+    
+    def recorded_transactions_sync(request):
+        client.sync_calls.append(request["access_token"])
+        return transactions_sync(request)
+    
+    client.client.transactions_sync = recorded_transactions_sync
+    return client
+
+
+@pytest.fixture
+def fixture_path(tmp_path):
+    path = tmp_path / "plaid.json"
+    transactions = [fake_transaction(f"t{day}", day, 4.5) for day in range(1, 5)]
+    transactions.append(fake_transaction("p5", 5, 3.25, pending=True))
+    path.write_text(json.dumps({"transactions": transactions}))
+    return path
+
+
+@pytest.fixture
+def plaid_client(fixture_path, monkeypatch):
+    monkeypatch.setattr(settings, "plaid_backend", "fake")
+    monkeypatch.setattr(settings, "plaid_fake_fixture_path", str(fixture_path))
+    monkeypatch.setattr(settings, "plaid_sync_mode", "cursor")
+    monkeypatch.setattr(settings, "plaid_page_size", 2)
+    return record_sync_calls(PlaidClient())
+
+
+@pytest.fixture
+def engine(file_engine):
+    # Backfills write from their own sessions and threads
+    return file_engine
+
+
+@pytest.fixture
+def item(db, user):
+    item = PlaidItem(user_public_id="user1", item_id="item1", access_token="access-fake-1")
+    db.add(item)
+    db.commit()
+    return item
+
+
+@pytest.fixture
+def starbucks_rule(db, user):
+    db.add(MerchantRule(user_public_id="user1", merchant="Starbucks", auto_roundup=True))
+    db.commit()
+    invalidate_rules("user1")
+    yield
+    invalidate_rules("user1")
+
+
+def replayed_id(transaction_id, access_token="access-fake-1"):
+    """The id FakePlaidApi gives a fixture transaction for an item."""
+    return f"{transaction_id}_{hashlib.sha256(access_token.encode()).hexdigest()[:12]}"
+
+
+def stored_ids(db):
+    """Stored transaction ids, without the per-item suffix."""
+    return sorted(row.transaction_id.rsplit("_", 1)[0] for row in db.query(Transaction.transaction_id))
+
+
+def test_backfill_pages_history_and_saves_cursor(db, user, item, plaid_client):
+    stored = backfill_plaid_item(db, user, item, plaid_client)
+    
+    assert stored == 5
+    assert len(plaid_client.sync_calls) == 3  # 5 transactions in pages of 2
+    assert stored_ids(db) == ["p5", "t1", "t2", "t3", "t4"]
+    db.expire_all()
+    assert item.sync_cursor == "5"
+    assert item.last_sync is not None
+
+
+def test_sync_applies_changes_since_saved_cursor(db, user, item, plaid_client):
+    backfill_plaid_item(db, user, item, plaid_client)
+    db.add(Roundup(user_public_id="user1", transaction_id=replayed_id("p5"), roundup_cents=75))
+    db.commit()
+    
+    # The pending transaction posts, and a new one arrives
+    plaid_client.client.fixture["transactions"] += [
+        fake_transaction("t6", 6, 3.25, pending_transaction_id="p5"),
+        fake_transaction("t7", 7, 1.2)
+    ]
+    plaid_client.sync_calls.clear()
+    
+    new_transactions, errors = sync_plaid_items(db, user, [item], plaid_client)
+    
+    assert errors == {}
+    assert len(plaid_client.sync_calls) == 1
+    assert sorted(txn["transaction_id"] for txn in new_transactions) == [replayed_id("t6"), replayed_id("t7")]
+    assert stored_ids(db) == ["t1", "t2", "t3", "t4", "t6", "t7"]
+    assert db.query(Roundup.transaction_id).scalar() == replayed_id("t6")
+    db.expire_all()
+    assert item.sync_cursor == "7"
+
+
+def roundups(db):
+    db.expire_all()
+    return {row.transaction_id: row.roundup_cents for row in db.query(Roundup)}
+
+
+def wallet_total(db):
+    wallet = db.query(Wallet).filter(Wallet.user_public_id == "user1").one()
+    return wallet.savings_cents + wallet.investing_cents
+
+
+def test_auto_roundup_waits_for_pending_to_post(db, user, item, plaid_client, starbucks_rule):
+    backfill_plaid_item(db, user, item, plaid_client)
+    plaid_client.client.fixture["transactions"].append(fake_transaction("p8", 8, 2.4, pending=True))
+    sync_plaid_items(db, user, [item], plaid_client)
+    assert replayed_id("p8") not in roundups(db)
+    
+    plaid_client.client.fixture["transactions"].append(
+        fake_transaction("t9", 9, 2.4, pending_transaction_id="p8")
+    )
+    sync_plaid_items(db, user, [item], plaid_client)
+    sync_plaid_items(db, user, [item], plaid_client)
+    
+    assert roundups(db) == {replayed_id("t9"): 60}
+    assert wallet_total(db) == 60
+
+
+def test_posting_moves_a_manual_roundup_without_a_second_credit(db, user, item, plaid_client, starbucks_rule):
+    backfill_plaid_item(db, user, item, plaid_client)
+    manual = apply_roundup(db, user, replayed_id("p5"), 75)
+    credited = wallet_total(db)
+    
+    # The rounded-up pending transaction posts, matching the rule, and a new one arrives
+    plaid_client.client.fixture["transactions"] += [
+        fake_transaction("t6", 6, 3.25, pending_transaction_id="p5"),
+        fake_transaction("t7", 7, 1.2)
+    ]
+    sync_plaid_items(db, user, [item], plaid_client)
+    sync_plaid_items(db, user, [item], plaid_client)
+    
+    assert roundups(db) == {replayed_id("t6"): 75, replayed_id("t7"): 80}
+    assert db.get(Roundup, manual.id).transaction_id == replayed_id("t6")
+    assert wallet_total(db) == credited + 80
+
+
+def test_updates_never_touch_another_users_row(db, user):
+    db.add(User(public_id="user2", email="user2@test.edu", hashed_password="x", name="Other", school="Test", grad_year=2026))
+    db.add(Transaction(
+        user_public_id="user2",
+        transaction_id="shared",
+        amount_cents=450,
+        merchant="Starbucks",
+        timestamp=datetime(2026, 1, 1),
+        source="plaid"
+    ))
+    db.commit()
+    
+    modified = {"transaction_id": "shared", "amount_cents": 1, "merchant": "Target", "timestamp": datetime(2026, 1, 2)}
+    with pytest.raises(IntegrityError):
+        apply_transaction_changes(db, "user1", {"added": [], "modified": [modified], "removed": []})
+    db.rollback()
+    
+    row = db.query(Transaction).filter(Transaction.transaction_id == "shared").one()
+    assert (row.user_public_id, row.amount_cents, row.merchant) == ("user2", 450, "Starbucks")
+
+
+def test_sync_backfills_new_items_without_fetching_them_again(db, user, item, plaid_client, monkeypatch):
+    # Synthetic histories, so the items' transaction ids don't collide
+    monkeypatch.setattr(settings, "plaid_fake_fixture_path", None)
+    monkeypatch.setattr(settings, "plaid_fake_history_days", 3)
+    monkeypatch.setattr(settings, "plaid_page_size", 500)
+    client = record_sync_calls(PlaidClient())
+    
+    second = PlaidItem(user_public_id="user1", item_id="item2", access_token="access-fake-2")
+    db.add(second)
+    db.commit()
+    
+    _, errors = sync_plaid_items(db, user, [item, second], client)
+    
+    assert errors == {}
+    assert sorted(client.sync_calls) == ["access-fake-1", "access-fake-2"]
+    stored = db.query(Transaction).count()
+    assert int(item.sync_cursor) + int(second.sync_cursor) == stored
+
+
+def test_fixture_replays_a_copy_per_item(db, user, item, plaid_client):
+    second = PlaidItem(user_public_id="user1", item_id="item2", access_token="access-fake-2")
+    db.add(second)
+    db.commit()
+    
+    assert backfill_plaid_item(db, user, item, plaid_client) == 5
+    assert backfill_plaid_item(db, user, second, plaid_client) == 5
+    assert db.query(Transaction).count() == 10
+
+
+def test_recording_requires_a_fixture_path(monkeypatch):
+    monkeypatch.setattr(settings, "plaid_backend", "record")
+    monkeypatch.setattr(settings, "plaid_fake_fixture_path", None)
+    
+    with pytest.raises(ValueError, match="PLAID_FAKE_FIXTURE_PATH"):
+        PlaidClient()